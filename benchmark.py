@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script for benchmarking the plotting pipeline on synthetic inputs.
+
+Synthetic input files with the IDPerformanceMon/LargeD0 layout of the
+validation output are generated with a configurable number of entries per
+histogram, and each stage of the plotting pipeline is timed on them: opening
+the input file, reading histograms, rebinning, computing combined
+efficiencies, choosing the binning of and projecting resolutions, fitting core std.dev.'s, and saving canvases. Timings and the
+peak resident memory are reported, and can be stored as JSON and compared to
+a previous run.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import os
+import json
+import time
+import resource
+import argparse
+from array import array
+from contextlib import contextmanager
+from collections import OrderedDict
+
+# Scientific import(s)
+import numpy as np
+
+# ROOT (imported on first use)
+from lazy import ROOT, ap
+
+# Local
+import loader
+import binning
+from hist import Hist
+from efficiency import combined_efficiency
+from fitting import getCoreStd
+
+
+# Command-line arguments parser
+parser = argparse.ArgumentParser(description="Benchmark the LRT plotting pipeline on synthetic inputs.")
+
+parser.add_argument('--entries', dest='entries', type=float, default=1.0E+05,
+                    help='Number of entries per synthetic histogram (default: 1E+05)')
+parser.add_argument('--directory', dest='directory', default='benchmark/',
+                    help='Directory of synthetic inputs and saved canvases (default: benchmark/)')
+parser.add_argument('--method', dest='method', choices=['fit', 'moments'], default='fit',
+                    help='Core std.dev. estimator (default: fit)')
+parser.add_argument('--json', dest='json', default=None,
+                    help='Path of JSON file to which to write the results (default: None)')
+parser.add_argument('--compare', dest='compare', default=None,
+                    help='Path of JSON file of a previous run with which to compare (default: None)')
+
+
+# Layout of synthetic inputs
+base       = 'IDPerformanceMon/LargeD0/'
+algorithms = ['Standard', 'LargeD0']
+groups     = ['Rprod_10mm_30mm/', 'Rprod_30mm_100mm/', 'Rprod_100mm_300mm/']
+
+# Binning of efficiency profiles, by variable
+eff_binning = OrderedDict([
+    ('eta', (50, -2.5, 2.5)),
+    ('phi', (64, -3.2, 3.2)),
+    ('d0',  (60, -300., 300.)),
+    ('pt',  (50, 0., 50.)),
+    ('R',   (60, 0., 300.)),
+    ])
+
+# Binning of resolutions, by track parameter
+res_binning = OrderedDict([
+    ('d0',     (200, -2.,    2.)),
+    ('z0',     (200, -5.,    5.)),
+    ('qOverP', (200, -0.05,  0.05)),
+    ])
+
+# Variable bin edges of R, as used in `efficiencyPlots`
+R_edges = [0., 10., 20., 30., 40., 50., 70., 90., 110., 130., 150., 175., 200., 225., 250., 275., 300.]
+
+# Minimal number of entries in each bin of mu, cf. `robustnessResolutionPlots`
+min_entries = 200.
+
+
+# Stage timer
+class Timer (object):
+    """ Accumulated wall time and number of calls, by stage. """
+
+    def __init__ (self):
+        self.stages = OrderedDict()
+        return
+
+    @contextmanager
+    def __call__ (self, stage):
+        """ Method for timing the enclosed block as (one call of) `stage`. """
+        start = time.time()
+        try:
+            yield
+        finally:
+            total, calls, _ = self.stages.get(stage, (0., 0, 0))
+            self.stages[stage] = (total + time.time() - start, calls + 1, peak_rss())
+            pass
+        return
+
+    pass
+
+
+# Get peak resident memory
+def peak_rss ():
+    """ Method for getting the peak resident set size of the process, in MB. """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024. # kB on Linux
+
+
+# Fill histogram from arrays
+def fill (h, *arrays):
+    """ Method for filling `h` with the coordinates in `arrays`, with unit weights. """
+    arrays = [np.ascontiguousarray(a, dtype=np.float64) for a in arrays]
+    h.FillN(len(arrays[0]), *(arrays + [np.ones_like(arrays[0])]))
+    return
+
+
+# Generate synthetic input file
+def generate (path, entries, seed):
+    """ Method for writing a synthetic input file to `path`, with `entries` entries per histogram. """
+
+    rng = np.random.RandomState(seed)
+    f = ROOT.TFile.Open(path, 'RECREATE')
+
+    # Get (new) directory
+    def mkdir (name):
+        d = f
+        for part in name.strip('/').split('/'):
+            if not d.GetDirectory(part):
+                d.mkdir(part)
+                pass
+            d = d.GetDirectory(part)
+            pass
+        return d
+
+    for ialg, alg in enumerate(algorithms):
+
+        # Efficiency profiles
+        d = mkdir(base + 'EffPlots/{alg}Tracks/Signal'.format(alg=alg))
+        for var, (nbins, lo, hi) in eff_binning.items():
+            h = ROOT.TProfile('trackeff_vs_' + var, "", nbins, lo, hi)
+            x = rng.uniform(lo, hi, entries)
+            eff = 0.8 - 0.4 * ialg + 0.4 * ialg * np.abs(x - lo) / (hi - lo)
+            fill(h, x, (rng.uniform(size=entries) < eff).astype(np.float64))
+            d.WriteTObject(h)
+            pass
+
+        # Resolutions, and pulls
+        d = mkdir(base + 'ResolutionPlots/{alg}Tracks/Signal'.format(alg=alg))
+        for var, (nbins, lo, hi) in res_binning.items():
+            width = (hi - lo) / 40. * (1 + ialg)
+            for rel, scale in [('res', width), ('pull', 1.)]:
+                h = ROOT.TH1F('{rel}_{var}'.format(rel=rel, var=var), "", nbins, lo if rel == 'res' else -5., hi if rel == 'res' else 5.)
+                fill(h, np.where(rng.uniform(size=entries) < 0.9, rng.normal(0, scale, entries), rng.normal(0, 3 * scale, entries)))
+                d.WriteTObject(h)
+                pass
+            pass
+
+        # Resolutions versus mu and pT, in bins of production radius
+        for igroup, group in enumerate(groups):
+            d = mkdir(base + 'ResolutionPlots/{alg}Tracks/Signal/{group}'.format(alg=alg, group=group[:-1]))
+            for var, (nbins, lo, hi) in res_binning.items():
+                width = (hi - lo) / 40. * (1 + ialg) * (1 + igroup)
+                mu = rng.uniform(0, 40, entries)
+                pt = np.exp(rng.uniform(0, np.log(400.), entries))
+                y  = rng.normal(0, 1, entries) * width * (1 + mu / 40.) / np.sqrt(pt)
+                h = ROOT.TH2F('res_{var}_vs_mu'.format(var=var), "", 8, 0, 40, nbins, lo, hi)
+                fill(h, mu, y)
+                d.WriteTObject(h)
+                h = ROOT.TH2F('res2D_{var}_vs_pt'.format(var=var), "", 400, 0, 400, nbins, lo, hi)
+                fill(h, pt, y)
+                d.WriteTObject(h)
+                pass
+            pass
+        pass
+
+    f.Close()
+    return
+
+
+# Main function definition.
+def main ():
+
+    # Parse command-line arguments
+    args = parser.parse_args()
+    entries = int(args.entries)
+    if not os.path.isdir(args.directory):
+        os.makedirs(args.directory)
+        pass
+
+    ROOT.gROOT.SetBatch(True)
+    ROOT.TH1.AddDirectory(False)
+    timer = Timer()
+
+    # Generate synthetic inputs
+    path = os.path.join(args.directory, 'output_benchmark.root')
+    with timer('generate'):
+        generate(path, entries, seed=42)
+        pass
+
+    # Benchmark pipeline, bypassing the on-disk cache
+    loader.use_cache = False
+
+    with timer('open'):
+        loader.get_file(path)
+        pass
+
+    def read (name, arrays=False):
+        with timer('read'):
+            h = Hist.from_arrays(loader.get_arrays(path, base + name)) if arrays else loader.get(path, base + name)
+            pass
+        return h
+
+    # Efficiencies: rebin, and combine
+    profiles = dict()
+    for var in eff_binning:
+        profiles[var] = [read('EffPlots/{alg}Tracks/Signal/trackeff_vs_{var}'.format(alg=alg, var=var)) for alg in algorithms]
+        pass
+
+    for ialg, h in enumerate(profiles['R']):
+        with timer('rebin'):
+            profiles['R'][ialg] = h.Rebin(len(R_edges) - 1, h.GetName() + '_rebinned_%d' % ialg, array('d', R_edges))
+            pass
+        pass
+
+    combined = dict()
+    for var, (h1, h2) in profiles.items():
+        with timer('combined efficiency'):
+            combined[var] = combined_efficiency(h1, h2)
+            pass
+        pass
+
+    # Resolutions: choose binning, project, and fit, as in `robustnessResolutionPlots`
+    iterations = 0
+    mu_pairs = dict()
+    for alg in algorithms:
+        for igroup, group in enumerate(groups):
+            for var in res_binning:
+                h = read('ResolutionPlots/{alg}Tracks/Signal/{group}res_{var}_vs_mu'.format(alg=alg, group=group, var=var), arrays=True)
+                if igroup not in mu_pairs:
+                    with timer('binning'):
+                        mu_pairs[igroup], _ = binning.build(h, high=40, min_entries=min_entries, max_bins=6 if igroup < 2 else 3)
+                        pass
+                    pass
+                with timer('projection'):
+                    projs = h.projections(mu_pairs[igroup], clear_flows=True)
+                    pass
+                for proj in projs:
+                    with timer('fit'):
+                        _, _, _, it = getCoreStd(proj.to_root(), sigma=2, fix_mean=0, method=args.method)
+                        pass
+                    iterations += it
+                    pass
+                pass
+            pass
+        pass
+
+    # Drawing and saving
+    for var, h in combined.items():
+        c = ap.canvas(batch=True, size=(700, 500))
+        for ihist, hist in enumerate(profiles[var] + [h]):
+            c.plot(hist, linestyle=1+ihist, markerstyle=20+ihist)
+            pass
+        with timer('save'):
+            c.save(os.path.join(args.directory, 'benchmark_trackeff_vs_%s.pdf' % var))
+            pass
+        pass
+
+    # Report
+    results = OrderedDict([
+        ('entries', entries),
+        ('method', args.method),
+        ('fit iterations', iterations),
+        ('peak RSS [MB]', peak_rss()),
+        ('stages', OrderedDict((stage, OrderedDict([('time [s]', total), ('calls', calls), ('peak RSS [MB]', rss)])) for stage, (total, calls, rss) in timer.stages.items())),
+        ])
+
+    reference = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            reference = json.load(f)
+            pass
+        pass
+
+    print "%-20s %10s %8s %12s %14s%s" % ('Stage', 'Time [s]', 'Calls', 'Per call [ms]', 'Peak RSS [MB]', ' %10s' % 'vs. ref.' if reference else '')
+    for stage, result in results['stages'].items():
+        line = "%-20s %10.3f %8d %12.3f %14.1f" % (stage, result['time [s]'], result['calls'], result['time [s]'] / result['calls'] * 1000., result['peak RSS [MB]'])
+        if reference and stage in reference['stages']:
+            line += " %+9.1f%%" % ((result['time [s]'] / reference['stages'][stage]['time [s]'] - 1.) * 100.)
+            pass
+        print line
+        pass
+    print "Fit iterations: %d" % iterations
+    print "Peak RSS: %.1f MB" % results['peak RSS [MB]']
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+            pass
+        pass
+
+    return
+
+
+if __name__ == '__main__':
+    main()
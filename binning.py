@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+""" Adaptive binning for LRT robustness plots.
+
+The x-axis bins of a histogram are merged into consecutive (first, last) bin
+pairs, such that each pair contains at least a minimal number of entries,
+e.g. for the fit of the projection of each pair to be stable. The number of
+entries follows from a target relative precision as 1/precision^2. The pairs
+are chosen greedily from the cumulative sum of the entries in each bin, one
+pair after the other, each by a single `np.searchsorted`; entries remaining
+after the last full pair are merged into it. Only if there are then more pairs
+than a maximal number of pairs, the smallest pair is repeatedly merged with the
+smaller of its neighbours, such that the pairs from the greedy merging are
+kept where possible.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Scientific import(s)
+import numpy as np
+
+
+# Get bin pairs
+def pairs (counts, first=1, last=None, min_entries=None, precision=None, max_bins=None):
+    """ Method for getting the (first, last) bin pairs, in ROOT bin numbers, into which to merge bins `first` to `last`.
+
+    The number of entries in each bin, incl. under- and overflow, are given as
+    `counts`, and `last` defaults to the last bin, excl. overflow. The minimal
+    number of entries in each pair is `min_entries`, or 1/`precision`^2,
+    whichever is larger. With `max_bins`, at most `max_bins` pairs are
+    returned, by merging adjacent pairs.
+    """
+
+    counts = np.asarray(counts, dtype=np.float64)
+    last   = len(counts) - 2 if last is None else last
+
+    # Check(s)
+    assert 0 <= first <= last < len(counts), "Invalid range of bins [%d, %d]" % (first, last)
+    assert max_bins is None or max_bins > 0, "Maximal number of bins must be positive"
+
+    cumulative = np.cumsum(counts[first:last + 1])
+    total      = cumulative[-1]
+
+    # Minimal number of entries in each pair
+    threshold = max(min_entries or 0., 1. / precision**2 if precision else 0.)
+
+    # Get bin pairs from the indices, relative to `first`, of the last bin of each pair
+    def result (ends):
+        starts = [0] + [end + 1 for end in ends[:-1]]
+        return [(first + start, first + end) for start, end in zip(starts, ends)]
+
+    # Merge bins until each pair has enough entries
+    ends = list()
+    end  = -1
+    while True:
+        base = cumulative[end] if end >= 0 else 0.
+        end  = end + 1 + int(np.searchsorted(cumulative[end + 1:], base + threshold, side='left'))
+        if end >= len(cumulative) - 1:
+            break
+        ends.append(end)
+        pass
+
+    # Merge remaining bins into the last pair, unless it has enough entries on its own
+    if ends and total - cumulative[ends[-1]] < threshold:
+        ends.pop()
+        pass
+    ends.append(len(cumulative) - 1)
+
+    # Merge the smallest pair with its smaller neighbour, until there are at most `max_bins` pairs
+    while max_bins and len(ends) > max_bins:
+        sums = np.diff(np.concatenate(([0.], cumulative[ends])))
+        ipair = int(np.argmin(sums))
+        if ipair == len(ends) - 1 or (ipair > 0 and sums[ipair - 1] <= sums[ipair + 1]):
+            ipair -= 1  # Merge with previous pair
+            pass
+        ends.pop(ipair)
+        pass
+
+    return result(ends)
+
+
+# Get bin edges of pairs
+def edges (axis_edges, bin_pairs):
+    """ Method for getting the effective bin edges of the bin pairs `bin_pairs` on an axis with bin edges `axis_edges`.
+
+    Pairs are assumed to be consecutive, cf. `pairs`.
+    """
+    axis_edges = np.asarray(axis_edges, dtype=np.float64)
+    return np.append(axis_edges[[first - 1 for first, _ in bin_pairs]], axis_edges[bin_pairs[-1][1]])
+
+
+# Build bin pairs for histogram
+def build (h, low=None, high=None, axis=0, **kwargs):
+    """ Method for getting the bin pairs, and their effective bin edges, along `axis` of `hist.Hist` `h`.
+
+    The entries in each bin are those of the profile, or the sum of weights
+    over the (non-overflow) bins along the other axis of a two-dimensional
+    histogram. Bins are merged within [`low`, `high`], defaulting to the axis
+    range; keyword arguments are passed on to `pairs`.
+    """
+
+    if h.profile:
+        counts = h.entries
+    elif h.ndim == 2:
+        counts = np.swapaxes(h.values, 0, axis)[:, 1:-1].sum(axis=1)
+    else:
+        counts = h.values
+        pass
+
+    first = 1                if low  is None else max(h.find_bin(low,  axis), 1)
+    last  = h.nbins(axis)    if high is None else min(h.find_bin(high, axis), h.nbins(axis))
+    if high is not None and first < last and h.low_edge(last, axis) >= high:  # `high` on a bin edge
+        last -= 1
+        pass
+
+    bin_pairs = pairs(counts, first, last, **kwargs)
+    return bin_pairs, edges(h.edges[axis], bin_pairs)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+""" On-disk cache of histogram arrays for LRT plotting macros.
+
+Histograms read from an input file are stored as compressed NumPy archives in
+one directory per input file. Each directory is stamped with the size and
+modification time of the input file, and is cleared automatically when these
+change.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import os
+import shutil
+import hashlib
+
+# Scientific import(s)
+import numpy as np
+
+
+# Base directory of cache
+cache_dir = 'cache/'
+
+# Input directories already validated in this process, keyed by path
+_valid = dict()
+
+
+# Get short hash of string
+def short_hash (s):
+    """ Method for getting a short, file-system safe hash of string `s`. """
+    return hashlib.sha1(s.encode('utf-8')).hexdigest()[:16]
+
+
+# Get stamp of input file
+def stamp (path):
+    """ Method for getting the size and modification time of `path`, or None if it cannot be stat'ed (e.g. xrootd URLs). """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return '%d %.6f' % (st.st_size, st.st_mtime)
+
+
+# Get (validated) cache directory for input file
+def input_dir (path):
+    """ Method for getting the cache directory of input file `path`, or None if `path` cannot be cached.
+
+    The directory is cleared if the stamp of the input file has changed since
+    the histograms in it were cached.
+    """
+
+    if path not in _valid:
+        new_stamp = stamp(path)
+        if new_stamp is None:
+            _valid[path] = None
+            return None
+
+        directory = os.path.join(cache_dir, short_hash(os.path.abspath(path)))
+        stampfile = os.path.join(directory, 'stamp')
+
+        # Check stamp of cached histograms
+        old_stamp = None
+        if os.path.isfile(stampfile):
+            with open(stampfile, 'r') as f:
+                old_stamp = f.readline().strip()
+                pass
+            pass
+
+        # Invalidate cache if input file has changed
+        if old_stamp != new_stamp:
+            shutil.rmtree(directory, ignore_errors=True)
+            try:
+                os.makedirs(directory)
+            except OSError: # Created concurrently by another process
+                pass
+            with open(stampfile, 'w') as f:
+                f.write(new_stamp + '\n')
+                f.write(os.path.abspath(path) + '\n')
+                pass
+            pass
+
+        _valid[path] = directory
+        pass
+
+    return _valid[path]
+
+
+# Get path of cached histogram
+def _cache_file (path, histname):
+    """ Method for getting the path of the cache file for histogram `histname` in `path`, or None. """
+    directory = input_dir(path)
+    if directory is None:
+        return None
+    return os.path.join(directory, short_hash(histname) + '.npz')
+
+
+# Load histogram arrays
+def load (path, histname):
+    """ Method for loading the arrays of histogram `histname` in input file `path`; None if not cached. """
+
+    cachefile = _cache_file(path, histname)
+    if cachefile is None or not os.path.isfile(cachefile):
+        return None
+
+    try:
+        f = np.load(cachefile)
+        d = dict((key, f[key]) for key in f.files)
+        f.close()
+    except Exception: # Corrupt/partial cache file; re-read from input
+        return None
+
+    # Guard against hash collisions
+    if str(d.pop('histname')) != histname:
+        return None
+
+    return d
+
+
+# Store histogram arrays
+def store (path, histname, d):
+    """ Method for storing the arrays `d` of histogram `histname` in input file `path`. """
+
+    cachefile = _cache_file(path, histname)
+    if cachefile is None:
+        return
+
+    # Write to temporary file and rename, such that concurrent processes never see partial files
+    tmpfile = cachefile[:-len('.npz')] + '.%d.tmp.npz' % os.getpid()
+    np.savez_compressed(tmpfile, histname=histname, **d)
+    os.rename(tmpfile, cachefile)
+    return
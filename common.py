@@ -6,20 +6,76 @@ Author: Andreas Sogaard (@asogaard)
 Date:   7 June 2017
 """
 
-# ROOT
-import ROOT
-
 # Command-line arguments parser
 import argparse
 
+# Local
+import loader
+import output
+import datasets
+import staging
+import profiling
+import fitcache
+
 parser = argparse.ArgumentParser(description="Produce publication-ready plots for the large-radius tracking (LRT) PUBNOTE.")
 
+parser.add_argument('--dataset', dest='dataset', default=None,
+                    help='Name of the input dataset, cf. datasets.yaml (default: the default dataset of the registry)')
 parser.add_argument('--show', dest='show', action='store_const',
                     const=True, default=False,
                     help='Show plots (default: False)')
 parser.add_argument('--save', dest='save', action='store_const',
                     const=True, default=False,
                     help='Save plots (default: False)')
+parser.add_argument('--incremental', dest='incremental', action='store_const',
+                    const=True, default=False,
+                    help='Only save plots whose inputs, code, or settings have changed (default: False)')
+parser.add_argument('--no-cache', dest='cache', action='store_const',
+                    const=False, default=True,
+                    help='Don\'t use on-disk cache of input histograms (default: False)')
+parser.add_argument('--backend', dest='backend', choices=['root', 'uproot'], default='root',
+                    help='Library used to read input histograms (default: root)')
+parser.add_argument('--dry-run', dest='dry_run', action='store_const',
+                    const=True, default=False,
+                    help='Only list the plots that would be produced, without loading ROOT (default: False)')
+parser.add_argument('--formats', dest='formats', default='pdf',
+                    help='Comma-separated list of output formats, out of: pdf, png, svg, eps, root (default: pdf)')
+parser.add_argument('--bundle', dest='bundle', action='store_const',
+                    const=True, default=False,
+                    help='Write the PDF pages and ROOT canvases of each plot family to a single file (default: False)')
+parser.add_argument('--async-save', dest='async_save', action='store_const',
+                    const=True, default=False,
+                    help='Write saved plots in a background thread, overlapping with drawing (default: False)')
+parser.add_argument('--save-queue', dest='save_queue', type=int, default=8,
+                    help='Maximal number of pending writes, with --async-save (default: 8)')
+parser.add_argument('--stage', dest='stage', default=None,
+                    help='Local directory to which to copy remote input files before reading them (default: None)')
+parser.add_argument('--stage-prefixes', dest='stage_prefixes', default='/eos/,root://',
+                    help='Comma-separated list of path prefixes of input files to stage, with --stage (default: /eos/,root://)')
+parser.add_argument('--stage-jobs', dest='stage_jobs', type=int, default=4,
+                    help='Maximal number of concurrent transfers, with --stage (default: 4)')
+parser.add_argument('--profile', dest='profile', action='store_const',
+                    const=True, default=False,
+                    help='Record time spent in each stage, e.g. reading, fitting, and saving (default: False)')
+parser.add_argument('--profile-output', dest='profile_output', default='profile',
+                    help='Prefix of the files to which to write the profile (default: profile)')
+parser.add_argument('--cprofile', dest='cprofile', action='store_const',
+                    const=True, default=False,
+                    help='Also write a cProfile dump, with --profile (default: False)')
+parser.add_argument('--jobs', dest='jobs', type=int, default=1,
+                    help='Number of processes used to produce plots (default: 1)')
+
+# Configure shared modules
+def configure (args):
+    """ Method for configuring the modules shared by all plotting macros from command-line arguments `args`. """
+    loader.use_cache   = args.cache
+    loader.backend     = args.backend
+    fitcache.use_cache = args.cache
+    profiling.enable(args)
+    output.configure(args)
+    datasets.configure(args)
+    staging.configure(args)
+    return
 
 # Get the text-line describing the signal model
 def signal_line (signal):
@@ -36,59 +92,22 @@ def track_line (t, name):
 qualifier = "Simulation Preliminary"
 #qualifier = "Simulation Internal"
 
+# ROOT colour constants, cf. EColor in Rtypes.h; copied such that ROOT need not be loaded
+class EColor:
+    kBlack  =   1
+    kGreen  = 416
+    kCyan   = 432
+    kBlue   = 600
+    kRed    = 632
+    kOrange = 800
+    kSpring = 820
+    kTeal   = 840
+    kAzure  = 860
+    kViolet = 880
+    kPink   = 900
+    pass
+
 # Colours (pretty)
-colours_pretty = [ROOT.kViolet + 7, ROOT.kAzure + 7, ROOT.kTeal, ROOT.kSpring - 2, ROOT.kOrange - 3, ROOT.kPink]
+colours_pretty = [EColor.kViolet + 7, EColor.kAzure + 7, EColor.kTeal, EColor.kSpring - 2, EColor.kOrange - 3, EColor.kPink]
 # Colours (ugly; for note)
-colours = [ROOT.kRed, ROOT.kBlue, ROOT.kBlack, ROOT.kGreen, ROOT.kViolet, ROOT.kCyan, ROOT.kOrange]
-
-# Low-stats, using new RPV sample with updated fiducial selection
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-06/output_{signal}.root'
-
-# High-stats
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-07/output_{signal}.root'
-
-# Low-stats, with track pT > 1000 MeV
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-08/output_{signal}.root'
-    
-# High-stats, new RPV signal definition
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-09/output_{signal}.root'
-
-# High-stats, better resolution robustness binning
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-10/output_{signal}.root'
-
-# High-stats, only signal muons for RPV
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-15/output_{signal}.root'
-
-# High-stats, same R-hadron sample as Margaret
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-17/output_{signal}.root'
-
-# High-stats, smaller pT-range for robustness plots
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-18/output_{signal}.root'
-
-# High-stats, impose pT > 1000 MeV
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-19/output_{signal}.root'
-
-# High-stats, better Rprod binning for robustness studies
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-21/output_{signal}.root'
-
-# High-stats, better pT binning for robustness studies for RPV
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-22/output_{signal}.root'
-
-# High-stats, better truthprodR range
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-22b/output_{signal}.root'
-
-# High-stats, better q/p resolution robustness binning
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-24/output_{signal}.root'
-#filename = '/afs/cern.ch/user/a/asogaard/Qualification/validation-rel21-2017-01-24/run/2017-06-24/output_{signal}.root'
-
-# High-stats, 10k events for R-hadron
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-06-30/output_{signal}.root'
-
-# High-stats, pT cut applied to truth rather than tracks
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-07-05/output_{signal}.root'
-
-# High-stats, pT-binned resolution robustness (RPV)
-#filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-07-06/output_{signal}.root'
-
-# High-stats, pT-binned resolution robustness (R-hadron)
-filename = '/eos/atlas/user/a/asogaard/Qualification/validation/2017-07-07/output_{signal}.root'
+colours = [EColor.kRed, EColor.kBlue, EColor.kBlack, EColor.kGreen, EColor.kViolet, EColor.kCyan, EColor.kOrange]
@@ -11,34 +11,36 @@ Date:   4 July 2017
 # Basic
 import itertools
 
-# ROOT
-import ROOT 
+# ROOTplotting (imported on first use)
+from lazy import ap
 
 # Local
 from common import *
-from rootplotting import ap
-from rootplotting.tools import *
+import loader
+import output
+import datasets
+import staging
+import incremental
 from snippets.functions import displayNameUnit
 
 
+# Macro-specific command-line arguments
+parser.add_argument('--compare', dest='compare', default='2017-06-30,2017-07-05',
+                    help='Comma-separated list of the datasets to compare, cf. datasets.yaml (default: 2017-06-30,2017-07-05)')
+
+
 # Main function definition.
-def main ():
+def main (args=None):
 
     # Parse command-line arguments
-    args = parser.parse_args()
-
-    # Input paths
-    #base_path = '/afs/cern.ch/user/a/asogaard/Qualification/validation-rel21-2017-01-24/run/'
-    base_path = '/eos/atlas/user/a/asogaard/Qualification/validation/'
-    paths = [
-        #base_path + '2017-06-30/output_Rhadron0.root',
-        #base_path + '2017-06-30/output_Rhadron4.root',
-        #base_path + '2017-07-04/output_Rhadron4.root',
-        #base_path + '2017-07-05/output_Rhadron0.root',
-        #base_path + 'output_Rhadron0.root',
-        base_path + '2017-06-30/output_Rhadron.root',
-        base_path + '2017-07-05/output_Rhadron.root',
-        ]
+    if args is None:
+        args = parser.parse_args()
+        pass
+    configure(args)
+
+    # Input paths, one per dataset
+    compared = [name.strip() for name in args.compare.split(',') if name.strip()]
+    paths = [datasets.path('Rhadron', name) for name in compared]
 
     # Histograms to be compared
     histogram_names = [
@@ -48,30 +50,44 @@ def main ():
         ]
 
 
+    # Skip plot if up to date
+    savename = 'comparison.pdf'
+    fp = incremental.fingerprint(main, signal_line('Rhadron'), qualifier, colours, displayNameUnit('r'),
+                                 sources=[(path, name) for path in paths for name in histogram_names])
+    if incremental.up_to_date(args, ['plots/' + savename], fp):
+        return
+
+    # Stage input files in the background
+    staging.start(paths)
+
     # Read in histograms
     histograms = list()
     for path in paths:
         histograms.append(list())
-        f = ROOT.TFile(path, 'READ')
         for name in histogram_names:
-            h = f.Get(name)
-            h.SetDirectory(0)
+            h = loader.get(path, name)
             h.RebinX(2)
             histograms[-1].append(h)
             pass
-        f.Close()
         pass
 
     # Definitions
-    names = ['Standard tracks', 'Large radius tracks', 'Combined']
+    names  = ['Standard tracks', 'Large radius tracks', 'Combined']
+    styles = [(1, 20), (2, 24), (3, 21), (4, 25), (5, 22), (6, 26)] # (linestyle, markerstyle), by dataset
+
+    # Check(s)
+    assert len(compared) <= len(styles), "At most %d datasets can be compared" % len(styles)
 
     # Draw figure
     c = ap.canvas(batch=not args.show, size=(700, 500))
-    for ihist, (hist, name, col) in enumerate(zip(histograms[0], names, colours)):
-        c.plot(hist, linecolor=col, markercolor=col, linestyle=1, markerstyle=20, option='PE', label=name, legend_option='L')
-        pass
-    for ihist, (hist, name, col) in enumerate(zip(histograms[1], names, colours)):
-        c.plot(hist, linecolor=col, markercolor=col, linestyle=2, markerstyle=24, option='PE')
+    for idataset, (linestyle, markerstyle) in enumerate(styles[:len(compared)]):
+        for ihist, (hist, name, col) in enumerate(zip(histograms[idataset], names, colours)):
+            if idataset == 0:
+                c.plot(hist, linecolor=col, markercolor=col, linestyle=linestyle, markerstyle=markerstyle, option='PE', label=name, legend_option='L')
+            else:
+                c.plot(hist, linecolor=col, markercolor=col, linestyle=linestyle, markerstyle=markerstyle, option='PE')
+                pass
+            pass
         pass
     c.text([signal_line('Rhadron')],
            qualifier=qualifier)
@@ -81,16 +97,21 @@ def main ():
     c.xlabel(displayNameUnit('r'))
     c.ylabel("Reconstruction effiency")
     c.legend(width=0.28, categories=[
-            ('30/06/2017', {'linestyle':1, 'markerstyle':20, 'option':'PL'}),
-            ('05/07/2017', {'linestyle':2, 'markerstyle':24, 'option':'PL'}),
+            (datasets.get(name)['date'].strftime('%d/%m/%Y'), {'linestyle':linestyle, 'markerstyle':markerstyle, 'option':'PL'})
+            for name, (linestyle, markerstyle) in zip(compared, styles)
             ])
 
     # Show/save
-    savename = 'comparison.pdf'
     if args.show: c.show()
-    if args.save: c.save('plots/' + savename)
+    if args.save:
+        output.save(c, 'plots/' + savename, bundle='comparison')
+        incremental.record(['plots/' + savename], fp)
+        pass
     pass
 
+    # Write bundles
+    output.close()
+
     return
 
 
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Registry of input datasets for LRT plotting macros.
+
+The rounds of the validation, each with a description, date, and path
+template, are declared in `datasets.yaml`, and selected with `--dataset`. The
+histograms in the input files of a dataset are indexed once, cf. `keyindex`,
+such that checking which histograms exist does not require reading the files
+again, for as long as they are unchanged.
+
+Run as a script to list the datasets, or, with `--index`, to precompute the
+index of one or more of them, e.g.
+
+    $ python datasets.py --index 2017-07-06 2017-07-07
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import os
+import argparse
+
+# PyYAML (imported on first use)
+from lazy import LazyModule
+yaml = LazyModule('yaml')
+
+# Local
+import keyindex
+
+
+# Path of the dataset registry
+registry_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'datasets.yaml')
+
+# Signal processes, for which each dataset has an input file
+signals = ['RPV', 'Rhadron']
+
+# Name of the selected dataset; the default of the registry if None
+selected = None
+
+# Parsed registry
+_registry = None
+
+
+# Get dataset registry
+def registry ():
+    """ Method for getting the dataset registry, reading it on first use. """
+    global _registry
+    if _registry is None:
+        with open(registry_path, 'r') as f:
+            _registry = yaml.safe_load(f)
+            pass
+        pass
+    return _registry
+
+
+# Get dataset
+def get (name=None):
+    """ Method for getting the specification of dataset `name`, or of the selected dataset if None. """
+    name = name or selected or registry()['default']
+
+    # Check(s)
+    if name not in registry()['datasets']:
+        raise KeyError("Dataset '%s' not found in %s; choose from: %s" % (name, registry_path, ', '.join(sorted(registry()['datasets']))))
+
+    return registry()['datasets'][name]
+
+
+# Configure dataset
+def configure (args):
+    """ Method for selecting the dataset from command-line arguments `args`. """
+    global selected
+    if args.dataset is not None:
+        get(args.dataset) # Check(s)
+        selected = args.dataset
+        pass
+    return
+
+
+# Get path of input file
+def path (signal, name=None):
+    """ Method for getting the path of the input file for `signal` in dataset `name`, or in the selected dataset if None. """
+    return get(name)['path'].format(signal=signal)
+
+
+# Get index of dataset
+def index (name=None):
+    """ Method for getting the index of dataset `name`, or of the selected dataset if None.
+
+    The index maps each signal process to the index of its input file, cf.
+    `keyindex.get`, which is stored in the cache directory and re-used for as
+    long as the input file is unchanged.
+    """
+    return dict((signal, keyindex.get(path(signal, name))) for signal in signals)
+
+
+# Check whether histogram exists
+def exists (signal, histname, name=None):
+    """ Method for checking whether histogram `histname` exists in the input file for `signal` in dataset `name`. """
+    return keyindex.exists(path(signal, name), histname)
+
+
+# Main function definition.
+def main ():
+
+    # Parse command-line arguments
+    parser = argparse.ArgumentParser(description="List the input datasets of the LRT plotting macros, and index their input files.")
+    parser.add_argument('names', nargs='*',
+                        help='Names of the datasets to list or index (default: all)')
+    parser.add_argument('--index', dest='index', action='store_const',
+                        const=True, default=False,
+                        help='Index the input files of the datasets (default: False)')
+    args = parser.parse_args()
+
+    names = args.names or sorted(registry()['datasets'])
+    for name in names:
+        spec = get(name)
+        print "%-16s%s %s" % (name, '*' if name == registry()['default'] else ' ', spec['description'])
+        print "%-17s %s" % ('', spec['path'])
+        if args.index:
+            for signal, keys in sorted(index(name).items()):
+                print "%-17s %d histograms for %s" % ('', len(keys), signal)
+                pass
+            pass
+        pass
+
+    return
+
+
+if __name__ == '__main__':
+    main()
+    pass
@@ -10,53 +10,66 @@ Date:   22 June 2017
 # Basic
 import itertools
 
-# ROOT
-import ROOT
+# ROOTplotting (imported on first use)
+from lazy import ap
 
 # Local
 from common import *
-from rootplotting import ap
-from rootplotting.tools import *
+import loader
+import output
+import datasets
+import staging
+import planner
+import incremental
 from snippets.functions import displayNameUnit
 
 
 # Main function definition.
-def main ():
+def main (args=None):
 
     # Parse command-line arguments
-    args = parser.parse_args()
-
-    # Settings
-    signals = ['RPV', 'Rhadron']
-    variables = ['pt', 'prodR']
-    histname = "IDPerformanceMon/LargeD0/basicPlot/SignalParticles/truth{var}"
-    rebin = {
-        'RPV':     2,
-        'Rhadron': 1,
-        }
+    if args is None:
+        args = parser.parse_args()
+        pass
+    configure(args)
+
+    # Settings, cf. plots.yaml
+    spec      = planner.family('distribution')
+    axes      = planner.axes('distribution')
+    signals   = axes['signal']
+    variables = axes['var']
+    histname  = spec['histname']
+    rebin     = spec['rebin']
+
+    # Stage input files in the background
+    staging.start(datasets.path(signal) for signal in signals)
     
     # Loop variables
     for var in variables:
 
-        # Load histograms
-        histograms = list()
+        # Skip plot if up to date
         hn = histname.format(var=var)
+        savepath = 'plots/distributions_{var}.pdf'.format(var=var)
+        fp = incremental.fingerprint(main, var, signals, rebin, [signal_line(signal) for signal in signals], qualifier, colours, displayNameUnit(var),
+                                     sources=planner.expand('distribution', var=var))
+        if incremental.up_to_date(args, [savepath], fp):
+            continue
+
+        # Load histograms, for the signals for which they exist
+        histograms, present = list(), list()
         for signal in signals:
-            f = ROOT.TFile(filename.format(signal=signal), 'READ')
-            try:
-                h = f.Get(hn)
-                h.SetDirectory(0)
-                if signal in rebin: h.Rebin(rebin[signal])
-            except: # Plot doesn't exist for 'signal'
+            if not datasets.exists(signal, hn):
                 print "Histogram '%s' does not exist for signal '%s'" % (hn, signal)
-                h = None
                 continue
+            h = loader.get(datasets.path(signal), hn)
+            if signal in rebin: h.Rebin(rebin[signal])
             histograms.append(h)
+            present.append(signal)
             pass
         
         # Draw figure
         c = ap.canvas(batch=not args.show)
-        for hist, signal, col in zip(histograms, signals, colours):
+        for hist, signal, col in zip(histograms, present, colours):
             c.hist(hist, label=signal_line(signal), linecolor=col, normalise=True)
             pass
         c.xlabel(displayNameUnit(var))
@@ -64,10 +77,16 @@ def main ():
         c.text(["MC truth"], qualifier=qualifier)
         c.legend()
         c.logy()
-        if args.save: c.save('plots/distributions_{var}.pdf'.format(var=var))
+        if args.save:
+            output.save(c, savepath, bundle='distributions')
+            incremental.record([savepath], fp)
+            pass
         if args.show: c.show()
         pass
 
+    # Write bundles
+    output.close()
+
     return
 
 
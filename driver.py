@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script for producing all plots for the large-radius tracking (LRT) PUBNOTE in a single process.
+
+Each plot family is first run as a dry run, to plan the plots to be produced
+and the union of the input histograms they need. These are then read once each,
+file by file, and each family is plotted from memory, such that ROOT and the
+plotting style are only initialised once. The input histograms are read in
+batches of one input file each, cf. `planner.read`.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import copy
+from collections import OrderedDict
+
+# Local
+from common import *
+import planner
+import staging
+import incremental
+import efficiencyPlots
+import resolutionPlots
+import robustnessEfficiencyPlots
+import robustnessResolutionPlots
+import distributionPlots
+import comparisonPlots
+
+
+# Plot families, by name
+FAMILIES = OrderedDict([
+    ('efficiency',            efficiencyPlots.main),
+    ('resolution',            resolutionPlots.main),
+    ('robustness-efficiency', robustnessEfficiencyPlots.main),
+    ('robustness-resolution', robustnessResolutionPlots.main),
+    ('distribution',          distributionPlots.main),
+    ('comparison',            comparisonPlots.main),
+    ])
+
+parser.add_argument('--only', dest='only', default=','.join(FAMILIES.keys()),
+                    help='Comma-separated list of plot families to produce, out of: %s (default: all)' % ', '.join(FAMILIES.keys()))
+
+
+# Main function definition.
+def main ():
+
+    # Parse command-line arguments
+    args = parser.parse_args()
+    families = [family.strip() for family in args.only.split(',') if family.strip()]
+
+    # Check(s)
+    unknown = [family for family in families if family not in FAMILIES]
+    if unknown:
+        parser.error("Unknown plot famil%s: %s" % ('ies' if len(unknown) > 1 else 'y', ', '.join(unknown)))
+        pass
+
+    # Plan plots, and the input histograms they need
+    dry_args = copy.copy(args)
+    dry_args.dry_run = True
+    incremental.plan = list()
+    for family in families:
+        FAMILIES[family](dry_args)
+        pass
+    plan, incremental.plan = incremental.plan, None
+
+    if args.dry_run:
+        for outputs, _ in plan:
+            print "Would produce plot(s): %s" % ', '.join(outputs)
+            pass
+        return
+
+    # Read each input histogram once, one input file per task
+    sources = set(source for _, sources in plan for source in sources)
+    configure(args)
+    staging.start(sorted(set(path for path, _ in sources)))
+    print "Reading %d histogram(s) for %d plot(s)" % (len(sources), len(plan))
+    planner.read(sources, jobs=args.jobs)
+
+    # Produce plots
+    for family in families:
+        print "Producing %s plots" % family
+        FAMILIES[family](args)
+        pass
+
+    return
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+""" Efficiency utilities for LRT plotting macros.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+from array import array
+
+# Scientific import(s)
+import numpy as np
+
+# Local
+import histarrays
+
+
+# Get combined efficiency of two track collections
+def combined_efficiency (h1, h2, name=None):
+    """ Method for getting the combined efficiency of two disjoint track collections.
+
+    The efficiencies `h1` and `h2` are TProfiles with the same binning, and with
+    the same number of (truth particle) entries per bin. The result is identical
+    to calling `Fill(x, 1)` on a clone of `h1` once for each particle passing
+    either collection, and `Fill(x, 0)` once for each failing particle, in each
+    bin; but the bin sums and sums of squares are set from the per-bin counts
+    directly.
+    """
+
+    # Per-bin counts
+    num_total = histarrays.entries (h1)[1:-1].astype(int)
+    eff1      = histarrays.contents(h1)[1:-1]
+    eff2      = histarrays.contents(h2)[1:-1]
+
+    num_pass = (eff1 * num_total).astype(int) + (eff2 * num_total).astype(int)
+    num_fail = np.clip(num_total - num_pass, 0, None)
+    num_fill = num_pass + num_fail
+
+    # Book combined profile
+    h = h1.Clone(name or (h1.GetName() + '_comb'))
+    h.Reset()
+
+    # Set bin sums (of y and y^2; identical for y in {0, 1}), and bin entries
+    histarrays.values (h)[1:-1] = num_pass
+    histarrays.sumw2  (h)[1:-1] = num_pass
+    histarrays.entries(h)[1:-1] = num_fill
+    if histarrays.binsumw2(h) is not None:
+        histarrays.binsumw2(h)[1:-1] = num_fill
+        pass
+
+    # Set statistics: sum(w), sum(w^2), sum(wx), sum(wx^2), sum(wy), sum(wy^2)
+    x = histarrays.centers(h.GetXaxis())
+    stats = [num_fill.sum(), num_fill.sum(),
+             (num_fill * x).sum(), (num_fill * x * x).sum(),
+             num_pass.sum(), num_pass.sum()]
+    h.PutStats(array('d', map(float, stats)))
+    h.SetEntries(float(num_fill.sum()))
+
+    return h
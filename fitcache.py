@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+""" Memoized fit results for LRT plotting macros.
+
+Results of deterministic calculations, e.g. core std.dev. fits of projection
+bin arrays, are stored in an SQLite database, keyed by a hash of the function
+(incl. the source code of its module) and of its arguments. Since arguments are
+hashed by content, results are invalidated automatically when the input
+histograms, binning, or settings change. An in-memory LRU cache sits in front of
+the database.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import os
+import sys
+import json
+import atexit
+import inspect
+import hashlib
+import sqlite3
+from collections import OrderedDict
+
+# Scientific import(s)
+import numpy as np
+
+# Local
+import cache
+import parallel
+
+
+# Whether to use the fit cache
+use_cache = True
+
+# Maximal number of results kept in memory
+max_memory = 4096
+
+# In-memory LRU cache, and database connection
+_memory = OrderedDict()
+_db     = None
+
+# Hashes of module source code, keyed by module name
+_module_hashes = dict()
+
+
+# Get database connection
+def _get_db ():
+    """ Method for getting the connection to the database of fit results, opening it on first use. """
+    global _db
+    if _db is None:
+        if not os.path.isdir(cache.cache_dir):
+            os.makedirs(cache.cache_dir)
+            pass
+        _db = sqlite3.connect(os.path.join(cache.cache_dir, 'fits.sqlite'))
+        _db.execute('CREATE TABLE IF NOT EXISTS fits (key TEXT PRIMARY KEY, result TEXT)')
+        pass
+    return _db
+
+
+# Close database connection
+def close ():
+    """ Method for closing the database connection. """
+    global _db
+    if _db is not None:
+        _db.commit()
+        _db.close()
+        _db = None
+        pass
+    return
+
+
+# Update hash with argument
+def _update (sha, arg):
+    """ Method for updating hash `sha` with the contents of `arg`. """
+    if isinstance(arg, np.ndarray):
+        sha.update(repr((arg.dtype.str, arg.shape)).encode('utf-8'))
+        sha.update(np.ascontiguousarray(arg).tobytes())
+    elif isinstance(arg, (list, tuple)):
+        sha.update(('%s%d' % (type(arg).__name__, len(arg))).encode('utf-8'))
+        for item in arg:
+            _update(sha, item)
+            pass
+    else:
+        sha.update(repr(arg).encode('utf-8'))
+        pass
+    return
+
+
+# Get key of function call
+def key (func, args):
+    """ Method for getting the key of calling `func(*args)`. """
+
+    # Hash of module source code, such that changes to the calculation invalidate results
+    module = func.__module__
+    if module not in _module_hashes:
+        _module_hashes[module] = hashlib.sha1(inspect.getsource(sys.modules[module]).encode('utf-8')).hexdigest()
+        pass
+
+    sha = hashlib.sha1()
+    sha.update(('%s.%s:%s' % (module, func.__name__, _module_hashes[module])).encode('utf-8'))
+    _update(sha, args)
+    return sha.hexdigest()
+
+
+# Look up result
+def lookup (k):
+    """ Method for getting the stored result for key `k`, or None. """
+
+    # Memory
+    if k in _memory:
+        result = _memory.pop(k)
+        _memory[k] = result # Mark as most recently used
+        return result
+
+    # Database
+    row = _get_db().execute('SELECT result FROM fits WHERE key = ?', (k,)).fetchone()
+    if row is None:
+        return None
+
+    result = json.loads(row[0])
+    _remember(k, result)
+    return result
+
+
+# Store result in memory
+def _remember (k, result):
+    """ Method for storing `result` in the in-memory LRU cache. """
+    _memory[k] = result
+    while len(_memory) > max_memory:
+        _memory.popitem(last=False)
+        pass
+    return
+
+
+# Store result
+def store (k, result):
+    """ Method for storing JSON-serialisable `result` for key `k`. """
+    result = json.loads(json.dumps(result)) # Same types as when read from database
+    _remember(k, result)
+    _get_db().execute('INSERT OR REPLACE INTO fits (key, result) VALUES (?, ?)', (k, json.dumps(result)))
+    return
+
+
+# Run list of tasks, using memoized results where available
+def run (tasks, jobs=1):
+    """ Method for running `func(*args)` for each `(func, args)` in `tasks`, see `parallel.run`.
+
+    Results already stored are returned directly; only the remaining tasks are
+    run, and their results stored. Lookups and writes happen in the calling
+    process only. Results are JSON-serialisable values, i.e. tuples are returned
+    as lists.
+    """
+
+    if not use_cache:
+        return parallel.run(tasks, jobs=jobs)
+
+    keys    = [key(func, args) for func, args in tasks]
+    results = [lookup(k) for k in keys]
+
+    # Run missing tasks, once for each distinct key
+    missing = OrderedDict()
+    for itask, (k, result) in enumerate(zip(keys, results)):
+        if result is None and k not in missing:
+            missing[k] = itask
+            pass
+        pass
+
+    for k, result in zip(missing.keys(), parallel.run([tasks[itask] for itask in missing.values()], jobs=jobs)):
+        if result is not None:
+            store(k, result)
+            pass
+        pass
+    _get_db().commit()
+
+    return [lookup(k) if result is None else result for k, result in zip(keys, results)]
+
+
+atexit.register(close)
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+""" Core-width estimators for LRT resolution robustness plots.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import math
+from array import array
+
+# Scientific import(s)
+import numpy as np
+
+# ROOT (imported on first use)
+from lazy import ROOT
+
+# Local
+import profiling
+import histarrays
+
+
+# Get variance of a Gaussian truncated at +/- k sigma, relative to the untruncated one
+def _truncationFactor (k):
+    """ Method for getting Var[x | |x| < k sigma] / sigma^2 for a Gaussian. """
+    phi  = math.exp(-0.5 * k * k) / math.sqrt(2. * math.pi)
+    frac = math.erf(k / math.sqrt(2.))
+    return 1. - 2. * k * phi / frac
+
+
+# Get bin edges and contents of histogram
+def _binArrays (h):
+    """ Method for getting the bin edges and contents (excl. under- and overflow) of `h`. """
+    return histarrays.edges(h.GetXaxis()), histarrays.contents(h)[1:-1].copy()
+
+
+# Get moments in window
+def _windowMoments (edges, w, mean, width):
+    """ Method for getting the sum of weights and the 2nd and 4th central moments within mean +/- width.
+
+    The contents are assumed to be uniformly distributed within each bin, and
+    bins on the window boundary contribute with the fraction inside the window,
+    such that the moments vary continuously with `width`.
+    """
+    lo = np.clip(edges[:-1] - mean, -width, width)
+    hi = np.clip(edges[1:]  - mean, -width, width)
+    frac = (hi - lo) / (edges[1:] - edges[:-1])
+    msk  = frac > 0
+    lo, hi, wf = lo[msk], hi[msk], (w * frac)[msk]
+
+    sumw = np.sum(wf)
+    if sumw <= 0:
+        return 0., 0., 0.
+    m2 = np.sum(wf * (lo**2 + lo * hi + hi**2) / 3.) / sumw
+    m4 = np.sum(wf * (hi**5 - lo**5) / (5. * (hi - lo))) / sumw
+    return sumw, m2, m4
+
+
+# Get normalisation of Gaussian in window
+def _windowNorm (edges, sumw, mean, std, width):
+    """ Method for getting the amplitude of a Gaussian with `mean` and `std` for which the contents within mean +/- width sum to `sumw`.
+
+    The content of each bin is the integral of the Gaussian over the part of
+    the bin inside the window, divided by the width of the bin, such that the
+    Gaussian describes the bin contents, as for a fit, also for variable bins.
+    """
+    lo = np.clip(edges[:-1] - mean, -width, width)
+    hi = np.clip(edges[1:]  - mean, -width, width)
+    msk = hi > lo
+    erf = np.vectorize(math.erf)
+    integrals = (erf(hi[msk] / (std * math.sqrt(2.))) - erf(lo[msk] / (std * math.sqrt(2.)))) * std * math.sqrt(math.pi / 2.)
+    return sumw / np.sum(integrals / (edges[1:] - edges[:-1])[msk])
+
+
+# Get "core" std.dev. and assoc. error using truncated moments
+def coreStdMoments (edges, w, sigma=5, mean=0., start=None, tol=1.0E-04, max_iter=100):
+    """ Method for getting the std.dev. in the central +/- sigma of a distribution without fitting.
+
+    The second moment of the bin contents `w` (with bin edges `edges`) in the
+    window mean +/- sigma * std is corrected for the truncation of a Gaussian at
+    +/- sigma, and the window is updated until the relative change in std is
+    below `tol`. Starts from `start` if given (warm start), otherwise from twice
+    the bin width. Returns the std, its error, and the number of iterations.
+    """
+
+    # Check(s)
+    if len(w) < 2 or np.sum(w) <= 0:
+        return 0., 0., 0
+
+    # Book keeping
+    factor  = _truncationFactor(sigma)
+    old_std = 0
+    std     = start if start else (edges[1] - edges[0]) * 2
+    var, m4, sumw = 0., 0., 0.
+    it = 0
+
+    # Perform iterations
+    while abs(std - old_std) > tol * abs(std) and it < max_iter:
+
+        # Truncated moments in current window
+        sumw, var, m4 = _windowMoments(edges, w, mean, sigma * std)
+        if sumw <= 0:
+            return 0., 0., it + 1
+
+        # Update RMSs
+        old_std = std
+        std     = math.sqrt(var / factor)
+        it += 1
+        pass
+
+    # Error from the variance of the truncated second moment
+    err = math.sqrt(max(m4 - var * var, 0.) / sumw) / (2. * std * factor) if std > 0 else 0.
+
+    # Return
+    return std, err, it
+
+
+# Get "core" std.dev. and assoc. error, for given mean and bin arrays
+def _getCoreStd (h, edges, w, sigma, mean, start, tol, method, max_iter):
+    """ Method for getting the core std.dev. of `h`, see `getCoreStd`. Bin arrays `edges`, `w` are only used for method 'moments'. """
+
+    fit = ROOT.TF1('fit', 'gaus')
+
+    # Truncated moments
+    if method == 'moments':
+        std, err, it = coreStdMoments(edges, w, sigma=sigma, mean=mean, start=start, tol=tol, max_iter=max_iter)
+
+        # Equivalent Gaussian, normalised to the contents in the window
+        if std > 0:
+            sumw, _, _ = _windowMoments(edges, w, mean, sigma * std)
+            fit.SetParameters(_windowNorm(edges, sumw, mean, std, sigma * std), mean, std)
+            fit.SetParErrors(array('d', [0., 0., err]))
+            fit.SetRange(mean - sigma * std, mean + sigma * std)
+            pass
+        profiling.count('fit iterations', it)
+        return std, err, fit, it
+
+    # Book keeping
+    old_std = 0          # RMS from pervious iteration
+    std     = start if start else h.GetXaxis().GetBinWidth(1) * 2 # RMS from current iteration
+    it = 0                 # Iteration counter, to avoid endless loop
+
+    # Perform iterations
+    while abs(std - old_std) > tol * abs(std) and it < max_iter:
+
+        # Update axis limits
+        fit.SetRange(mean - sigma * std, mean + sigma * std)
+        h.Fit(fit, 'QR0')
+
+        # Update RMSs
+        old_std  = std
+        std      = fit.GetParameter(2)
+        it += 1
+        pass
+
+    profiling.count('fit iterations', it)
+
+    # Return
+    return fit.GetParameter(2), fit.GetParError(2), fit, it
+
+
+# Get "core" std.dev. and assoc. error
+@profiling.profiled('fit')
+def getCoreStd (h, sigma=5, fix_mean=None, start=None, tol=1.0E-04, method='fit', max_iter=100):
+    """ Method for getting the std.dev. in the central +/- sigma of a distribution.
+
+    With `method` 'fit', a Gaussian is fitted iteratively in the window mean +/-
+    sigma * std until the relative change in std is below `tol`; with 'moments',
+    the std is estimated from truncated moments (see `coreStdMoments`) and no
+    Minuit fits are performed. The iteration can be warm-started from `start`,
+    e.g. the result for a neighbouring value of `sigma`. Returns the std, its
+    error, the (fitted or equivalent) Gaussian function, and the number of
+    iterations.
+    """
+
+    # Check(s)
+    assert method in ['fit', 'moments'], "Method '%s' not recognised" % method
+
+    mean = h.GetMean() if fix_mean is None else fix_mean
+    edges, w = _binArrays(h) if method == 'moments' else (None, None)
+
+    return _getCoreStd(h, edges, w, sigma, mean, start, tol, method, max_iter)
+
+
+# Get "core" std.dev. for several window sizes
+@profiling.profiled('fit')
+def getCoreStdWindows (h, sigmas=(3, 2.5, 2.0), fix_mean=None, tol=1.0E-04, method='fit', max_iter=100):
+    """ Method for getting the core std.dev. of a distribution for several window sizes at once.
+
+    The first entry in `sigmas` is taken as the nominal window; the systematic
+    uncertainty is the largest deviation of the other windows from it. The bin
+    arrays are extracted once, and each window is warm-started from the result
+    of the previous one. Returns lists of the stds, errors, fit functions, and
+    iteration counts for each window, as well as the systematic uncertainty.
+    """
+
+    # Check(s)
+    assert method in ['fit', 'moments'], "Method '%s' not recognised" % method
+    assert len(sigmas) > 0, "No window sizes were given"
+
+    mean = h.GetMean() if fix_mean is None else fix_mean
+    edges, w = _binArrays(h) if method == 'moments' else (None, None)
+
+    # Loop windows, warm-starting from previous result
+    stds, errs, fits, its = list(), list(), list(), list()
+    start = None
+    for sigma in sigmas:
+        std, err, fit, it = _getCoreStd(h, edges, w, sigma, mean, start, tol, method, max_iter)
+        stds.append(std)
+        errs.append(err)
+        fits.append(fit)
+        its .append(it)
+        start = std if std > 0 else None
+        pass
+
+    syst = max([abs(std - stds[0]) for std in stds[1:]] + [0.])
+
+    return stds, errs, syst, fits, its
+
+
+# Get bin arrays of histogram
+def projectionArrays (h):
+    """ Method for getting the bin edges, contents, and errors (incl. under- and overflow) of `h` as NumPy arrays. """
+    return histarrays.edges(h.GetXaxis()), histarrays.contents(h).copy(), histarrays.errors(h)
+
+
+# Get "core" std.dev. for several window sizes, from bin arrays
+@profiling.profiled('fit')
+def getCoreStdWindowsArrays (edges, contents, errors, sigmas=(3, 2.5, 2.0), fix_mean=None, method='fit', tol=1.0E-04, max_iter=100):
+    """ Method for getting the core std.dev. of a distribution given as bin arrays, see `getCoreStdWindows`.
+
+    The arrays are as returned by `projectionArrays`, such that the calculation
+    can be performed away from the original histogram, e.g. in a worker process.
+    If `fix_mean` is None, the mean is taken from the bin centres. Returns lists
+    of the stds, errors, and iteration counts for each window, as well as the
+    systematic uncertainty.
+    """
+
+    # Check(s)
+    assert method in ['fit', 'moments'], "Method '%s' not recognised" % method
+    assert len(sigmas) > 0, "No window sizes were given"
+
+    x = 0.5 * (edges[1:] + edges[:-1])
+    w = contents[1:-1]
+    if fix_mean is None:
+        mean = np.sum(x * w) / np.sum(w) if np.sum(w) > 0 else 0.
+    else:
+        mean = fix_mean
+        pass
+
+    # Truncated moments; no ROOT objects needed
+    if method == 'moments':
+        stds, errs, its = list(), list(), list()
+        start = None
+        for sigma in sigmas:
+            std, err, it = coreStdMoments(edges, w, sigma=sigma, mean=mean, start=start, tol=tol, max_iter=max_iter)
+            stds.append(std)
+            errs.append(err)
+            its .append(it)
+            start = std if std > 0 else None
+            pass
+
+        profiling.count('fit iterations', sum(its))
+        syst = max([abs(std - stds[0]) for std in stds[1:]] + [0.])
+        return stds, errs, syst, its
+
+    # Gaussian fits; re-create histogram from bin arrays
+    h = ROOT.TH1D('proj', "", len(edges) - 1, array('d', edges))
+    h.SetDirectory(0)
+    for bin, (content, error) in enumerate(zip(contents, errors)):
+        h.SetBinContent(bin, content)
+        h.SetBinError  (bin, error)
+        pass
+
+    stds, errs, syst, _, its = getCoreStdWindows(h, sigmas=sigmas, fix_mean=mean, tol=tol, method=method, max_iter=max_iter)
+    return stds, errs, syst, its
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+
+""" NumPy-backed histograms for LRT plotting macros.
+
+Intermediate steps of the plotting, i.e. cloning, adding, rebinning, and
+projecting histograms, and clearing their under- and overflow bins, are
+performed on `Hist` objects, which hold the bin edges and bin arrays as NumPy
+arrays, rather than on ROOT histograms, each of which is a named object
+registered in ROOT's global directory. ROOT histograms are only created at the
+boundaries, i.e. when reading, cf. `from_arrays` and `from_root`, and when
+drawing or fitting, cf. `to_root`.
+
+Bin arrays include under- and overflow bins, and are indexed by bin number as
+in ROOT, i.e. bin 0 is the underflow bin; for two-dimensional histograms they
+are indexed as `[xbin, ybin]`.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Scientific import(s)
+import numpy as np
+
+# Local
+import histarrays
+import rebinning
+
+
+# Histogram as NumPy arrays
+class Hist (object):
+    """ Histogram of one or two dimensions, or profile, as NumPy arrays.
+
+    For histograms, `values` and `sumw2` are the bin sums of weights and of
+    squared weights, and `entries` is None. For profiles, `values` and `sumw2`
+    are the bin sums of w*y and w*y^2, `entries` are the bin sums of weights,
+    and `binsumw2` the bin sums of squared weights, if stored.
+    """
+
+    __slots__ = ['edges', 'values', 'sumw2', 'entries', 'binsumw2', 'nentries',
+                 'profile', 'name', 'title', 'xtitle', 'ytitle', 'ylimits', 'erroroption']
+
+    def __init__ (self, edges, values, sumw2=None, entries=None, binsumw2=None, nentries=None, profile=False,
+                  name='', title='', xtitle='', ytitle='', ylimits=(0., 0.), erroroption=''):
+        self.edges       = tuple(np.asarray(e, dtype=np.float64) for e in edges)
+        self.values      = np.asarray(values, dtype=np.float64)
+        self.sumw2       = np.abs(self.values) if sumw2 is None else np.asarray(sumw2, dtype=np.float64) # Unit weights, if not stored
+        self.entries     = None if entries  is None else np.asarray(entries,  dtype=np.float64)
+        self.binsumw2    = None if binsumw2 is None else np.asarray(binsumw2, dtype=np.float64)
+        self.nentries    = float(self.values.sum() if nentries is None else nentries)
+        self.profile     = profile
+        self.name        = name
+        self.title       = title
+        self.xtitle      = xtitle
+        self.ytitle      = ytitle
+        self.ylimits     = tuple(ylimits)
+        self.erroroption = erroroption
+
+        # Check(s)
+        assert self.values.shape == tuple(len(e) + 1 for e in self.edges), "Bin arrays of shape %s don't match edges" % (self.values.shape,)
+        assert not (profile and self.ndim > 1), "Profiles of dimension %d are not supported" % self.ndim
+        return
+
+    @property
+    def ndim (self):
+        """ Number of dimensions. """
+        return len(self.edges)
+
+    def nbins (self, axis=0):
+        """ Method for getting the number of bins along `axis`, excluding under- and overflow. """
+        return len(self.edges[axis]) - 1
+
+    def low_edge (self, bin, axis=0):
+        """ Method for getting the lower edge of `bin` along `axis`, cf. TAxis::GetBinLowEdge. """
+        return self.edges[axis][bin - 1]
+
+    def up_edge (self, bin, axis=0):
+        """ Method for getting the upper edge of `bin` along `axis`, cf. TAxis::GetBinUpEdge. """
+        return self.edges[axis][bin]
+
+    def center (self, bin, axis=0):
+        """ Method for getting the centre of `bin` along `axis`, cf. TAxis::GetBinCenter. """
+        return 0.5 * (self.low_edge(bin, axis) + self.up_edge(bin, axis))
+
+    def find_bin (self, x, axis=0):
+        """ Method for getting the bin along `axis` containing `x`, incl. under- and overflow, cf. TAxis::FindBin. """
+        return int(np.searchsorted(self.edges[axis], x, side='right'))
+
+    def contents (self):
+        """ Method for getting the bin contents, i.e. the bin averages for profiles, incl. under- and overflow. """
+        if self.profile:
+            return np.divide(self.values, self.entries, out=np.zeros_like(self.values), where=self.entries != 0)
+        return self.values.copy()
+
+    def errors (self):
+        """ Method for getting the bin errors of a histogram, incl. under- and overflow. """
+
+        # Check(s)
+        assert not self.profile, "Bin errors of profiles are only available through ROOT, cf. `to_root`"
+
+        return np.sqrt(self.sumw2)
+
+    def integral (self, flows=False):
+        """ Method for getting the sum of bin contents, optionally incl. under- and overflow, cf. TH1::Integral. """
+        values = self.values if flows else self.values[(slice(1, -1),) * self.ndim]
+        return float(values.sum())
+
+    def arrays (self):
+        """ Method for getting the bin edges, contents, and errors of a one-dimensional histogram, cf. `fitting.projectionArrays`. """
+
+        # Check(s)
+        assert self.ndim == 1, "Only one-dimensional histograms are supported"
+
+        return self.edges[0].copy(), self.contents(), self.errors()
+
+    def clone (self, name=None):
+        """ Method for getting an independent copy, cf. TH1::Clone. """
+        return Hist(self.edges, self.values.copy(), self.sumw2.copy(),
+                    None if self.entries  is None else self.entries .copy(),
+                    None if self.binsumw2 is None else self.binsumw2.copy(),
+                    self.nentries, self.profile, self.name if name is None else name,
+                    self.title, self.xtitle, self.ytitle, self.ylimits, self.erroroption)
+
+    def add (self, other, c=1.):
+        """ Method for adding `c` times `other`, with the same binning, in place, cf. TH1::Add. """
+
+        # Check(s)
+        assert self.profile == other.profile, "Cannot add histograms and profiles"
+        assert len(self.edges) == len(other.edges) and all(np.array_equal(e1, e2) for e1, e2 in zip(self.edges, other.edges)), \
+            "Cannot add histograms with different binning"
+
+        if self.profile:
+            self.values  += c * other.values
+            self.sumw2   += c * other.sumw2
+            self.entries += c * other.entries
+            if self.binsumw2 is not None and other.binsumw2 is not None:
+                self.binsumw2 += c * c * other.binsumw2
+                pass
+        else:
+            self.values += c * other.values
+            self.sumw2  += c * c * other.sumw2
+            pass
+        self.nentries += other.nentries
+        return self
+
+    def clear_flows (self, axis=0):
+        """ Method for setting the under- and overflow bins along `axis` to zero, in place. """
+        for bin in [0, -1]:
+            index = (slice(None),) * axis + (bin,)
+            for arr in [self.values, self.sumw2, self.entries, self.binsumw2]:
+                if arr is not None:
+                    arr[index] = 0.
+                    pass
+                pass
+            pass
+        return self
+
+    def rebin (self, ngroup_or_edges, axis=0, name=None, snap=False):
+        """ Method for getting a rebinned copy, cf. TH1::Rebin.
+
+        The new binning is given either as a number of adjacent bins to merge,
+        in which case remaining bins at the upper end are added to the overflow
+        bin, or as a list of new bin edges, each of which must coincide with an
+        existing edge, unless `snap`; bins outside of the new range are added
+        to the under- and overflow bins. Cf. `rebinning`.
+        """
+
+        old = self.edges[axis]
+        new = rebinning.edges(old, ngroup_or_edges, snap)
+        values, sumw2, entries, binsumw2 = rebinning.apply([self.values, self.sumw2, self.entries, self.binsumw2], old, new, axis)
+
+        return Hist(self.edges[:axis] + (new,) + self.edges[axis + 1:],
+                    values, sumw2, entries, binsumw2,
+                    self.nentries, self.profile, self.name if name is None else name,
+                    self.title, self.xtitle, self.ytitle, self.ylimits, self.erroroption)
+
+    def projection (self, axis=1, first=0, last=-1, name=None):
+        """ Method for getting the projection onto `axis` of a two-dimensional histogram, cf. TH2::ProjectionY.
+
+        The bins from `first` to `last` (included) along the other axis are
+        summed; if `last` < `first`, all bins are summed, incl. under- and
+        overflow.
+        """
+
+        # Check(s)
+        assert self.ndim == 2, "Only two-dimensional histograms can be projected"
+
+        other = 1 - axis
+        if last < first:
+            first, last = 0, self.nbins(other) + 1
+            pass
+
+        index = (slice(None),) * other + (slice(first, last + 1),)
+        values = self.values[index].sum(axis=other)
+        return Hist((self.edges[axis],), values, self.sumw2[index].sum(axis=other),
+                    name=name or (self.name + ('_px' if axis == 0 else '_py')), title=self.title,
+                    xtitle=self.ytitle if axis == 1 else self.xtitle)
+
+    def projections (self, pairs, axis=1, clear_flows=False, rebin=None, name=None):
+        """ Method for getting the projections onto `axis` of several bin ranges along the other axis, in one pass.
+
+        Each of `pairs` is a (first, last) range of bins, as for `projection`.
+        The bin arrays of all projections are computed together, as differences
+        of cumulative sums along the other axis, such that they are rows of one
+        two-dimensional array per bin array. With `clear_flows`, the under- and
+        overflow bins of the projections are set to zero, cf. `clear_flows`;
+        with `rebin`, a number of bins to merge or list of bin edges, all
+        projections are rebinned together, cf. `rebin`. Returns a list of
+        one-dimensional histograms.
+        """
+
+        # Check(s)
+        assert self.ndim == 2, "Only two-dimensional histograms can be projected"
+
+        other = 1 - axis
+        pairs  = np.array(pairs, dtype=int).reshape(-1, 2)
+        full   = pairs[:, 1] < pairs[:, 0]
+        firsts = np.where(full, 0, pairs[:, 0])
+        lasts  = np.where(full, self.nbins(other) + 1, pairs[:, 1])
+
+        # Sums over bin ranges, as differences of cumulative sums
+        def slices (arr):
+            arr = np.swapaxes(arr, 0, other)
+            cum = np.concatenate((np.zeros((1,) + arr.shape[1:]), np.cumsum(arr, axis=0)))
+            return cum[lasts + 1] - cum[firsts]
+
+        values, sumw2 = slices(self.values), slices(self.sumw2)
+        if clear_flows:
+            values[:, [0, -1]] = 0.
+            sumw2 [:, [0, -1]] = 0.
+            pass
+
+        # Rebin all projections together
+        edges = self.edges[axis]
+        if rebin is not None:
+            edges = rebinning.edges(self.edges[axis], rebin)
+            values, sumw2 = rebinning.apply([values, sumw2], self.edges[axis], edges, axis=1)
+            pass
+
+        name   = name or (self.name + ('_px' if axis == 0 else '_py'))
+        xtitle = self.ytitle if axis == 1 else self.xtitle
+        return [Hist((edges,), v, w2, name='%s_%d' % (name, i), title=self.title, xtitle=xtitle)
+                for i, (v, w2) in enumerate(zip(values, sumw2))]
+
+    def projection_x (self, first=0, last=-1, name=None):
+        """ Method for getting the projection onto the x-axis of the y-bins from `first` to `last`, cf. TH2::ProjectionX. """
+        return self.projection(0, first, last, name)
+
+    def projection_y (self, first=0, last=-1, name=None):
+        """ Method for getting the projection onto the y-axis of the x-bins from `first` to `last`, cf. TH2::ProjectionY. """
+        return self.projection(1, first, last, name)
+
+    @classmethod
+    def from_arrays (cls, d):
+        """ Method for creating a histogram from arrays, as returned by `histarrays.to_arrays`. """
+
+        edges = [d['xedges']] + ([d['yedges']] if 'yedges' in d else [])
+        shape = tuple(len(e) + 1 for e in reversed(edges))
+
+        # Get bin array, from ROOT's global bin order
+        def cells (key):
+            if key not in d:
+                return None
+            return np.asarray(d[key], dtype=np.float64).reshape(shape).T.copy()
+
+        profile = str(d['cls']) == 'TProfile'
+        return cls(edges,
+                   cells('sumw' if profile else 'contents'),
+                   cells('sumw2'),
+                   cells('binentries'),
+                   cells('binsumw2'),
+                   float(d['entries']),
+                   profile,
+                   str(d['name']), str(d['title']), str(d['xtitle']), str(d['ytitle']),
+                   tuple(d['ylimits']) if profile else (0., 0.),
+                   str(d['erroroption']) if profile else '')
+
+    @classmethod
+    def from_root (cls, h):
+        """ Method for creating a histogram from ROOT histogram `h`. """
+        return cls.from_arrays(histarrays.to_arrays(h))
+
+    def to_arrays (self):
+        """ Method for getting the histogram as arrays, cf. `histarrays.to_arrays`; statistics are recomputed by `to_root`. """
+
+        # Get bin array, in ROOT's global bin order
+        def cells (arr):
+            return arr.T.ravel()
+
+        d = {
+            'cls':      'TProfile' if self.profile else ('TH2D' if self.ndim == 2 else 'TH1D'),
+            'name':     self.name,
+            'title':    self.title,
+            'entries':  np.array(self.nentries),
+            'stats':    np.zeros(histarrays.NSTAT),
+            'xedges':   self.edges[0],
+            'xtitle':   self.xtitle,
+            'ytitle':   self.ytitle,
+            'contents': cells(self.contents()),
+            'sumw2':    cells(self.sumw2),
+            }
+
+        if self.ndim == 2:
+            d['yedges'] = self.edges[1]
+            pass
+
+        if self.profile:
+            d['sumw']        = cells(self.values)
+            d['binentries']  = cells(self.entries)
+            d['ylimits']     = np.array(self.ylimits)
+            d['erroroption'] = self.erroroption
+            if self.binsumw2 is not None:
+                d['binsumw2'] = cells(self.binsumw2)
+                pass
+            pass
+
+        return d
+
+    def to_root (self):
+        """ Method for creating an equivalent (detached) ROOT histogram, e.g. for drawing or fitting. """
+        h = histarrays.from_arrays(self.to_arrays())
+        h.ResetStats() # Recompute statistics from bin contents
+        h.SetEntries(self.nentries)
+        return h
+
+    pass
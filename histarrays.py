@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+
+""" Conversion between ROOT histograms and NumPy arrays for LRT plotting macros.
+
+The bin arrays of a ROOT histogram, i.e. the sums of weights (`values`), of
+squared weights (`sumw2`), and, for profiles, the bin entries (`entries`) and
+bin sums of squared weights (`binsumw2`), are exposed as NumPy views of the
+underlying C++ buffers, rather than read bin by bin through PyROOT. Views are
+not copies: writing to a view modifies the histogram, and a view must not be
+used after the histogram is deleted or rebinned. Bin contents and errors are
+computed from the views, cf. `contents` and `errors`.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+from array import array
+
+# Scientific import(s)
+import numpy as np
+
+# ROOT (imported on first use)
+from lazy import ROOT
+
+
+# Number of statistics entries, cf. TH1::kNstat
+NSTAT = 13
+
+# Bin content types, by class name suffix
+DTYPES = {
+    'D': np.float64,
+    'F': np.float32,
+    'I': np.int32,
+    'S': np.int16,
+    'C': np.int8,
+    }
+
+# Error options of TProfile, indexed by EErrorType
+ERROR_OPTIONS = ['', 's', 'i', 'g']
+
+
+# Get NumPy view of C++ buffer
+def _view (buf, n, dtype=np.float64):
+    """ Method for getting a (non-copying) NumPy view of `n` elements in `buf`. """
+    try:
+        buf.reshape((n,)) # cppyy low-level view
+    except AttributeError:
+        buf.SetSize(n)    # Legacy PyROOT buffer
+        pass
+    return np.frombuffer(buf, dtype=dtype, count=n)
+
+
+# Get bin content type of histogram
+def _dtype (h):
+    """ Method for getting the NumPy type of the bin contents of `h`, e.g. float32 for TH1F. """
+    if h.InheritsFrom('TProfile'):
+        return np.float64
+    return DTYPES[h.ClassName()[-1]]
+
+
+# Get bin edges of axis
+def edges (ax):
+    """ Method for getting the bin edges of ROOT axis `ax`. """
+    if ax.GetXbins().GetSize() > 0:
+        return _view(ax.GetXbins().GetArray(), ax.GetNbins() + 1).copy()
+    return np.linspace(ax.GetXmin(), ax.GetXmax(), ax.GetNbins() + 1)
+
+
+# Get bin centres of axis
+def centers (ax):
+    """ Method for getting the bin centres of ROOT axis `ax`, excl. under- and overflow. """
+    e = edges(ax)
+    return 0.5 * (e[:-1] + e[1:])
+
+
+# Get view of bin sums
+def values (h):
+    """ Method for getting a view of the bin sums of weights of `h`, i.e. of w*y for profiles, incl. under- and overflow. """
+    return _view(h.GetArray(), h.GetNcells(), _dtype(h))
+
+
+# Get view of bin sums of squares
+def sumw2 (h):
+    """ Method for getting a view of the bin sums of squared weights of `h`, i.e. of w*y^2 for profiles, or None if not stored. """
+    if h.GetSumw2N() == 0:
+        return None
+    return _view(h.GetSumw2().GetArray(), h.GetNcells())
+
+
+# Get view of profile bin entries
+def entries (h):
+    """ Method for getting a view of the bin entries, i.e. the bin sums of weights, of profile `h`. """
+    return _view(h.GetB(), h.GetNcells())
+
+
+# Get view of profile bin sums of squared weights
+def binsumw2 (h):
+    """ Method for getting a view of the bin sums of squared weights of profile `h`, or None if not stored. """
+    if h.GetBinSumw2().GetSize() == 0:
+        return None
+    return _view(h.GetBinSumw2().GetArray(), h.GetNcells())
+
+
+# Get bin contents
+def contents (h):
+    """ Method for getting the bin contents of `h`, i.e. the bin averages for profiles, incl. under- and overflow, cf. TH1::GetBinContent.
+
+    For histograms of doubles, this is a view; otherwise a copy.
+    """
+    if not h.InheritsFrom('TProfile'):
+        return values(h) if _dtype(h) == np.float64 else values(h).astype(np.float64)
+    sumw = entries(h)
+    return np.divide(values(h), sumw, out=np.zeros(len(sumw)), where=sumw != 0)
+
+
+# Get bin errors
+def errors (h):
+    """ Method for getting the bin errors of `h`, incl. under- and overflow, cf. TH1::GetBinError and TProfile::GetBinError. """
+
+    # Histograms
+    if not h.InheritsFrom('TProfile'):
+        w2 = sumw2(h)
+        return np.sqrt(np.abs(values(h)) if w2 is None else w2)
+
+    # Profiles, for each error option, cf. TProfileHelper::GetBinError
+    sumw, sumwy, sumwy2, w2 = entries(h), values(h), sumw2(h), binsumw2(h)
+    filled = sumw != 0
+    safe   = np.where(filled, sumw, 1.)
+    neff   = (sumw * sumw / np.where(w2 != 0, w2, 1.)) if w2 is not None else sumw
+    neff   = np.where(filled & (neff > 0), neff, 1.)
+    spread = np.sqrt(np.abs(sumwy2 / safe - (sumwy / safe)**2))
+
+    option = h.GetErrorOption()
+    if option == 'g':
+        err = 1. / np.sqrt(safe)
+    elif option == 'i':
+        err = np.where(spread != 0, spread / np.sqrt(neff), np.where(sumwy2 != 0, 1. / np.sqrt(12. * neff), 0.))
+    elif option == 's':
+        err = spread
+    else:
+        err = spread / np.sqrt(neff)
+        pass
+    return np.where(filled, err, 0.)
+
+
+# Get string from bytes
+def _str (s):
+    """ Method for getting `s` as a native string, decoding bytes if necessary. """
+    return s if isinstance(s, str) else s.decode('utf-8')
+
+
+# Get bin edges of uproot axis
+def _uproot_edges (ax):
+    """ Method for getting the bin edges of uproot axis `ax`. """
+    if len(ax._fXbins) > 0:
+        return np.array(ax._fXbins, dtype=np.float64)
+    return np.linspace(ax._fXmin, ax._fXmax, ax._fNbins + 1)
+
+
+# Extract histogram as arrays
+def to_arrays (h):
+    """ Method for extracting all bin-level information of a TH1, TH2, or TProfile.
+
+    Returns a dict of NumPy arrays (and strings), from which an equivalent,
+    detached histogram can be re-created using `from_arrays`. Bin arrays are
+    copies, in ROOT's global bin order, and include under- and overflow bins.
+    """
+
+    # Check(s)
+    dim = h.GetDimension()
+    assert dim in [1, 2], "Histograms of dimension %d are not supported" % dim
+
+    profile = h.InheritsFrom('TProfile')
+
+    stats = array('d', [0.] * NSTAT)
+    h.GetStats(stats)
+
+    d = {
+        'cls':      'TProfile' if profile else ('TH2D' if dim == 2 else 'TH1D'),
+        'name':     h.GetName(),
+        'title':    h.GetTitle(),
+        'entries':  np.array(h.GetEntries()),
+        'stats':    np.array(stats),
+        'xedges':   edges(h.GetXaxis()),
+        'xtitle':   h.GetXaxis().GetTitle(),
+        'ytitle':   h.GetYaxis().GetTitle(),
+        'contents': contents(h).copy(),
+        }
+
+    if dim == 2:
+        d['yedges'] = edges(h.GetYaxis())
+        pass
+
+    if profile:
+        # For profiles, `contents` are bin averages; store the underlying sums
+        d['sumw']  = values(h).copy()
+        d['binentries'] = entries(h).copy()
+        d['ylimits'] = np.array([h.GetYmin(), h.GetYmax()])
+        d['erroroption'] = h.GetErrorOption()
+        if binsumw2(h) is not None:
+            d['binsumw2'] = binsumw2(h).copy()
+            pass
+        pass
+
+    if sumw2(h) is not None:
+        d['sumw2'] = sumw2(h).copy()
+        pass
+
+    return d
+
+
+# Create histogram from arrays
+def from_arrays (d):
+    """ Method for re-creating a (detached) histogram from arrays, as returned by `to_arrays`. """
+
+    cls     = str(d['cls'])
+    name    = str(d['name'])
+    title   = str(d['title'])
+    xedges  = np.asarray(d['xedges'], dtype=np.float64)
+    nx      = len(xedges) - 1
+
+    # Book histogram, without registering it in the current directory, where it could replace a histogram of the same name
+    status = ROOT.TH1.AddDirectoryStatus()
+    ROOT.TH1.AddDirectory(False)
+    try:
+        if cls == 'TProfile':
+            ymin, ymax = d['ylimits']
+            h = ROOT.TProfile(name, title, nx, array('d', xedges), float(ymin), float(ymax), str(d['erroroption']))
+        elif cls == 'TH2D':
+            yedges = np.asarray(d['yedges'], dtype=np.float64)
+            h = ROOT.TH2D(name, title, nx, array('d', xedges), len(yedges) - 1, array('d', yedges))
+        else:
+            h = ROOT.TH1D(name, title, nx, array('d', xedges))
+            pass
+    finally:
+        ROOT.TH1.AddDirectory(status)
+        pass
+    h.SetDirectory(0)
+    h.GetXaxis().SetTitle(str(d['xtitle']))
+    h.GetYaxis().SetTitle(str(d['ytitle']))
+
+    # Set bin arrays
+    if cls == 'TProfile':
+        values(h)[:] = d['sumw']
+        entries(h)[:] = d['binentries']
+        if 'binsumw2' in d:
+            h.Sumw2() # Allocates bin sum of weights squared
+            binsumw2(h)[:] = d['binsumw2']
+            pass
+    else:
+        values(h)[:] = d['contents']
+        pass
+
+    if 'sumw2' in d:
+        if h.GetSumw2N() == 0:
+            h.Sumw2()
+            pass
+        sumw2(h)[:] = d['sumw2']
+        pass
+
+    # Set statistics
+    h.PutStats(array('d', np.asarray(d['stats'], dtype=np.float64)))
+    h.SetEntries(float(d['entries']))
+
+    return h
+
+
+# Extract uproot histogram as arrays
+def from_uproot (obj):
+    """ Method for extracting all bin-level information of a TH1, TH2, or TProfile read with uproot.
+
+    Returns the same dict as `to_arrays` would for the corresponding ROOT
+    histogram, without using ROOT. Statistics are taken from the stored members,
+    as for an un-ranged histogram.
+    """
+
+    # Check(s)
+    cls = type(obj).__name__
+    profile = cls == 'TProfile'
+    dim = 2 if cls.startswith('TH2') else 1
+    assert profile or cls[:3] in ['TH1', 'TH2'], "Histograms of class %s are not supported" % cls
+
+    # Statistics, cf. TH1::GetStats, TH2::GetStats, and TProfile::GetStats
+    stats = [obj._fTsumw, obj._fTsumw2, obj._fTsumwx, obj._fTsumwx2]
+    if dim == 2:
+        stats += [obj._fTsumwy, obj._fTsumwy2, obj._fTsumwxy]
+    elif profile:
+        stats += [obj._fTsumwy, obj._fTsumwy2]
+        pass
+    stats += [0.] * (NSTAT - len(stats))
+
+    raw = np.array(obj[:], dtype=np.float64) # Bin array, in global bin order
+
+    d = {
+        'cls':      'TProfile' if profile else ('TH2D' if dim == 2 else 'TH1D'),
+        'name':     _str(obj._fName),
+        'title':    _str(obj._fTitle),
+        'entries':  np.array(obj._fEntries, dtype=np.float64),
+        'stats':    np.array(stats, dtype=np.float64),
+        'xedges':   _uproot_edges(obj._fXaxis),
+        'xtitle':   _str(obj._fXaxis._fTitle),
+        'ytitle':   _str(obj._fYaxis._fTitle),
+        'contents': raw,
+        }
+
+    if dim == 2:
+        d['yedges'] = _uproot_edges(obj._fYaxis)
+        pass
+
+    if profile:
+        binentries = np.array(obj._fBinEntries, dtype=np.float64)
+        d['contents'] = np.divide(raw, binentries, out=np.zeros_like(raw), where=binentries != 0)
+        d['sumw']  = raw
+        d['binentries'] = binentries
+        d['ylimits'] = np.array([obj._fYmin, obj._fYmax])
+        d['erroroption'] = ERROR_OPTIONS[obj._fErrorMode]
+        if len(obj._fBinSumw2) > 0:
+            d['binsumw2'] = np.array(obj._fBinSumw2, dtype=np.float64)
+            pass
+        pass
+
+    if len(obj._fSumw2) > 0:
+        d['sumw2'] = np.array(obj._fSumw2, dtype=np.float64)
+        pass
+
+    return d
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+""" Incremental plot rebuilding for LRT plotting macros.
+
+Each saved plot is recorded together with a fingerprint of everything it was
+produced from: the input histograms (path, size, and modification time of the
+input file, and histogram name), the code producing it, and any settings and
+labels passed explicitly. With `--incremental`, plots whose fingerprint is
+unchanged are not redrawn. Fingerprints are stored in a hidden file next to
+each output, such that parallel processes never write to the same file.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import os
+import inspect
+import hashlib
+
+# Local
+import cache
+import output
+import writer
+
+
+# Planned (outputs, sources) of plots; recorded, instead of listed, during dry runs if not None
+plan = None
+
+# Input histograms of fingerprints, keyed by fingerprint
+_sources = dict()
+
+# Get path of fingerprint file for output
+def _fingerprint_file (output):
+    """ Method for getting the path of the file holding the fingerprint of `output`. """
+    directory, basename = os.path.split(output)
+    return os.path.join(directory, '.' + basename + '.fingerprint')
+
+
+# Get fingerprint of plot
+def fingerprint (*items, **kwargs):
+    """ Method for getting the fingerprint of a plot produced from `items` and `sources`.
+
+    Functions in `items` contribute with their source code; all other items with
+    their repr. The keyword argument `sources` is a list of (path, histname)
+    pairs of input histograms, which contribute with the stamp of the input file.
+    """
+
+    sources = kwargs.pop('sources', list())
+    assert not kwargs, "Keyword argument(s) %s not recognised" % ', '.join(kwargs)
+
+    sha = hashlib.sha1()
+    for item in items:
+        if inspect.isfunction(item):
+            item = inspect.getsource(item)
+            pass
+        sha.update(repr(item).encode('utf-8'))
+        pass
+    for path, histname in sources:
+        sha.update(repr((path, cache.stamp(path), histname)).encode('utf-8'))
+        pass
+
+    digest = sha.hexdigest()
+    _sources[digest] = list(sources)
+    return digest
+
+
+# Check whether outputs are up to date
+def is_fresh (outputs, fp):
+    """ Method for checking whether all `outputs` exist and were produced with fingerprint `fp`. """
+
+    for path in outputs:
+        fpfile = _fingerprint_file(path)
+        if not (all(map(os.path.isfile, output.files(path))) and os.path.isfile(fpfile)):
+            return False
+        with open(fpfile, 'r') as f:
+            if f.read().strip() != fp:
+                return False
+            pass
+        pass
+
+    return True
+
+
+# Check whether plot can be skipped
+def up_to_date (args, outputs, fp):
+    """ Method for checking whether producing `outputs` can be skipped, given command-line arguments `args`.
+
+    With `--dry-run`, outputs are only listed, or recorded in `plan` together
+    with their input histograms, and always skipped. Bundles are always
+    written in full, so plots are never skipped with `--bundle`.
+    """
+
+    if args.incremental and args.save and not (args.show or args.bundle) and is_fresh(outputs, fp):
+        print "Skipping up-to-date plot(s): %s" % ', '.join(outputs)
+        return True
+
+    if args.dry_run:
+        if plan is not None:
+            plan.append((outputs, _sources.get(fp, list())))
+        else:
+            print "Would produce plot(s): %s" % ', '.join(outputs)
+            pass
+        return True
+
+    return False
+
+
+# Record fingerprint of outputs
+def record (outputs, fp):
+    """ Method for recording that `outputs` were produced with fingerprint `fp`.
+
+    With asynchronous writing, fingerprints are recorded once the outputs have
+    been written, and not for outputs which failed to be written.
+    """
+    writer.then(_record, outputs, fp)
+    return
+
+
+# Write fingerprint files
+def _record (outputs, fp):
+    """ Method for writing the fingerprint files of `outputs`, cf. `record`. """
+
+    for path in outputs:
+        if any(map(writer.failed, output.files(path))):
+            continue
+        with open(_fingerprint_file(path), 'w') as f:
+            f.write(fp + '\n')
+            pass
+        pass
+    return
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+""" Index of the histograms in input files for LRT plotting macros.
+
+For each input file, the path of every object under `IDPerformanceMon/` is
+mapped to its class and number of dimensions, by walking the directories of
+the file once. The index is stored in the cache directory of the input file,
+cf. `cache`, and is thus rebuilt automatically when the input file changes.
+Scripts check whether their input histograms exist using the index, rather
+than by attempting to read them.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import os
+import re
+import json
+
+# ROOT (imported on first use)
+from lazy import ROOT
+
+# Local
+import cache
+import loader
+import histarrays
+import profiling
+
+
+# Top-level directory of indexed objects
+top = 'IDPerformanceMon/'
+
+# Indices, keyed by path of input file
+_indices = dict()
+
+
+# Get number of dimensions of class
+def _dimensions (classname):
+    """ Method for getting the number of dimensions of histograms of class `classname`, or 0 for other classes. """
+    m = re.match(r'^T(?:H([123])|Profile([23])?)', classname)
+    if m is None:
+        return 0
+    return int(m.group(1) or m.group(2) or 1)
+
+
+# Walk ROOT directory
+def _walk (directory, prefix):
+    """ Method for getting the (path, class name) pairs of all objects in ROOT `directory` and its subdirectories. """
+    keys = list()
+    for key in directory.GetListOfKeys():
+        name = prefix + key.GetName()
+        cls  = ROOT.TClass.GetClass(key.GetClassName())
+        if cls and cls.InheritsFrom('TDirectory'):
+            keys.extend(_walk(key.ReadObj(), name + '/'))
+        else:
+            keys.append((name, key.GetClassName()))
+            pass
+        pass
+    return keys
+
+
+# Walk uproot directory
+def _walk_uproot (directory, prefix):
+    """ Method for getting the (path, class name) pairs of all objects in uproot `directory` and its subdirectories. """
+    keys = list()
+    for name, classname in directory.allclassnames():
+        keys.append((prefix + histarrays._str(name).rsplit(';', 1)[0], histarrays._str(classname)))
+        pass
+    return keys
+
+
+# Build index of input file
+def _build (path):
+    """ Method for walking input file `path`, and getting its index, cf. `get`. """
+
+    with profiling.timed('index'):
+        if loader.backend == 'uproot':
+            keys = _walk_uproot(loader.get_uproot_file(path)[top.rstrip('/')], top)
+        else:
+            directory = loader.get_file(path).Get(top.rstrip('/'))
+            keys = _walk(directory, top) if directory else list()
+            pass
+        pass
+
+    return dict((name, (classname, _dimensions(classname))) for name, classname in keys)
+
+
+# Get index of input file
+def get (path):
+    """ Method for getting the index of input file `path`.
+
+    The index maps the path of each object under `top` to a tuple of its class
+    name and its number of dimensions (0 for non-histograms). The index is read
+    from the cache directory of the input file, if available.
+    """
+
+    if path not in _indices:
+
+        # Try cache
+        directory = cache.input_dir(path) if loader.use_cache else None
+        indexfile = os.path.join(directory, 'keys.json') if directory else None
+        index = None
+        if indexfile and os.path.isfile(indexfile):
+            try:
+                with open(indexfile, 'r') as f:
+                    index = dict((name, tuple(entry)) for name, entry in json.load(f).items())
+                    pass
+            except ValueError: # Partial index file; re-build
+                pass
+            pass
+
+        # Build index
+        if index is None:
+            index = _build(path)
+            if indexfile:
+                tmpfile = indexfile + '.%d.tmp' % os.getpid()
+                with open(tmpfile, 'w') as f:
+                    json.dump(index, f)
+                    pass
+                os.rename(tmpfile, indexfile)
+                pass
+            pass
+
+        _indices[path] = index
+        pass
+
+    return _indices[path]
+
+
+# Check whether histogram exists
+def exists (path, histname):
+    """ Method for checking whether object `histname` exists in input file `path`.
+
+    Objects outside of `top` are not indexed, and are assumed to exist.
+    """
+    if not histname.startswith(top):
+        return True
+    return histname in get(path)
+
+
+# Get number of dimensions of histogram
+def dimensions (path, histname):
+    """ Method for getting the number of dimensions of histogram `histname` in input file `path`, or None if it does not exist. """
+    entry = get(path).get(histname)
+    return None if entry is None else entry[1]
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+""" Deferred imports for LRT plotting macros.
+
+Importing ROOT, and rootplotting on top of it, takes several seconds. Modules
+are therefore accessed through proxies which import the actual module on first
+attribute access, such that argument parsing, planning, and cache lookups run
+without loading ROOT.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import importlib
+
+
+# Module imported on first use
+class LazyModule (object):
+    """ Proxy for module `name`, which is imported on first attribute access. """
+
+    def __init__ (self, name):
+        self._name   = name
+        self._module = None
+        self._hooks  = list()
+        return
+
+    def _load (self):
+        """ Method for importing the module, and calling any hooks, if not already done. """
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+            for hook in self._hooks:
+                hook(self._module)
+                pass
+            self._hooks = list()
+            pass
+        return self._module
+
+    def __getattr__ (self, attr):
+        return getattr(self._load(), attr)
+
+    def loaded (self):
+        """ Method for checking whether the module has been imported. """
+        return self._module is not None
+
+    def on_load (self, hook):
+        """ Method for calling `hook(module)` once the module is imported; immediately, if it already is. """
+        if self._module is not None:
+            hook(self._module)
+        else:
+            self._hooks.append(hook)
+            pass
+        return
+
+    pass
+
+
+# Deferred modules
+ROOT = LazyModule('ROOT')
+ap   = LazyModule('rootplotting.ap')
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+""" Shared histogram loader for LRT plotting macros.
+
+Keeps a single open handle per input file for the lifetime of the process, such
+that reading many histograms from the same (EOS) file only pays for opening it
+once. Histograms are read either through PyROOT or, with `backend = 'uproot'`,
+lazily through uproot, in which case only the requested keys are deserialised,
+and ROOT is only used to create the histograms to be drawn.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import atexit
+
+# ROOT and uproot (imported on first use; uproot is optional)
+from lazy import ROOT, LazyModule
+uproot = LazyModule('uproot')
+
+# Local
+import cache
+import histarrays
+import profiling
+import staging
+
+
+# Open file handles, keyed by path
+_files = dict()
+
+# Open uproot file handles, keyed by path
+_uproot_files = dict()
+
+# Whether to use the on-disk cache of histogram arrays
+use_cache = True
+
+# Library used to read histograms; 'root' or 'uproot'
+backend = 'root'
+
+# Arrays of prefetched histograms, keyed by (path, histname)
+_prefetched = dict()
+
+
+# Get (shared) file handle
+def get_file (path):
+    """ Method for getting the open handle for `path`, opening it on first use, from the staged copy if any. """
+
+    if path not in _files:
+        local = staging.local(path)
+        with profiling.timed('open'):
+            f = ROOT.TFile.Open(local, 'READ')
+            pass
+
+        # Check(s)
+        if not f or f.IsZombie():
+            raise IOError("Could not open file '%s'" % path)
+
+        # Don't leave the global directory pointing to the input file
+        ROOT.gROOT.cd()
+
+        _files[path] = f
+        pass
+
+    return _files[path]
+
+
+# Get (shared) uproot file handle
+def get_uproot_file (path):
+    """ Method for getting the open uproot handle for `path`, opening it on first use. """
+
+    if path not in _uproot_files:
+        local = staging.local(path)
+        with profiling.timed('open'):
+            _uproot_files[path] = uproot.open(local)
+            pass
+        pass
+
+    return _uproot_files[path]
+
+
+# Get histogram arrays from file
+def get_arrays (path, histname):
+    """ Method for reading the arrays of histogram `histname` from file `path`, cf. `histarrays.to_arrays`.
+
+    Returns None if the histogram does not exist. With the uproot backend, ROOT
+    is not used.
+    """
+
+    # Try prefetched histograms
+    if (path, histname) in _prefetched:
+        return _prefetched[(path, histname)]
+
+    # Try cache
+    if use_cache:
+        with profiling.timed('read (cache)'):
+            d = cache.load(path, histname)
+            pass
+        if d is not None:
+            return d
+        pass
+
+    # Read from file
+    if backend == 'uproot':
+        f = get_uproot_file(path)
+        try:
+            with profiling.timed('read'):
+                d = histarrays.from_uproot(f[histname])
+                pass
+        except KeyError:
+            return None
+    else:
+        f = get_file(path)
+        with profiling.timed('read'):
+            h = f.Get(histname)
+            pass
+        if not h:
+            return None
+        d = histarrays.to_arrays(h)
+        pass
+
+    if use_cache:
+        cache.store(path, histname, d)
+        pass
+
+    return d
+
+
+# Get histogram from file
+def get (path, histname, detach=True):
+    """ Method for reading histogram `histname` from file `path`.
+
+    If `detach` is True, the histogram is removed from the file directory, such
+    that the caller owns a copy which may be modified freely. Returns None if the
+    histogram does not exist. If `use_cache` is True, histograms are re-created
+    from the on-disk cache when possible, in which case the input file is not
+    opened; cached histograms are always detached, as are prefetched histograms
+    and histograms read with the uproot backend.
+    """
+
+    # Read through uproot, or from memory
+    if backend == 'uproot' or (path, histname) in _prefetched:
+        d = get_arrays(path, histname)
+        return None if d is None else histarrays.from_arrays(d)
+
+    # Try cache
+    if use_cache:
+        with profiling.timed('read (cache)'):
+            d = cache.load(path, histname)
+            pass
+        if d is not None:
+            return histarrays.from_arrays(d)
+        pass
+
+    f = get_file(path)
+    with profiling.timed('read'):
+        h = f.Get(histname)
+        pass
+    if not h:
+        return None
+
+    if use_cache:
+        cache.store(path, histname, histarrays.to_arrays(h))
+        pass
+
+    if detach:
+        h.SetDirectory(0) # Keep in memory independently of file.
+        pass
+
+    return h
+
+
+# Read several histograms from file
+def read_batch (path, histnames):
+    """ Method for reading the arrays of each of the histograms `histnames` from file `path`, cf. `get_arrays`. """
+    return [get_arrays(path, histname) for histname in histnames]
+
+
+# Keep histogram in memory
+def keep (path, histname, d):
+    """ Method for keeping the arrays `d` of histogram `histname` in file `path` in memory.
+
+    Subsequent calls to `get` and `get_arrays` for this histogram are served
+    from memory, cf. `planner.read`.
+    """
+    _prefetched[(path, histname)] = d
+    return
+
+
+# Close all open file handles
+def close_all ():
+    """ Method for closing all shared file handles. """
+
+    for f in _files.values():
+        f.Close()
+        pass
+    _files.clear()
+    _uproot_files.clear() # Closed when garbage collected
+    return
+
+
+atexit.register(close_all)
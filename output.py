@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+""" Output of drawn canvases for LRT plotting macros.
+
+Each canvas is drawn and finalised once, and written in each of the requested
+formats, e.g. PDF, PNG, SVG, and ROOT, from that single render, whether or not
+it is bundled. Files are written through `writer`, i.e. asynchronously with
+`--async-save`. With bundling, the
+PDF pages and ROOT canvases of a whole plot family are instead written to a single multi-page PDF file and a
+single ROOT file, e.g. `plots/RPV_EffPlots.pdf`, which avoids writing
+thousands of small files to network file systems. Bundles are kept in memory
+and written when closed, such that any number of bundles can be filled at the
+same time.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import os
+import atexit
+from collections import OrderedDict
+
+# ROOT (imported on first use)
+from lazy import ROOT
+
+# Local
+import profiling
+import writer
+
+
+# Supported output formats
+FORMATS = ['pdf', 'png', 'svg', 'eps', 'root']
+
+# Formats which can be bundled
+BUNDLED = ['pdf', 'root']
+
+# Output formats
+formats = ['pdf']
+
+# Whether to bundle plot families
+bundling = False
+
+# Canvases in open bundles, as lists of (name, canvas, bare canvas), keyed by path without extension
+_bundles = OrderedDict()
+
+
+# Configure output
+def configure (args):
+    """ Method for setting the output formats and bundling from command-line arguments `args`. """
+    global formats, bundling
+
+    requested = [fmt.strip().lower() for fmt in args.formats.split(',') if fmt.strip()]
+
+    # Check(s)
+    unknown = [fmt for fmt in requested if fmt not in FORMATS]
+    assert not unknown, "Output format(s) %s not supported; choose from %s" % (', '.join(unknown), ', '.join(FORMATS))
+
+    formats  = requested
+    bundling = args.bundle
+
+    writer.enabled = args.async_save
+    writer.size    = args.save_queue
+    return
+
+
+# Get paths of output files
+def files (path):
+    """ Method for getting the paths of the files written by `save` for `path`, if not bundled. """
+    base = os.path.splitext(path)[0]
+    return [base + '.' + fmt for fmt in formats]
+
+
+# Finalise canvas
+def _finalise (c):
+    """ Method for finalising the drawing of canvas `c`, as `ap.canvas.save` does before writing, and getting the bare ROOT canvas. """
+    c._update()
+    return c._bare()
+
+
+# Save canvas
+def save (c, path, bundle=None):
+    """ Method for writing the drawn canvas `c` to `path` in each of the output formats.
+
+    The extension of `path` is replaced by that of each format. With bundling,
+    the canvas is instead added as a page to bundle `bundle`, in the directory
+    of `path`, for the formats which support it.
+    """
+
+    base    = os.path.splitext(path)[0]
+    bundled = [fmt for fmt in formats if fmt in BUNDLED] if bundling and bundle is not None else []
+    pad     = _finalise(c)
+
+    if bundled:
+        key = os.path.join(os.path.dirname(path), bundle)
+        _bundles.setdefault(key, list()).append((os.path.basename(base), c, pad))
+        pass
+
+    for fmt in formats:
+        if fmt in bundled:
+            continue
+        with writer.deferred(base + '.' + fmt) as filename:
+            pad.SaveAs(filename)
+            pass
+        pass
+
+    return
+
+
+# Write bundle
+def _write (key, pages):
+    """ Method for writing the pages `pages` of the bundle with path `key`, without extension.
+
+    Each page is a (name, canvas, bare canvas) tuple, with the canvas finalised
+    by `save`; the canvas is kept such that the drawn objects aren't deleted.
+    """
+
+    # Multi-page PDF
+    if 'pdf' in formats:
+        with writer.deferred(key + '.pdf') as filename:
+            pages[0][2].Print(filename + '[')
+            for name, _, pad in pages:
+                pad.Print(filename, 'Title:' + name)
+                pass
+            pages[-1][2].Print(filename + ']')
+            pass
+        pass
+
+    # ROOT file of canvases
+    if 'root' in formats:
+        with writer.deferred(key + '.root') as filename:
+            f = ROOT.TFile.Open(filename, 'RECREATE')
+            for name, _, pad in pages:
+                f.WriteTObject(pad, name)
+                pass
+            f.Close()
+            pass
+        pass
+
+    return
+
+
+# Close bundles
+def close ():
+    """ Method for writing all open bundles, and waiting for all pending writes. """
+
+    for key, pages in _bundles.items():
+        with profiling.timed('save'):
+            _write(key, pages)
+            pass
+        print "Wrote bundle %s.{%s} with %d plot(s)" % (key, ','.join(fmt for fmt in formats if fmt in BUNDLED), len(pages))
+        pass
+
+    _bundles.clear()
+    writer.flush()
+    return
+
+
+atexit.register(close)
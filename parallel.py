@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+""" Process-pool execution of independent plotting tasks for LRT plotting macros.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import atexit
+import traceback
+import multiprocessing
+
+# ROOT (imported on first use)
+from lazy import ROOT
+
+# Local
+import loader
+import profiling
+import staging
+
+
+# Worker pools, keyed by number of processes
+_pools = dict()
+
+# Whether this is a worker process
+_worker = False
+
+
+# Initialise worker process
+def _initialise ():
+    """ Method for giving each worker process its own ROOT state and file handles. """
+    global _worker
+    _worker = True
+
+    # Handles inherited from the parent process are not shared; forget, don't close, them
+    loader._files.clear()
+    loader._uproot_files.clear()
+    _pools.clear()
+
+    # Configure ROOT, once loaded
+    ROOT.on_load(_configure)
+    return
+
+
+# Configure ROOT in worker process
+def _configure (ROOT):
+    """ Method for setting up ROOT for drawing in a worker process. """
+    ROOT.gROOT.SetBatch(True)
+    ROOT.TH1.AddDirectory(False)
+    return
+
+
+# Call task, catching any exception
+def _call (task):
+    """ Method for calling `func(*args)` for `task = (func, args)`.
+
+    Returns the result, the formatted traceback, if any, and, in worker
+    processes, the profiling records of the task, cf. `profiling.snapshot`.
+    """
+    func, args = task
+    try:
+        result, error = func(*args), None
+    except Exception:
+        result, error = None, traceback.format_exc()
+        pass
+    return result, error, profiling.snapshot(reset=True) if _worker and profiling.enabled else None
+
+
+# Get (shared) worker pool
+def _get_pool (jobs):
+    """ Method for getting the pool of `jobs` worker processes, creating it on first use. """
+    if jobs not in _pools:
+        _pools[jobs] = multiprocessing.Pool(jobs, initializer=_initialise)
+        pass
+    return _pools[jobs]
+
+
+# Close all worker pools
+def close_all ():
+    """ Method for closing all worker pools. """
+    for pool in _pools.values():
+        pool.close()
+        pool.join()
+        pass
+    _pools.clear()
+    return
+
+
+# Get number of processes for plotting tasks
+def jobs (args):
+    """ Method for getting the number of processes with which to produce plots, from command-line arguments `args`.
+
+    Plots are produced serially when they are shown, when only planned, or
+    when bundled, since each bundle is written by a single process.
+    """
+    if args.show or args.dry_run or args.bundle:
+        return 1
+    return args.jobs
+
+
+# Run list of tasks
+def run (tasks, jobs=1):
+    """ Method for running `func(*args)` for each `(func, args)` in `tasks`, using `jobs` processes.
+
+    Each `func` must be a module-level function, and `args` must be picklable.
+    Worker pools are kept alive between calls, such that many small batches of
+    tasks do not each pay for starting up the worker processes.
+    Results are returned in the order of `tasks`, irrespective of the order in
+    which they finish. Failing tasks do not stop the remaining ones; they are
+    reported at the end, and their result is None.
+    """
+
+    # Run tasks; worker processes read the staged copies of input files rather than staging them again
+    if jobs > 1 and len(tasks) > 1:
+        staging.wait()
+        outputs = _get_pool(jobs).map(_call, tasks, chunksize=1)
+    else:
+        outputs = map(_call, tasks)
+        pass
+
+    # Collect results and profiling records, and report failures
+    results, failures = list(), 0
+    for itask, (result, error, records) in enumerate(outputs):
+        if records is not None:
+            profiling.merge(records)
+            pass
+        if error is not None:
+            print "Task %d/%d failed:" % (itask + 1, len(tasks))
+            print error
+            failures += 1
+            pass
+        results.append(result)
+        pass
+
+    if failures:
+        print "%d out of %d tasks failed." % (failures, len(tasks))
+        pass
+
+    return results
+
+
+atexit.register(close_all)
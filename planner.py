@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+""" Plot manifest and read planning for LRT plotting macros.
+
+Plot families, i.e. the templates of their input histogram names, the axes of
+variation, labels, and rebinning, are declared in `plots.yaml`. The planner
+expands families into lists of input histograms, and turns any list of input
+histograms into batches with one entry per input file, without duplicates and
+sorted by directory, which are then read by the executor.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import os
+import itertools
+from collections import OrderedDict
+
+# PyYAML (imported on first use)
+from lazy import LazyModule
+yaml = LazyModule('yaml')
+
+# Local
+import loader
+import datasets
+import parallel
+
+
+# Path of the plot manifest
+manifest_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plots.yaml')
+
+# Parsed manifest
+_manifest = None
+
+
+# Get plot manifest
+def manifest ():
+    """ Method for getting the plot manifest, reading it on first use. """
+    global _manifest
+    if _manifest is None:
+        with open(manifest_path, 'r') as f:
+            _manifest = yaml.safe_load(f)
+            pass
+        pass
+    return _manifest
+
+
+# Get plot family
+def family (name):
+    """ Method for getting the specification of plot family `name` in the manifest. """
+
+    # Check(s)
+    if name not in manifest():
+        raise KeyError("Plot family '%s' not found in %s" % (name, manifest_path))
+
+    return manifest()[name]
+
+
+# Get axes of plot family
+def axes (name):
+    """ Method for getting the axes of variation of plot family `name`, as an ordered dict of lists of values. """
+    return OrderedDict(axis.items()[0] for axis in family(name)['axes'])
+
+
+# Expand plot family into input histograms
+def expand (name, **fixed):
+    """ Method for getting the (path, histname) pairs of the input histograms of plot family `name`.
+
+    Axes given as keyword arguments are fixed to the given value; the remaining
+    axes are varied, in the order of the manifest.
+    """
+
+    spec = family(name)
+    free = OrderedDict((axis, values) for axis, values in axes(name).items() if axis not in fixed)
+
+    # Check(s)
+    unknown = set(fixed) - set(axes(name))
+    assert not unknown, "Axes %s not found for plot family '%s'" % (', '.join(sorted(unknown)), name)
+
+    sources = list()
+    for values in itertools.product(*free.values()):
+        kwargs = dict(fixed, **dict(zip(free.keys(), values)))
+        sources.append((datasets.path(kwargs['signal']), spec['histname'].format(**kwargs)))
+        pass
+
+    return sources
+
+
+# Get batches of reads
+def batches (sources):
+    """ Method for grouping (path, histname) pairs into one batch per input file.
+
+    Returns a list of (path, histnames) pairs, in which duplicate histograms
+    are removed and histogram names are sorted, such that each directory is read
+    in one go.
+    """
+
+    grouped = OrderedDict()
+    for path, histname in sorted(set(sources)):
+        grouped.setdefault(path, list()).append(histname)
+        pass
+
+    return grouped.items()
+
+
+# Read input histograms
+def read (sources, jobs=1):
+    """ Method for reading the input histograms `sources` once each, in batches of one input file per task.
+
+    The histograms are kept in memory, cf. `loader.keep`. With `jobs` > 1,
+    input files are read in parallel, and the worker processes are closed
+    afterwards, such that the workers of later tasks are forked from this
+    process once the histograms are kept, rather than reading them again.
+    """
+
+    tasks = batches(sources)
+    for (path, histnames), arrays in zip(tasks, parallel.run([(loader.read_batch, task) for task in tasks], jobs=jobs)):
+        if arrays is None: # Failure reported by `parallel.run`
+            continue
+        for histname, d in zip(histnames, arrays):
+            if d is not None:
+                loader.keep(path, histname, d)
+                pass
+            pass
+        pass
+
+    # Workers forked before the histograms were kept don't have them
+    parallel.close_all()
+    return
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+""" Per-stage timing and profiling for LRT plotting macros.
+
+With `--profile`, the wall time and number of calls of each stage of the
+plotting pipeline are recorded: opening input files, reading histograms,
+rebinning, projecting, fitting (incl. the number of iterations), drawing, and
+saving. Stages in worker processes are merged into the totals of the main
+process. At exit, a summary is printed and written as JSON and CSV, and,
+with `--cprofile`, a cProfile dump is written, e.g. for use with snakeviz or
+flameprof.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import csv
+import json
+import time
+import atexit
+import inspect
+import functools
+from contextlib import contextmanager
+from collections import OrderedDict
+
+# ROOT (imported on first use)
+from lazy import ROOT, ap
+
+
+# Whether to record stages
+enabled = False
+
+# Prefix of output files
+output = 'profile'
+
+# Wall time and number of calls, by stage
+_stages = OrderedDict()
+
+# Counters, e.g. number of fit iterations, by name
+_counters = OrderedDict()
+
+# Stages currently being timed; nested calls of the same stage are not double counted
+_active = set()
+
+# cProfile profiler, if any
+_profiler = None
+
+
+# Time block as stage
+@contextmanager
+def timed (stage):
+    """ Method for timing the enclosed block as one call of `stage`, if profiling is enabled. """
+    if not enabled or stage in _active:
+        yield
+        return
+
+    _active.add(stage)
+    start = time.time()
+    try:
+        yield
+    finally:
+        _active.discard(stage)
+        add(stage, time.time() - start)
+        pass
+    return
+
+
+# Decorator for timing function calls as stage
+def profiled (stage):
+    """ Method for getting a decorator timing each call of the decorated function as `stage`. """
+    def decorator (func):
+        @functools.wraps(func)
+        def wrapper (*args, **kwargs):
+            with timed(stage):
+                return func(*args, **kwargs)
+            pass
+        return wrapper
+    return decorator
+
+
+# Add time to stage
+def add (stage, seconds, calls=1):
+    """ Method for adding `seconds` and `calls` to the totals of `stage`. """
+    total, ncalls = _stages.get(stage, (0., 0))
+    _stages[stage] = (total + seconds, ncalls + calls)
+    return
+
+
+# Increment counter
+def count (name, n=1):
+    """ Method for incrementing counter `name` by `n`, if profiling is enabled. """
+    if enabled:
+        _counters[name] = _counters.get(name, 0) + n
+        pass
+    return
+
+
+# Take snapshot of records
+def snapshot (reset=False):
+    """ Method for getting the records of stages and counters, optionally resetting them. """
+    records = (OrderedDict(_stages), OrderedDict(_counters))
+    if reset:
+        _stages.clear()
+        _counters.clear()
+        pass
+    return records
+
+
+# Merge records
+def merge (records):
+    """ Method for merging `records` from `snapshot`, e.g. from a worker process, into the current ones. """
+    stages, counters = records
+    for stage, (seconds, calls) in stages.items():
+        add(stage, seconds, calls)
+        pass
+    for name, n in counters.items():
+        _counters[name] = _counters.get(name, 0) + n
+        pass
+    return
+
+
+# Instrument method
+def instrument (cls, name, stage):
+    """ Method for timing all calls of method `name` of class `cls` as `stage`. """
+    method = getattr(cls, name)
+    def wrapper (*args, **kwargs):
+        with timed(stage):
+            return method(*args, **kwargs)
+        pass
+    setattr(cls, name, wrapper)
+    return
+
+
+# Instrument ROOT
+def _instrument_ROOT (ROOT):
+    """ Method for timing rebinning and projections of ROOT histograms. """
+    for cls, name, stage in [(ROOT.TH1,      'Rebin',       'rebin'),
+                             (ROOT.TH1,      'RebinX',      'rebin'),
+                             (ROOT.TProfile, 'Rebin',       'rebin'),
+                             (ROOT.TProfile, 'RebinX',      'rebin'),
+                             (ROOT.TH2,      'RebinX',      'rebin'),
+                             (ROOT.TH2,      'ProjectionY', 'projection')]:
+        if hasattr(cls, name):
+            instrument(cls, name, stage)
+            pass
+        pass
+    return
+
+
+# Instrument rootplotting
+def _instrument_ap (ap):
+    """ Method for timing drawing and saving of rootplotting canvases. """
+    if inspect.isclass(ap.canvas):
+        for name in ['plot', 'hist', 'graph']:
+            instrument(ap.canvas, name, 'draw')
+            pass
+        instrument(ap.canvas, 'save', 'save')
+        pass
+    return
+
+
+# Enable profiling
+def enable (args):
+    """ Method for enabling profiling as requested by command-line arguments `args`; may be called repeatedly. """
+    global enabled, output, _profiler
+
+    if not args.profile or enabled:
+        return
+
+    enabled = True
+    output  = args.profile_output
+    ROOT.on_load(_instrument_ROOT)
+    ap  .on_load(_instrument_ap)
+
+    if args.cprofile:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+        pass
+
+    atexit.register(write)
+    return
+
+
+# Write summary
+def write ():
+    """ Method for printing the summary of all stages, and writing it as JSON and CSV. """
+
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(output + '.prof')
+        pass
+
+    rows = [(stage, calls, seconds) for stage, (seconds, calls) in _stages.items()]
+
+    print "%-20s %8s %10s %14s" % ('Stage', 'Calls', 'Time [s]', 'Per call [ms]')
+    for stage, calls, seconds in rows:
+        print "%-20s %8d %10.3f %14.3f" % (stage, calls, seconds, seconds / calls * 1000.)
+        pass
+    for name, n in _counters.items():
+        print "%-20s %8d" % (name, n)
+        pass
+
+    with open(output + '.json', 'w') as f:
+        json.dump(OrderedDict([
+            ('stages',   OrderedDict((stage, OrderedDict([('calls', calls), ('time [s]', seconds)])) for stage, calls, seconds in rows)),
+            ('counters', _counters),
+            ]), f, indent=2)
+        pass
+
+    with open(output + '.csv', 'w') as f:
+        writer = csv.writer(f)
+        writer.writerow(['stage', 'calls', 'time [s]'])
+        writer.writerows(rows)
+        for name, n in _counters.items():
+            writer.writerow([name, n, ''])
+            pass
+        pass
+
+    print "Profile written to %s.{json,csv%s}" % (output, ',prof' if _profiler is not None else '')
+    return
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+""" Rebinning of bin arrays for LRT plotting macros.
+
+A new binning, given either as a number of adjacent bins to merge or as a list
+of new bin edges, is validated against the existing bin edges once, and turned
+into a plan: the index of the first existing bin (incl. underflow) of each new
+bin. Applying a plan merges all bin arrays of a histogram, e.g. the sums, sums
+of squares, and entries of a profile, in a single `np.add.reduceat` along the
+rebinned axis, cf. `hist.Hist.rebin`.
+
+Plans are cached by existing and new bin edges, and are read-only, such that
+they can be shared between threads; worker processes build their own. No ROOT
+objects are involved.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Scientific import(s)
+import numpy as np
+
+
+# Relative tolerance, w.r.t. the axis range, for new bin edges to coincide with existing ones
+tolerance = 1.0E-09
+
+# Plans, as (starts, empty), keyed by existing and new bin edges
+_plans = dict()
+
+
+# Get new bin edges
+def edges (old, ngroup_or_edges, snap=False):
+    """ Method for getting, and validating, the new bin edges of an axis with bin edges `old`.
+
+    The new binning is given either as a number of adjacent bins to merge, in
+    which case remaining bins at the upper end are added to the overflow bin,
+    or as a list of new bin edges. Each new bin edge within the axis range must
+    coincide with an existing edge; with `snap`, each new bin edge is instead
+    moved to the nearest existing edge, dropping duplicates, e.g. for edges
+    from `np.logspace`.
+    """
+
+    old = np.asarray(old, dtype=np.float64)
+    if np.ndim(ngroup_or_edges) == 0:
+        ngroup = int(ngroup_or_edges)
+
+        # Check(s)
+        assert ngroup > 0, "Number of bins to merge must be positive, not %d" % ngroup
+
+        new = old[:(len(old) - 1) // ngroup * ngroup + 1:ngroup]
+    else:
+        new = np.asarray(ngroup_or_edges, dtype=np.float64)
+        if snap:
+            new = np.unique(old[np.argmin(np.abs(new[:, None] - old[None, :]), axis=1)])
+            pass
+        pass
+
+    # Check(s)
+    assert len(new) > 1 and np.all(np.diff(new) > 0), "Bin edges must be increasing: %s" % new
+    inside = new[(new >= old[0]) & (new <= old[-1])]
+    distance = np.min(np.abs(inside[:, None] - old[None, :]), axis=1) if len(inside) else np.zeros(0)
+    misaligned = inside[distance > tolerance * (old[-1] - old[0])]
+    assert len(misaligned) == 0, "New bin edges %s don't coincide with existing ones" % misaligned
+
+    return new
+
+
+# Get rebinning plan
+def plan (old, new):
+    """ Method for getting the plan for rebinning an axis with bin edges `old` to validated bin edges `new`, cf. `edges`.
+
+    Returns the index of the first existing bin of each new bin, incl. under-
+    and overflow, and a mask of the new bins to which no existing bin is added,
+    i.e. which lie outside the existing axis range.
+    """
+
+    old = np.asarray(old, dtype=np.float64)
+    new = np.asarray(new, dtype=np.float64)
+    key = (old.tobytes(), new.tobytes())
+    if key not in _plans:
+
+        # New bin of each existing bin, incl. under- and overflow, by lower edge
+        eps = tolerance * (old[-1] - old[0])
+        mapping = np.concatenate(([0], np.searchsorted(new, old[:-1] + eps, side='right'), [len(new)]))
+
+        # First existing bin of each new bin
+        starts = np.searchsorted(mapping, np.arange(len(new) + 1), side='left')
+        empty  = np.append(starts[:-1] == starts[1:], False)  # Overflow always contains the existing overflow bin
+
+        starts.flags.writeable = False
+        empty .flags.writeable = False
+        _plans[key] = (starts, empty)  # Atomic; concurrent threads at most build the same plan twice
+        pass
+
+    return _plans[key]
+
+
+# Apply rebinning plan
+def apply (arrays, old, new, axis=0):
+    """ Method for rebinning `arrays`, each with bins incl. under- and overflow along `axis`, from bin edges `old` to `new`.
+
+    All arrays, which must have the same shape, are merged in one operation.
+    Entries which are None are returned as None.
+    """
+
+    present = [arr for arr in arrays if arr is not None]
+    if not present:
+        return list(arrays)
+
+    # Check(s)
+    assert all(arr.shape == present[0].shape for arr in present), "Bin arrays must have the same shape"
+    assert present[0].shape[axis] == len(old) + 1, "Bin arrays of shape %s don't match %d bin edges along axis %d" % (present[0].shape, len(old), axis)
+
+    starts, empty = plan(old, new)
+    merged = np.add.reduceat(np.stack(present), starts, axis=axis + 1)
+    merged[(slice(None),) * (axis + 1) + (empty,)] = 0.
+
+    merged = iter(merged)
+    return [None if arr is None else next(merged) for arr in arrays]
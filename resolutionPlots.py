@@ -10,156 +10,171 @@ Date:   7 June 2017
 # Basic
 import itertools
 
-# ROOT
-import ROOT
+# ROOT (imported on first use)
+from lazy import ROOT, ap
 
 # Local
 from common import *
-from rootplotting import ap
-from rootplotting.tools import *
+import loader
+import output
+import datasets
+import staging
+import planner
+import parallel
+import incremental
 from snippets.functions import displayName, displayUnit, displayNameUnit
 
+
+# Plot signal track resolution for LRT and STD tracks
+def plot_signal (args, var, rel, signal):
+    """ Method for producing the resolution plot of type `rel` for track parameter `var` and signal `signal`. """
+
+    # Plot family, cf. plots.yaml
+    spec  = planner.family('resolution')
+    names = spec['labels']
+    rebin = spec['rebin'].get(signal, 1)
+    sources = planner.expand('resolution', var=var, rel=rel, signal=signal)
+
+    # Skip plot if up to date
+    savename = '_'.join([signal] + spec['histname'].format(alg='Combined', var=var, rel=rel).split('/')[2:]) + '.pdf'
+    fp = incremental.fingerprint(plot_signal, var, rel, signal, names, rebin, signal_line(signal), qualifier, colours, displayName(var), displayUnit(var),
+                                 sources=sources)
+    if incremental.up_to_date(args, ['plots/' + savename], fp):
+        return savename
+
+    ROOT.TH1.AddDirectory(False)
+    
+    # Get list of histograms to plot
+    histograms = list()
+    
+    for path, hn in sources:
+        h = loader.get(path, hn)
+        h.GetXaxis().SetNdivisions(507)
+        h.GetYaxis().SetNdivisions(507)
+        ax = h.GetXaxis()
+        h.Rebin(rebin)
+        ax.SetRangeUser(ax.GetXmin() / 10., ax.GetXmax() / 10.)
+        histograms.append(h)
+        pass
+    
+    # Draw figure
+    c = ap.canvas(batch=not args.show, size=(700, 500))
+    for ihist, (hist, name, col) in enumerate(zip(histograms, names, colours)):
+        c.hist(hist, linecolor=col, linewidth=3, linestyle=1+ihist, normalise=True, option='HIST')#, label=name + " tracks", normalise=True, option='HIST E2')
+        c.hist(hist, linecolor=col, fillcolor=col, alpha=0.4, normalise=True, option='E2')
+        pass
+    c.text([signal_line(signal)],
+           qualifier=qualifier)
+    c.legend(width=0.28, categories=[
+            (names[0] + " tracks", {'linecolor':colours[0], 'linewidth':3, 'linestyle':1, 'fillcolor':colours[0], 'alpha':0.4, 'option': 'FL'}),
+            (names[1] + " tracks", {'linecolor':colours[1], 'linewidth':3, 'linestyle':2, 'fillcolor':colours[1], 'alpha':0.4, 'option': 'FL'})
+            #('Statistical uncert.', {'fillcolor': ROOT.kGray, 'linecolor': ROOT.kGray + 1, 'option': 'F'})
+            ])
+    c.xlabel("%s^{reco.} - %s^{truth} [%s]" % (displayName(var), displayName(var), displayUnit(var)))
+    c.ylabel("Fraction of tracks")
+
+    # Show/save
+    if args.show: c.show()
+    if args.save:
+        output.save(c, 'plots/' + savename, bundle=signal + '_ResolutionPlots')
+        incremental.record(['plots/' + savename], fp)
+        pass
+
+    return savename
+
+
+# Plot track resolution binned by matching probability
+def plot_matching (args, var, alg, name, t, rel, signal):
+    """ Method for producing the resolution plot of type `rel` for track parameter `var`, binned by matching probability. """
+
+    # Plot family, cf. plots.yaml
+    spec    = planner.family('resolution-matching')
+    rebin   = spec['rebin']
+    groups  = planner.axes('resolution-matching')['group']
+    group_names = [ '[%s]' % grp[5:-1].replace('_', ', ').replace('p', '.') for grp in groups ]
+    sources = planner.expand('resolution-matching', var=var, alg=alg, t=t, rel=rel, signal=signal)
+
+    # Skip plot if up to date
+    savename = '_'.join([signal] + spec['histname'].format(alg=alg, var=var, t=t, rel=rel, group='').split('/')[2:]) + '.pdf'
+    fp = incremental.fingerprint(plot_matching, var, alg, name, t, rel, signal, rebin, group_names, signal_line(signal), qualifier, colours_pretty, displayName(var), displayUnit(var),
+                                 sources=sources)
+    if incremental.up_to_date(args, ['plots/' + savename], fp):
+        return savename
+
+    ROOT.TH1.AddDirectory(False)
+    
+    # Get list of histograms tp plot, manually.
+    histograms = list()
+    
+    # Loop probability bins
+    for path, hn in sources:
+        h = loader.get(path, hn)
+        h.Rebin(rebin)
+        histograms.append(h)
+        pass
+    
+    # Draw figure
+    c = ap.canvas(batch=not args.show, size=(700, 500))
+    for ihist, (hist, grp, col) in enumerate(zip(histograms, group_names, colours_pretty)):
+        c.hist(hist, linecolor=col, linewidth=3, linestyle=1+ihist, label=grp, normalise=True)
+        pass
+    c.text([signal_line(signal),
+            name + " tracks"]
+           + (["%s particles" % t] if t != 'Signal' else []),
+           qualifier=qualifier)
+    c.legend(header="Match prob. in:", width=0.28, ymax=0.872)
+    c.xlabel("%s^{reco.} - %s^{truth} [%s]" % (displayName(var), displayName(var), displayUnit(var)))
+    c.ylabel("Fraction of tracks")
+    c.padding(0.40)
+    c.log()
+
+    # Show/save
+    if args.show: c.show()
+    if args.save:
+        output.save(c, 'plots/' + savename, bundle=signal + '_ResolutionPlots_matching')
+        incremental.record(['plots/' + savename], fp)
+        pass
+
+    return savename
+
+
 # Main function definition.
-def main ():
+def main (args=None):
     
     # Parse command-line arguments
-    args = parser.parse_args()
+    if args is None:
+        args = parser.parse_args()
+        pass
+    configure(args)
 
     # Comparing signal track resolution for LRT and STD tracks
     # --------------------------------------------------------------------------
 
-    # Initialise categories for which to plot distinct curves for each histogram
-    algorithms = ['Standard', 'LargeD0']
-    names      = ['Standard', 'Large radius']
-    signals    = ['RPV', 'Rhadron']
-    rels       = ['res', 'resRel', 'pull']
-    
-    # Initialise variable versus which to plot the physics efficiency
-    basic_vars = ['theta', 'phi', 'd0', 'z0', 'qOverP']
-        
-    # Initialise list of histograms to be plotted 
-    base = 'IDPerformanceMon/LargeD0/'
-    histname = base + 'ResolutionPlots/{alg}Tracks/Signal/{rel}_{var}'
-        
+    # Track parameters, resolution types, and signal processes, cf. plots.yaml
+    axes = planner.axes('resolution')
+
+    # Stage input files in the background
+    staging.start(datasets.path(signal) for signal in axes['signal'])
+
     # Loop all combinations of track parameter, resolution type, and signal process.
-    for var, rel, signal in itertools.product(basic_vars, rels, signals):
-        
-        # Open file from which to read histograms.
-        f = ROOT.TFile(filename.format(signal=signal), 'READ')
-        ROOT.TH1.AddDirectory(False)
-        
-        # Get list of histograms to plot
-        histograms = list()
-        
-        for alg in algorithms:
-            h = f.Get(histname.format(alg=alg, var=var, rel=rel))
-            h.SetDirectory(0) # Keep in memory after file is closed.
-            h.GetXaxis().SetNdivisions(507)
-            h.GetYaxis().SetNdivisions(507)
-            ax = h.GetXaxis()
-            rebin = 1
-            if signal == 'Rhadron':
-                rebin = 2
-                pass
-            h.Rebin(rebin)
-            ax.SetRangeUser(ax.GetXmin() / 10., ax.GetXmax() / 10.)
-            histograms.append(h)
-            pass
-        
-        # Close file
-        f.Close()
-        
-        # Draw figure
-        c = ap.canvas(batch=not args.show, size=(700, 500))
-        for ihist, (hist, name, col) in enumerate(zip(histograms, names, colours)):
-            c.hist(hist, linecolor=col, linewidth=3, linestyle=1+ihist, normalise=True, option='HIST')#, label=name + " tracks", normalise=True, option='HIST E2')
-            c.hist(hist, linecolor=col, fillcolor=col, alpha=0.4, normalise=True, option='E2')
-            pass
-        c.text([signal_line(signal)],
-               qualifier=qualifier)
-        c.legend(width=0.28, categories=[
-                (names[0] + " tracks", {'linecolor':colours[0], 'linewidth':3, 'linestyle':1, 'fillcolor':colours[0], 'alpha':0.4, 'option': 'FL'}),
-                (names[1] + " tracks", {'linecolor':colours[1], 'linewidth':3, 'linestyle':2, 'fillcolor':colours[1], 'alpha':0.4, 'option': 'FL'})
-                #('Statistical uncert.', {'fillcolor': ROOT.kGray, 'linecolor': ROOT.kGray + 1, 'option': 'F'})
-                ])
-        c.xlabel("%s^{reco.} - %s^{truth} [%s]" % (displayName(var), displayName(var), displayUnit(var)))
-        c.ylabel("Fraction of tracks")
-
-        # Show/save
-        savename = '_'.join([signal] + histname.format(alg='Combined', var=var, rel=rel).split('/')[2:]) + '.pdf'
-        if args.show: c.show()
-        if args.save: c.save('plots/' + savename)
-        pass
+    tasks = [(plot_signal, (args, var, rel, signal)) for var, rel, signal in itertools.product(axes['var'], axes['rel'], axes['signal'])]
+    parallel.run(tasks, jobs=parallel.jobs(args))
   
     
     # Binned by matching probability
     # --------------------------------------------------------------------------
     
-    # Initialise categories for which to plot distinct curves for each histogram
-    algorithms = ['Standard', 'LargeD0']
-    names      = ['Standard', 'Large radius']
-    types      = ['All', 'Signal']
-    signals    = ['RPV', 'Rhadron']
-    rels = ['res', 'resRel', 'pull']
-    groups = ['prob_0p40_0p50/',
-              'prob_0p50_0p60/',
-              'prob_0p60_0p70/',
-              'prob_0p70_0p80/',
-              'prob_0p80_0p90/',
-              'prob_0p90_1p00/',
-              ]
-    
-    group_names = [ '[%s]' % grp[5:-1].replace('_', ', ').replace('p', '.') for grp in groups ]
-    
-    # Initialise variable versus which to plot the physics efficiency
-    basic_vars = ['theta', 'phi', 'd0', 'z0', 'qOverP']
-    
-    # Initialise list of histograms to be plotted 
-    base = 'IDPerformanceMon/LargeD0/'
-    histname = base + 'ResolutionPlots/{alg}Tracks/{t}/{group}{rel}_{var}'
+    # Track parameters, tracking algorithms, truth particle types, resolution types, and signal processes, cf. plots.yaml
+    axes  = planner.axes('resolution-matching')
+    names = planner.family('resolution-matching')['labels']
     
     # Loop all combinations of track parameter, tracking algorithm, truth particle type, resolution type, and signal process
-    for var, (alg, name), t, rel, signal in itertools.product(basic_vars, zip(algorithms, names), types, rels, signals):
-        
-        # Open file from which to read histograms.
-        f = ROOT.TFile(filename.format(signal=signal), 'READ')
-        ROOT.TH1.AddDirectory(False)
-        
-        # Get list of histograms tp plot, manually.
-        histograms = list()
-        
-        # Loop probability bins
-        for igroup, group in enumerate(groups):
-            h = f.Get(histname.format(alg=alg, var=var, t=t, rel=rel, group=group))
-            h.SetDirectory(0) # Keep in memory after file is closed.
-            h.Rebin(10) # 10
-            histograms.append(h)
-            pass
-        
-        # Close file
-        f.Close()
-        
-        # Draw figure
-        c = ap.canvas(batch=not args.show, size=(700, 500))
-        for ihist, (hist, grp, col) in enumerate(zip(histograms, group_names, colours_pretty)):
-            c.hist(hist, linecolor=col, linewidth=3, linestyle=1+ihist, label=grp, normalise=True)
-            pass
-        c.text([signal_line(signal),
-                name + " tracks"]
-               + (["%s particles" % t] if t != 'Signal' else []),
-               qualifier=qualifier)
-        c.legend(header="Match prob. in:", width=0.28, ymax=0.872)
-        c.xlabel("%s^{reco.} - %s^{truth} [%s]" % (displayName(var), displayName(var), displayUnit(var)))
-        c.ylabel("Fraction of tracks")
-        c.padding(0.40)
-        c.log()
-
-        # Show/save
-        savename = '_'.join([signal] + histname.format(alg=alg, var=var, t=t, rel=rel, group='').split('/')[2:]) + '.pdf'
-        if args.show: c.show()
-        if args.save: c.save('plots/' + savename)
-        pass
+    tasks = [(plot_matching, (args, var, alg, name, t, rel, signal)) for var, (alg, name), t, rel, signal in itertools.product(axes['var'], zip(axes['alg'], names), axes['t'], axes['rel'], axes['signal'])]
+    parallel.run(tasks, jobs=parallel.jobs(args))
     
+    # Write bundles
+    output.close()
+
     return
 
 
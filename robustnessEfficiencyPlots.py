@@ -8,55 +8,70 @@ Date:   7 June 2017
 """
 
 # Basic
-import itertools, array
+import itertools
 
-# ROOT
-import ROOT
+# ROOT (imported on first use)
+from lazy import ROOT, ap
 
 # Local
 from common import *
-from rootplotting import ap
-from rootplotting.tools import *
+import loader
+import output
+import datasets
+import staging
+import planner
+import incremental
+import binning
+from efficiency import combined_efficiency
+from hist import Hist
 from snippets.functions import displayName
 
 # Main function definition.
-def main ():
+def main (args=None):
 
-    # Macro-specific styles
-    ROOT.gROOT.GetStyle("AStyle").SetEndErrorSize(.5)
+    # Macro-specific styles, applied once rootplotting is loaded
+    ap.on_load(lambda _: ROOT.gROOT.GetStyle("AStyle").SetEndErrorSize(.5))
 
     # Parse command-line arguments
-    args = parser.parse_args()
-
-    # Initialise categories for which to plot distinct curves for each histogram
-    algorithms = ['Standard', 'LargeD0']
-    names      = ['Standard', 'Large radius']
-    types      = ['Signal'] # ['All', 'Signal']
-    signals = ['RPV', 'Rhadron'] 
-    groups = ['R10mm_30mm/',
-              'R30mm_100mm/',
-              'R100mm_300mm/',
-              ]
-    #groups = ['R20mm_50mm/',
-    #          'R100mm_150mm/',
-    #          'R200mm_300mm/',
-    #          ]
+    if args is None:
+        args = parser.parse_args()
+        pass
+    configure(args)
+
+    # Categories for which to plot distinct curves for each histogram, cf. plots.yaml
+    spec       = planner.family('robustness-efficiency')
+    axes       = planner.axes('robustness-efficiency')
+    algorithms = axes['alg']
+    names      = spec['labels']
+    types      = axes['t']
+    signals    = axes['signal']
+    groups     = axes['group']
 
     group_names = [ '[%s]' % grp[1:-1].replace('_', ', ').replace('p', '.').replace('mm', ' mm') for grp in groups ]
     # @TEMP: Fix type in histogram names: 30mm_300mm -> 100mm_300mm
     #group_names = [gn.replace('30mm, 300mm', '100mm, 300mm') for gn in group_names]
 
     # Initialise list of histograms to be plotted 
-    base = 'IDPerformanceMon/LargeD0/'
-    histname = base + 'EffPlots/{alg}Tracks/{t}/{group}trackeff_vs_mu'
+    histname = spec['histname']
+
+    low, high = spec['binning']['range']
 
-    edges = [0, 10, 15, 20, 25, 30, 40]
+    # Stage input files in the background
+    staging.start(datasets.path(signal) for signal in signals)
 
     # Loop all combinations of truth particle type and signal process
     for t, signal in itertools.product(types, signals):
 
-        # Open file from which to read histograms.
-        f = ROOT.TFile(filename.format(signal=signal), 'READ')
+        # Path of file from which to read histograms.
+        path = datasets.path(signal)
+
+        # Skip plots if up to date
+        outputs = ['plots/' + '_'.join([signal] + histname.format(alg=alg, t=t, group='').split('/')[2:]) + '.pdf' for alg in ['', 'Combined']]
+        fp = incremental.fingerprint(main, spec, t, signal, signal_line(signal), qualifier, colours, displayName('r'),
+                                     sources=planner.expand('robustness-efficiency', t=t, signal=signal))
+        if incremental.up_to_date(args, outputs, fp):
+            continue
+
         ROOT.TH1.AddDirectory(False)
         ROOT.TH2.AddDirectory(False)
         
@@ -64,21 +79,26 @@ def main ():
         histograms = list()
 
         # Get histograms
+        edges = dict()
         for alg in algorithms:
             # Loop production radii groups
             for group in groups:
-                h = f.Get(histname.format(alg=alg, t=t, group=group))
-                h.SetDirectory(0) # Keep in memory after file is closed.
+                h = Hist.from_arrays(loader.get_arrays(path, histname.format(alg=alg, t=t, group=group)))
                 #h.RebinX(2)
-                newname = h.GetName() + "_rebinned_" + group + "_" + alg
-                hn = h.Rebin(len(edges)-1, newname, array.array('d',edges))
+
+                # Choose binning from the number of truth particles in each mu bin, common to all algorithms
+                if group not in edges:
+                    _, edges[group] = binning.build(h, low, high,
+                                                    min_entries=spec['binning']['min-entries'],
+                                                    max_bins=spec['binning']['max-bins'])
+                    pass
+
+                newname = h.name + "_rebinned_" + group + "_" + alg
+                hn = h.rebin(edges[group], name=newname).to_root()
                 #histograms.append(h)
                 histograms.append(hn)
                 pass
             pass
-        
-        # Close file
-        f.Close()
 
 
         # Efficiency of STD and LRT separately
@@ -105,7 +125,7 @@ def main ():
         # Show/save
         savename = '_'.join([signal] + histname.format(alg='', t=t, group='').split('/')[2:]) + '.pdf'
         if args.show: c.show()
-        if args.save: c.save('plots/' + savename)
+        if args.save: output.save(c, 'plots/' + savename, bundle=signal + '_RobustnessEfficiency')
     
 
         # Efficiency of STD and LRT combined
@@ -115,19 +135,7 @@ def main ():
         comb_histograms = list()
         for h1, h2 in zip(histograms[:len(groups)], histograms[len(groups):]):
             # h1: standard | h2: large radius
-            ax = h1.GetXaxis()
-            h_comb = h1.Clone('h_comb')#ROOT.TProfile('h_comb', "", ax.GetNbins(), ax.GetXmin(), ax.GetXmax())
-            h_comb.Reset()
-            for bin in range(1, h1.GetXaxis().GetNbins() + 1):
-                N_total = int(h1.GetBinEntries(bin)) # == h2.GetBinEntries(bin)
-                N_1 = int(h1.GetBinContent(bin) * N_total)
-                N_2 = int(h2.GetBinContent(bin) * N_total)
-                mu = h1.GetBinCenter(bin)
-                N_pass = N_1 + N_2
-                N_fail = N_total - N_pass
-                for _ in xrange(N_pass): h_comb.Fill(mu, True)
-                for _ in xrange(N_fail): h_comb.Fill(mu, False)
-                pass
+            h_comb = combined_efficiency(h1, h2, 'h_comb')
             comb_histograms.append(h_comb)
             pass
 
@@ -150,9 +158,15 @@ def main ():
         # Show/save
         savename = '_'.join([signal] + histname.format(alg='Combined', t=t, group='').split('/')[2:]) + '.pdf'
         if args.show: c.show()
-        if args.save: c.save('plots/' + savename)
+        if args.save:
+            output.save(c, 'plots/' + savename, bundle=signal + '_RobustnessEfficiency')
+            incremental.record(outputs, fp)
+            pass
         pass
 
+    # Write bundles
+    output.close()
+
     return
 
 
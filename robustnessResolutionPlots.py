@@ -11,107 +11,37 @@ Date:   8 June 2017
 import itertools
 from array import array
 
-# ROOT
-import ROOT
+# Scientific import(s)
+import numpy as np
+
+# ROOT (imported on first use)
+from lazy import ROOT, ap
 
 # Local
 from common import *
-from rootplotting import ap
-from rootplotting.tools import *
+import loader
+import keyindex
+import output
+import datasets
+import staging
+import incremental
+import fitcache
+import binning
+from fitting import getCoreStdWindows, getCoreStdWindowsArrays
+from hist import Hist
 from snippets.functions import displayNameUnit, displayName, displayUnit
 
+# Macro-specific command-line arguments
+parser.add_argument('--moments', dest='moments', action='store_const',
+                    const=True, default=False,
+                    help='Use truncated moments instead of Gaussian fits for core std.dev. (default: False)')
+parser.add_argument('--min-entries', dest='min_entries', type=float, default=200.,
+                    help='Minimal number of tracks in each bin of the profiles, cf. binning.py (default: 200)')
 
-# Get "core" std.dev. and assoc. error
-def getCoreStd (h, sigma=5, fix_mean=None):
-    """ Method for getting the std.dev. in the central +/- sigma of a distribution. """
-    
-    # Check(s)
-    # ...
-    
-    # Book keeping
-    old_std = 0          # RMS from pervious iteration
-    std     = h.GetXaxis().GetBinWidth(1) * 2 # RMS from current iteration
-    it = 0                 # Iteration counter, to avoid endless loop
-    fit = ROOT.TF1('fit', 'gaus')
-    mean  = h.GetMean() if fix_mean is None else fix_mean
-    
-    # Perform iterations
-    while abs(std - old_std) > 0 and it < 100:
-        
-        # Update axis limits
-        fit.SetRange(mean - sigma * std, mean + sigma * std)
-        h.Fit('fit', 'QR0')
-        
-        # Update RMSs
-        old_std  = std
-        std      = fit.GetParameter(2)
-        it += 1
-        pass
-    
-    # Return
-    return fit.GetParameter(2), fit.GetParError(2), fit
-                        
-
-# Main function definition.
-def main ():
-
-    # Macro-specific styles
-    ROOT.gROOT.GetStyle("AStyle").SetEndErrorSize(.5)
-
-    # Parse command-line arguments
-    args = parser.parse_args()
-    ap.canvas(batch=not args.show)
-
-    # Initialise categories for which to plot distinct curves for each histogram
-    algorithms = ['Standard', 'LargeD0']
-    names      = ['Standard', 'Large radius']
-    types      = ['Signal'] # ['All', 'Signal']
-    signals = ['Rhadron', 'RPV']
-
-    groups = {
-        'Rhadron': ['Rprod_10mm_30mm/',
-                    'Rprod_30mm_100mm/',
-                    'Rprod_100mm_300mm/',],
-        'RPV':     ['Rprod_10mm_30mm/',
-                    'Rprod_30mm_100mm/',
-                    'Rprod_100mm_300mm/',],
-        }
 
-    ylabel = "Standard deviation of the error on %s"
-
-    deps = ['mu', 'pt']
-    
-    group_names = {signal: [ '[%s]' % grp[6:-1].replace('_', ', ').replace('p', '.').replace('mm', ' mm') for grp in groups[signal] ] for signal in signals}
-    
-    # Initialise variable versus which to plot the physics efficiency
-    basic_vars = ['theta', 'phi', 'd0', 'z0', 'qOverP']
-    
-    # Initialise list of histograms to be plotted 
-    base = 'IDPerformanceMon/LargeD0/'
-    histname = base + 'ResolutionPlots/{alg}Tracks/{t}/{group}res{depdim}_{var}_vs_{dep}'
-    
-    # Accessor function to get the y-axis maximum
-    def get_ymax (var):
-        if var == 'theta':  return 0.01 * 1
-        if var == 'phi':    return 0.01 * 1
-        if var == 'd0':     return 1.0 * 1
-        if var == 'z0':     return 2.0 * 1
-        if var == 'qOverP': return 0.05 * 1
-        return 0.01
-    
-    def get_ymax_comb (var):
-        if var == 'theta':  return 0.008 * 1
-        if var == 'phi':    return 0.007 * 1
-        if var == 'd0':     return 1.2 # 0.8
-        if var == 'z0':     return 1.2 * 1
-        if var == 'qOverP': return 0.020
-        return 0.01
-
-
-    # pT-binned RMS profiles
-    # --------------------------------------------------------------------------
-
-    histograms = dict()
+# Plot pT-binned RMS profiles
+def plot_pt_binned (args, method, algorithms, groups, group_names, base, ylabel):
+    """ Method for producing the d0 resolution robustness plot versus mu, in bins of pT, for R-hadrons. """
 
     ptgroups = [
         'pT_1GeV_3GeV/',
@@ -120,7 +50,15 @@ def main ():
 
     ptgroup_names = [ '[%s]' % grp[3:-1].replace('_', ', ').replace('p', '.').replace('GeV', ' GeV') for grp in ptgroups ]
 
-    f = ROOT.TFile(filename.format(signal='Rhadron'), 'READ')
+    # Skip plot if up to date
+    savename = 'Rhadron_ResolutionPlots_BothTracks_Signal_res_d0_vs_mu_pTbinned.pdf'
+    pt_histname = base + 'ResolutionPlots/{alg}Tracks/Signal/{group}{ptgroup}res_d0_vs_mu'
+    fp = incremental.fingerprint(plot_pt_binned, method, args.min_entries, algorithms, groups['Rhadron'], group_names['Rhadron'], ylabel, signal_line('Rhadron'), qualifier, colours,
+                                 sources=[(datasets.path('Rhadron'), pt_histname.format(alg=alg, group=group, ptgroup=ptgroup)) for group in groups['Rhadron'] for ptgroup in ptgroups for alg in algorithms])
+    if incremental.up_to_date(args, ['plots/' + savename], fp):
+        return savename
+
+    path = datasets.path('Rhadron')
     ROOT.TH2.AddDirectory(False)
 
     # Create canvas
@@ -139,47 +77,25 @@ def main ():
             # Loop tracking algorithms; add 
             for alg in algorithms:
                 hn = base + 'ResolutionPlots/{alg}Tracks/Signal/{group}{ptgroup}res_d0_vs_mu'.format(alg=alg, group=group, ptgroup=ptgroup)
-                h = f.Get(hn)
-                h.SetDirectory(0)
+                h = Hist.from_arrays(loader.get_arrays(path, hn))
                 if hist is None:
-                    hist = h.Clone(h.GetName() + '_clone')
+                    hist = h
                 else:
-                    hist.Add(h)
+                    hist.add(h)
                     pass
                 pass
 
-            # Define bin edges
-            if igroup < 2:
-                pairs = [
-                    (1,2), #  5 - 10
-                    (3,3), # 10 - 15
-                    (4,4), # 15 - 20
-                    (5,5), # 20 - 25
-                    (6,6), # 25 - 30
-                    (7,8), # 30 - 40
-                    ]
-            else:
-                pairs = [
-                    (1,3), #  0 - 15
-                    (4,5), # 15 - 25
-                    (6,8), # 25 - 40
-                    ]
-                pass
+            # Define bin edges, from the number of tracks in each mu bin
+            pairs, _ = binning.build(hist, high=40, min_entries=args.min_entries, max_bins=6 if igroup < 2 else 3)
 
             # Initialise graph point lists
             xs, ys, xels, xehs, yes = list(), list(), list(), list(), list()
             
+            # Get projections, without overflow bins, for all edge pairs at once
+            projs = hist.projections(pairs, clear_flows=True)
+
             # Loop edge pairs to get projection
-            for ibin, pair in enumerate(pairs):
-                
-                # Get and fit projection
-                proj = hist.ProjectionY('_py', *pair)
-                ax = hist.GetXaxis()
-
-                # Clean-up (?) -- overflow bins
-                nx = proj.GetXaxis().GetNbins()
-                proj.SetBinContent(0,      0)
-                proj.SetBinContent(nx + 1, 0)
+            for ibin, (pair, proj) in enumerate(zip(pairs, projs)):
                 
                 # Rebin (?)
                 #if igroup > 0:
@@ -187,9 +103,12 @@ def main ():
                 #    pass
                 
                 # Get graph variables
-                x  = 0.5 * (ax.GetBinCenter(pair[0]) + ax.GetBinCenter (pair[1]))
-                wl =       (x - ax.GetBinLowEdge(pair[0]))
-                wh =       (ax.GetBinUpEdge(pair[1]) - x)
+                x  = 0.5 * (hist.center(pair[0]) + hist.center(pair[1]))
+                wl =       (x - hist.low_edge(pair[0]))
+                wh =       (hist.up_edge(pair[1]) - x)
+
+                # Fit and draw projection as ROOT histogram
+                proj = proj.to_root()
                 
                 # Get parameter RMS and assoc. error
                 ROOT.TH1.StatOverflows(False)
@@ -197,11 +116,8 @@ def main ():
                 # Set number of sigmas to use in core RMS calculation
                 sigma = 3
                 
-                par, err, fit = getCoreStd(proj, sigma=sigma, fix_mean=0)
-                par2p5, _, _  = getCoreStd(proj, sigma=2.5, fix_mean=0)
-                par2p0, _, _  = getCoreStd(proj, sigma=2.0, fix_mean=0)
-                
-                syst = max(abs(par2p5 - par), abs(par2p0 - par))
+                pars, errs, syst, fits, _ = getCoreStdWindows(proj, sigmas=[sigma, 2.5, 2.0], fix_mean=0, method=method)
+                par, err = pars[0], errs[0]
         
                 print "==> err:", err, "| syst:",syst
                 err = np.sqrt( np.square(err) + np.square(syst) )
@@ -218,8 +134,8 @@ def main ():
 
                 # Projection slice
                 c_proj = ap.canvas(batch=not args.show)
-                rms2sig, err2sig, fit2 = getCoreStd(proj, sigma=2, fix_mean=0)
-                rms3sig, err3sig, fit3 = getCoreStd(proj, sigma=3, fix_mean=0)
+                rms2sig, err2sig, fit2 = pars[2], errs[2], fits[2]
+                rms3sig, err3sig, fit3 = pars[0], errs[0], fits[0]
                 c_proj.hist(proj)
                 c_proj._bare().cd()
                 fit2.SetLineColor(ROOT.kBlue)
@@ -238,13 +154,13 @@ def main ():
                              signal_line('Rhadron') + ' / ' + 'Large radius and standard tracks',
                              ] +
                             ["%s #in  [%.1f, %.1f] %s" % (displayName('mu'), 
-                                                          ax.GetBinLowEdge(pair[0]),
-                                                          ax.GetBinUpEdge (pair[1]),
+                                                          hist.low_edge(pair[0]),
+                                                          hist.up_edge (pair[1]),
                                                           displayUnit('mu'))] +
                             ["Tracks: %d (%d)" % (proj.Integral(), proj.Integral(0, proj.GetXaxis().GetNbins() + 1))],
                             qualifier=qualifier)
                 
-                if args.save: c_proj.save('plots/%s_RobustnessResolution_slice__%s_vs_%s__%s_%s_%d_%d.pdf' % ('Signal', 'd0', 'mu', 'Both', ptgroup[:-1], igroup, ibin))
+                if args.save: output.save(c_proj, 'plots/%s_RobustnessResolution_slice__%s_vs_%s__%s_%s_%d_%d.pdf' % ('Signal', 'd0', 'mu', 'Both', ptgroup[:-1], igroup, ibin), bundle='Rhadron_RobustnessResolution_slices')
                
                                
                 pass # end: loop bins
@@ -282,10 +198,86 @@ def main ():
     c.ylabel(ylabel % displayNameUnit('d0'))
     
     # Show/save
-    savename='Rhadron_ResolutionPlots_BothTracks_Signal_res_d0_vs_mu_pTbinned.pdf'
     if args.show: c.show()
-    if args.save: c.save('plots/' + savename)
+    if args.save:
+        output.save(c, 'plots/' + savename, bundle='Rhadron_RobustnessResolution')
+        incremental.record(['plots/' + savename], fp)
+        pass
+
+    return savename
+
+
+# Main function definition.
+def main (args=None):
+
+    # Macro-specific styles, applied once rootplotting is loaded
+    ap.on_load(lambda _: ROOT.gROOT.GetStyle("AStyle").SetEndErrorSize(.5))
+
+    # Parse command-line arguments
+    if args is None:
+        args = parser.parse_args()
+        pass
+    configure(args)
+    if not args.dry_run:
+        ap.canvas(batch=not args.show)
+        pass
+
+    # Core std.dev. estimator
+    method = 'moments' if args.moments else 'fit'
+
+    # Initialise categories for which to plot distinct curves for each histogram
+    algorithms = ['Standard', 'LargeD0']
+    names      = ['Standard', 'Large radius']
+    types      = ['Signal'] # ['All', 'Signal']
+    signals = ['Rhadron', 'RPV']
+
+    # Stage input files in the background
+    staging.start(datasets.path(signal) for signal in signals)
+
+    groups = {
+        'Rhadron': ['Rprod_10mm_30mm/',
+                    'Rprod_30mm_100mm/',
+                    'Rprod_100mm_300mm/',],
+        'RPV':     ['Rprod_10mm_30mm/',
+                    'Rprod_30mm_100mm/',
+                    'Rprod_100mm_300mm/',],
+        }
+
+    ylabel = "Standard deviation of the error on %s"
+
+    deps = ['mu', 'pt']
+    
+    group_names = {signal: [ '[%s]' % grp[6:-1].replace('_', ', ').replace('p', '.').replace('mm', ' mm') for grp in groups[signal] ] for signal in signals}
+    
+    # Initialise variable versus which to plot the physics efficiency
+    basic_vars = ['theta', 'phi', 'd0', 'z0', 'qOverP']
+    
+    # Initialise list of histograms to be plotted 
+    base = 'IDPerformanceMon/LargeD0/'
+    histname = base + 'ResolutionPlots/{alg}Tracks/{t}/{group}res{depdim}_{var}_vs_{dep}'
     
+    # Accessor function to get the y-axis maximum
+    def get_ymax (var):
+        if var == 'theta':  return 0.01 * 1
+        if var == 'phi':    return 0.01 * 1
+        if var == 'd0':     return 1.0 * 1
+        if var == 'z0':     return 2.0 * 1
+        if var == 'qOverP': return 0.05 * 1
+        return 0.01
+    
+    def get_ymax_comb (var):
+        if var == 'theta':  return 0.008 * 1
+        if var == 'phi':    return 0.007 * 1
+        if var == 'd0':     return 1.2 # 0.8
+        if var == 'z0':     return 1.2 * 1
+        if var == 'qOverP': return 0.020
+        return 0.01
+
+
+    # pT-binned RMS profiles
+    # --------------------------------------------------------------------------
+
+    plot_pt_binned(args, method, algorithms, groups, group_names, base, ylabel)
 
 
     # Regular stuff
@@ -294,13 +286,23 @@ def main ():
     # Loop all combinations of track parameter, truth particle type, signal process, and dependency variable
     for var, t, dep in itertools.product(basic_vars, types, deps):
 
+        # Skip plots if up to date
+        depdim = '2D' if dep == 'pt' else ''
+        outputs = ['plots/' + '_'.join([prefix] + histname.format(alg=alg, var=var, t=t, group='', dep=dep, depdim='').split('/')[2:]) + '.pdf' for prefix, alg in
+                   [(signal, alg) for signal in signals for alg in ['', 'Combined']] + [('Both', 'Combined')]]
+        fp = incremental.fingerprint(main, var, t, dep, method, args.min_entries, groups, group_names, ylabel, [signal_line(signal) for signal in signals], qualifier, colours,
+                                     displayNameUnit(var), displayNameUnit(dep), displayName('r'),
+                                     sources=[(datasets.path(signal), histname.format(alg=alg, var=var, t=t, group=group, dep=dep, depdim=depdim)) for signal in signals for alg in algorithms for group in groups[signal]])
+        if incremental.up_to_date(args, outputs, fp):
+            continue
+
         combined_graphs = {signal: list() for signal in signals}
         
         # Loop signal separately, in order to (optionally) compare the two
         for signal in signals:
             
-            # Open file from which to read histograms.
-            f = ROOT.TFile(filename.format(signal=signal), 'READ')
+            # Path of file from which to read histograms.
+            path = datasets.path(signal)
             ROOT.TH1.AddDirectory(False)
             ROOT.TH2.AddDirectory(False)
             
@@ -311,6 +313,10 @@ def main ():
             #comb_ws = dict()
             comb_wls = dict()
             comb_whs = dict()
+
+            # Core RMS calculations to be performed, and profile points using them
+            fit_tasks = list()
+            profiles  = list()
             
             # Get histograms
             bin_pairs = {
@@ -322,17 +328,14 @@ def main ():
                 
                 for igroup, group in enumerate(groups[signal]):
                     
-                    h = f.Get(histname.format(alg=alg, var=var, t=t, group=group, dep=dep, depdim='2D' if dep == 'pt' else ''))
-                    if h is None:
-                        pass
-                    try:
-                        h.SetDirectory(0) # Keep in memory after file is closed.
-                    except AttributeError:
-                        print "PROBLEM: '%s'" % histname.format(alg=alg, var=var, t=t, group=group, dep=dep, depdim='2D' if dep == 'pt' else '')
+                    hn = histname.format(alg=alg, var=var, t=t, group=group, dep=dep, depdim=depdim)
+                    if not keyindex.exists(path, hn):
+                        print "PROBLEM: '%s'" % hn
                         continue
+                    h = Hist.from_arrays(loader.get_arrays(path, hn))
                     
-                    #xs, ys, xes, yes = list(), list(), list(), list()
-                    xs, ys, xels, xehs, yes = list(), list(), list(), list(), list()
+                    # List of (x, x error low, x error high, fit task index) for each point
+                    points = list()
                     
                     # Allocate space if necessary
                     if not (group in comb_projs):
@@ -342,84 +345,42 @@ def main ():
                         comb_whs[group] = list()
                         pass
                     
-                    # Dynamically choose binning
+                    # Dynamically choose binning, from the number of tracks in each x-axis bin
                     if dep == 'pt' and  len(bin_pairs['pt']) <= igroup:
-                        nx, ny = h.GetXaxis().GetNbins(), h.GetYaxis().GetNbins()
                         if signal == 'Rhadron':
-                            edges = np.logspace(np.log10(1), np.log10(50), 8 - 2 * igroup + 1, endpoint=True)
+                            pairs, _ = binning.build(h, low=1, high=50, min_entries=args.min_entries, max_bins=8 - 2 * igroup)
                         else:
-                            edges = np.linspace(0, 400, max(8 - 4 * igroup + 1, 2), endpoint=True)
-                            #edges -= 0.2 # @TEMP: FIX FOR NICE BIN EDGES
-                            edges[0] = 1
-                            pass
-           
-                        bin_pairs['pt'].append(zip(edges[:-1], edges[1:]))
-                        ax = h.GetXaxis()
-                        bin_pairs['pt'][igroup] = [ (ax.FindBin(pair[0]), ax.FindBin(pair[1])) for pair in bin_pairs['pt'][igroup] ]
-                        
-                        # Ensure there is no overlap between bins
-                        for idx in range(len(bin_pairs['pt'][igroup]) - 1):
-                            if bin_pairs['pt'][igroup][idx][1] >= bin_pairs['pt'][igroup][idx+1][0]:
-                                bin_pairs['pt'][igroup][idx+1] = (bin_pairs['pt'][igroup][idx][1]+1, bin_pairs['pt'][igroup][idx+1][1])
-                                pass
-                            pass
-
-                        if signal == 'RPV':
-                            bin_pairs['pt'][igroup][-1] = (bin_pairs['pt'][igroup][-1][0], nx)
+                            pairs, _ = binning.build(h, low=1, min_entries=args.min_entries, max_bins=max(8 - 4 * igroup, 1))
                             pass
+                        bin_pairs['pt'].append( pairs )
                         pass
                     
                     if dep == 'mu' and len(bin_pairs['mu']) <= igroup:
-                        if igroup < 2:
-                            pairs = [
-                                (1,2), #  5 - 10
-                                (3,3), # 10 - 15
-                                (4,4), # 15 - 20
-                                (5,5), # 20 - 25
-                                (6,6), # 25 - 30
-                                (7,8), # 30 - 40
-                                ]
-                        else:
-                            pairs = [
-                                (1,3), #  0 - 15
-                                (4,5), # 15 - 25
-                                (6,8), # 25 - 40
-                                ]
-                            pass
-                        
+                        pairs, _ = binning.build(h, high=40, min_entries=args.min_entries, max_bins=6 if igroup < 2 else 3)
                         bin_pairs['mu'].append( pairs )
                         pass
                     
+                    # Get projections of all x-axis bin pairs at once
+                    # - Clean-up (?): for mu, if highest bin content is larger than the average bin content in the remaining bins, remove it
+                    # - Rebin (?)
+                    projs = h.projections(bin_pairs[dep][igroup],
+                                          clear_flows=(dep == 'mu'),
+                                          rebin=2*igroup if dep == 'mu' and igroup > 0 else None)
+                    
                     # Loop x-axis bins in 2D histogram
                     for ibin in range(len(bin_pairs[dep][igroup])):
                         
                         pair = bin_pairs[dep][igroup][ibin]
-                        ax = h.GetXaxis()
-                        
-                        # Get and fit projection
-                        proj = h.ProjectionY('_py', *pair)
-                        
-                        # Clean-up (?)
-                        if dep == 'mu':
-                            # If highest bin content is larger than the average bin content in the remaining bins, remove it
-                            nx = proj.GetXaxis().GetNbins()
-                            proj.SetBinContent(0,      0)
-                            proj.SetBinContent(nx + 1, 0)
-                            pass
-                        
-                        # Rebin (?)
-                        if dep == 'mu' and igroup > 0:
-                            proj.RebinX(2*igroup)
-                            pass
+                        proj = projs[ibin]
                         
                         # Get graph variables
-                        x  = 0.5 * (ax.GetBinCenter(pair[0]) + ax.GetBinCenter (pair[1]))
-                        wl =       (x - ax.GetBinLowEdge(pair[0]))
-                        wh =       (ax.GetBinUpEdge(pair[1]) - x)
+                        x  = 0.5 * (h.center(pair[0]) + h.center(pair[1]))
+                        wl =       (x - h.low_edge(pair[0]))
+                        wh =       (h.up_edge(pair[1]) - x)
                         
                         # Add projection to list of combined projections (LRT + STD)
                         if len(comb_projs[group]) > ibin:
-                            comb_projs[group][ibin].Add(proj)
+                            comb_projs[group][ibin].add(proj)
                         else:
                             comb_projs[group].append(proj)
                             comb_xs[group].append(x)
@@ -433,85 +394,66 @@ def main ():
                         # Set number of sigmas to use in core RMS calculation
                         sigma = 3
                         
-                        par, err, fit = getCoreStd(proj, sigma=sigma, fix_mean=0)
-                        par2p5, _, _  = getCoreStd(proj, sigma=2.5, fix_mean=0)
-                        par2p0, _, _  = getCoreStd(proj, sigma=2.0, fix_mean=0)
+                        # Queue core RMS calculation on (copies of) projection bin arrays
+                        points.append((x, wl / 2., wh / 2., len(fit_tasks)))
+                        fit_tasks.append((getCoreStdWindowsArrays, proj.arrays() + ([sigma, 2.5, 2.0], 0, method)))
+                        pass
+                    
+                    profiles.append(points)
+                    pass
+                
+                pass
 
-                        syst = max(abs(par2p5 - par), abs(par2p0 - par))
+            # Queue core RMS calculations for combined projections (LRT + STD)
+            comb_tasks = dict()
+            for group in groups[signal]:
+                comb_tasks[group] = list()
+                for proj in comb_projs[group]:
+                    comb_tasks[group].append(len(fit_tasks))
+                    fit_tasks.append((getCoreStdWindowsArrays, proj.arrays() + ([sigma, 2.5, 2.0], 0, method)))
+                    pass
+                pass
 
-                        if var == 'd0' and dep == 'mu':
-                            print "==> err, syst:", err, syst
-                            pass
-                        err = np.sqrt( np.square(err) + np.square(syst) )
-
-                        # Store data point
-                        if par > 0.:
-                            xs .append(x)
-                            ys .append(par)
-                            xels.append(wl / 2.)
-                            xehs.append(wh / 2.)
-                            yes.append(err)
-                            pass
-                        
-                        # Easy access
-                        ax  = h.GetXaxis()
-                        pair = bin_pairs[dep][igroup][ibin]
-                        
-                        # Save projections slices
-                        '''
-                        c_proj = ap.canvas(batch=not args.show)
-                        #rms2sig, err2sig, sigma2_min, sigma2_max = getCoreRMS(proj, sigma=2, fix_mean=0)
-                        #rms3sig, err3sig, sigma3_min, sigma3_max = getCoreRMS(proj, sigma=3, fix_mean=0)
-                        rms2sig, err2sig, fit2 = getCoreStd(proj, sigma=2, fix_mean=0)
-                        rms3sig, err3sig, fit3 = getCoreStd(proj, sigma=3, fix_mean=0)
-                        #fit.SetRange(-3*rms3sig,3*rms3sig)
-                        c_proj.hist(proj)
-                        c_proj._bare().cd()
-                        fit2.SetLineColor(ROOT.kBlue)
-                        fit3.SetLineColor(ROOT.kGreen)
-                        c_proj.xline(-2 * rms2sig, text='-2#sigma', linecolor=ROOT.kBlue)
-                        c_proj.xline(+2 * rms2sig, text='+2#sigma', linecolor=ROOT.kBlue)
-                        c_proj.xline(-3 * rms3sig, text='-3#sigma', linecolor=ROOT.kGreen)
-                        c_proj.xline(+3 * rms3sig, text='+3#sigma', linecolor=ROOT.kGreen)
-                        fit2.Draw('SAME')
-                        fit3.Draw('SAME')
-                        c_proj.xlim(-8*rms3sig, +8*rms3sig)
-                        c_proj.xlabel(displayNameUnit(var))
-                        c_proj.ylabel("Tracks")
-                        c_proj.text([displayName('r') + " #in  " + group_names[signal][igroup],
-                                     signal_line(signal) + ' / ' + alg,
-                                     ] +
-                                    ["%s #in  [%.1f, %.1f] %s" % (displayName(dep), 
-                                                                  ax.GetBinLowEdge(pair[0]),
-                                                                  ax.GetBinUpEdge (pair[1]),
-                                                                  displayUnit(dep))] +
-                                    ["Tracks: %d (%d)" % (proj.Integral(), proj.Integral(0, proj.GetXaxis().GetNbins() + 1))],
-                                    qualifier=qualifier)
-                        
-                        if args.save: c_proj.save('plots/%s_RobustnessResolution_slice__%s_vs_%s__%s_%d_%d.pdf' % (signal, var, dep, alg, igroup, ibin))
-                        '''
+            # Perform all core RMS calculations
+            fit_results = fitcache.run(fit_tasks, jobs=args.jobs)
+
+            # Create profile graphs from points
+            for points in profiles:
+                xs, ys, xels, xehs, yes = list(), list(), list(), list(), list()
+                for x, xel, xeh, itask in points:
+                    if fit_results[itask] is None: continue
+                    pars, errs, syst, _ = fit_results[itask]
+                    par, err = pars[0], errs[0]
+
+                    if var == 'd0' and dep == 'mu':
+                        print "==> err, syst:", err, syst
                         pass
-                    
-                    # Create profile graph from points
-                    if len(xs) > 0:
-                        graph = ROOT.TGraphAsymmErrors(len(xs), 
-                                                       array('d', xs),
-                                                       array('d', ys),
-                                                       array('d', xels),
-                                                       array('d', xehs),
-                                                       array('d', yes),
-                                                       array('d', yes))
-                    else:
-                        graph = ROOT.TGraphErrors()
+                    err = np.sqrt( np.square(err) + np.square(syst) )
+
+                    # Store data point
+                    if par > 0.:
+                        xs .append(x)
+                        ys .append(par)
+                        xels.append(xel)
+                        xehs.append(xeh)
+                        yes.append(err)
                         pass
-                    histograms.append(graph)
                     pass
-                
+
+                if len(xs) > 0:
+                    graph = ROOT.TGraphAsymmErrors(len(xs), 
+                                                   array('d', xs),
+                                                   array('d', ys),
+                                                   array('d', xels),
+                                                   array('d', xehs),
+                                                   array('d', yes),
+                                                   array('d', yes))
+                else:
+                    graph = ROOT.TGraphErrors()
+                    pass
+                histograms.append(graph)
                 pass
             
-            # Close file
-            f.Close()
-            
             
             # Profiles for STD and LRT separately
             # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -537,8 +479,8 @@ def main ():
                    qualifier=qualifier)
             c.legend(header=displayName('r') + " in:", categories=[(name, {'linestyle': i+1, 'markerstyle': 4*i+20, 'option': 'PL', 'linewidth': 2}) for i, name in enumerate(names)], width=0.28)
             c.padding(0.50)
-            c.xlim(h.GetXaxis().GetBinLowEdge(bin_pairs[dep][0] [0][0]),
-                   h.GetXaxis().GetBinUpEdge (bin_pairs[dep][0][-1][1]))
+            c.xlim(h.low_edge(bin_pairs[dep][0] [0][0]),
+                   h.up_edge (bin_pairs[dep][0][-1][1]))
             
             c.xlabel(displayNameUnit(dep))
             c.ylabel(ylabel % displayNameUnit(var))
@@ -549,7 +491,7 @@ def main ():
             # Show/save
             savename = '_'.join([signal] + histname.format(alg='', var=var, t=t, group='', dep=dep, depdim='').split('/')[2:]) + '.pdf'
             if args.show: c.show()
-            if args.save: c.save('plots/' + savename)
+            if args.save: output.save(c, 'plots/' + savename, bundle=signal + '_RobustnessResolution')
             
             
             # Profile for STD and LRT combined
@@ -559,18 +501,17 @@ def main ():
             comb_histograms = list()
             
             for igroup, (group, name) in enumerate(zip(groups[signal], group_names[signal])):# if signal == 'Rhadron' else groups[:-1]):
-                projs = comb_projs[group]
-                xs = comb_xs[group]
-                wls = comb_wls[group]
-                whs = comb_whs[group]
+                ok  = [ fit_results[itask] is not None for itask in comb_tasks[group] ]
+                xs  = [ x for x, good in zip(comb_xs [group], ok) if good ]
+                wls = [ w for w, good in zip(comb_wls[group], ok) if good ]
+                whs = [ w for w, good in zip(comb_whs[group], ok) if good ]
                 xels = [w for w in wls]
                 xehs = [w for w in whs]
-                ys, yes, _ = zip(*[ getCoreStd(proj, sigma=sigma, fix_mean=0) for proj in projs ])
-
-                ys2p5, _, _  = zip(*[ getCoreStd(proj, sigma=2.5, fix_mean=0) for proj in projs ])
-                ys2p0, _, _  = zip(*[ getCoreStd(proj, sigma=2.0, fix_mean=0) for proj in projs ])
+                results = [ fit_results[itask] for itask, good in zip(comb_tasks[group], ok) if good ]
+                ys   = [ pars[0] for pars, _, _, _ in results ]
+                yes  = [ errs[0] for _, errs, _, _ in results ]
+                syst = np.array([ syst for _, _, syst, _ in results ])
 
-                syst = np.maximum(np.abs(np.array(ys2p5) - np.array(ys)), np.abs(np.array(ys2p0) - np.array(ys)))
                 yes = np.sqrt( np.square(np.array(yes)) + np.square(syst) )
 
                 graph = ROOT.TGraphAsymmErrors(len(xs), 
@@ -583,49 +524,6 @@ def main ():
                 
                 combined_graphs[signal].append((name, graph))
                 comb_histograms.append(graph)
-
-                # Draw projection slice
-                '''
-                #for ibin, (proj, x, w) in enumerate(zip(projs, xs, ws)):
-                for ibin, (proj, x, wl, wh) in enumerate(zip(projs, xs, wls, whs)):
-                    c_proj = ap.canvas(batch=not args.show)
-                    #rms2sig, err2sig, sigma2_min, sigma2_max = getCoreRMS(proj, sigma=2, fix_mean=0)
-                    #rms3sig, err3sig, sigma3_min, sigma3_max = getCoreRMS(proj, sigma=3, fix_mean=0)
-                    rms2sig, err2sig, fit2  = getCoreStd(proj, sigma=2, fix_mean=0)
-                    rms3sig, err3sig, fit3 = getCoreStd(proj, sigma=3, fix_mean=0)
-                    c_proj.hist(proj)
-                    c_proj._bare().cd()
-                    #fit.SetRange(-3*rms3sig,3*rms3sig)
-                    fit2.SetLineColor(ROOT.kBlue)
-                    fit3.SetLineColor(ROOT.kGreen)
-                    #c_proj.xline(sigma2_min, text='-2#sigma', linecolor=ROOT.kBlue)
-                    #c_proj.xline(sigma2_max, text='+2#sigma', linecolor=ROOT.kBlue)
-                    #c_proj.xline(sigma3_min, text='-3#sigma', linecolor=ROOT.kGreen)
-                    #c_proj.xline(sigma3_max, text='+3#sigma', linecolor=ROOT.kGreen)
-                    c_proj.xline(-2 * rms2sig, text='-2#sigma', linecolor=ROOT.kBlue)
-                    c_proj.xline(+2 * rms2sig, text='+2#sigma', linecolor=ROOT.kBlue)
-                    c_proj.xline(-3 * rms3sig, text='-3#sigma', linecolor=ROOT.kGreen)
-                    c_proj.xline(+3 * rms3sig, text='+3#sigma', linecolor=ROOT.kGreen)
-                    fit2.Draw('SAME')
-                    fit3.Draw('SAME')
-                    c_proj.xlabel(displayNameUnit(var))
-                    c_proj.ylabel("Tracks")
-                    c_proj.xlim(-8*rms3sig, +8*rms3sig)
-                    c_proj.text([displayName('r') + " #in  " + group_names[signal][igroup],
-                                 signal_line(signal) + ' / Combined LRT and standard',
-                                 ] +
-                                ["%s #in  [%.1f, %.1f] %s" % (displayName(dep), 
-                                                              #x - w/2.,
-                                                              #x + w/2.,
-                                                              x - wl,
-                                                              x + wh,
-                                                              displayUnit(dep))] +
-                                ["Tracks: %d (%d)" % (proj.Integral(), proj.Integral(0, proj.GetXaxis().GetNbins() + 1))],
-                                qualifier=qualifier)
-                    
-                    if args.save: c_proj.save('plots/%s_RobustnessResolution_slice__%s_vs_%s__%s_%d_%d.pdf' % (signal, var, dep, 'Combined', igroup, ibin))
-                    pass
-                    '''
                 pass
             
             # Draw figure
@@ -644,8 +542,8 @@ def main ():
             else:
                 c.padding(0.60)
                 pass
-            c.xlim(h.GetXaxis().GetBinLowEdge(bin_pairs[dep][0] [0][0]),
-                   h.GetXaxis().GetBinUpEdge (bin_pairs[dep][0][-1][1]))
+            c.xlim(h.low_edge(bin_pairs[dep][0] [0][0]),
+                   h.up_edge (bin_pairs[dep][0][-1][1]))
 
             c.xlabel(displayNameUnit(dep))
             c.ylabel(ylabel % displayNameUnit(var))
@@ -656,7 +554,7 @@ def main ():
             # Show/save
             savename = '_'.join([signal] + histname.format(alg='Combined', var=var, t=t, group='', dep=dep, depdim='').split('/')[2:]) + '.pdf'
             if args.show: c.show()
-            if args.save: c.save('plots/' + savename)
+            if args.save: output.save(c, 'plots/' + savename, bundle=signal + '_RobustnessResolution')
             
             pass # end: loop signals
 
@@ -697,10 +595,16 @@ def main ():
         # Show/save
         savename = '_'.join(['Both'] + histname.format(alg='Combined', var=var, t=t, group='', dep=dep, depdim='').split('/')[2:]) + '.pdf'
         if args.show: c.show()
-        if args.save: c.save('plots/' + savename)
+        if args.save:
+            output.save(c, 'plots/' + savename, bundle='Both_RobustnessResolution')
+            incremental.record(outputs, fp)
+            pass
 
         pass # end: loop basic_vars, types, deps
     
+    # Write bundles
+    output.close()
+
     return
 
 
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+""" Local staging of remote input files for LRT plotting macros.
+
+With `--stage DIR`, input files on EOS (or any of the `--stage-prefixes`) are
+copied to the local directory `DIR` in background threads, with a bounded
+number of concurrent transfers, while the first plots are prepared. Files are
+then read from the local copy, which is several times faster than many small
+reads through the FUSE mount. xrootd URLs are copied with `xrdcp`, and other
+paths with a plain copy.
+
+Each staged copy is verified against the adler32 checksum of the source right
+after copying, and is stored together with the stamp (size and modification
+time) of the source, from `xrdfs stat` for xrootd URLs, and of the copy itself.
+The copy is reused by later runs for as long as neither has changed, without
+reading it again.
+Giving a local directory as prefix, e.g. `--stage-prefixes /tmp/inputs/`, makes
+it stand in for EOS, e.g. for tests.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import os
+import zlib
+import json
+import subprocess
+from multiprocessing.pool import ThreadPool
+
+# Local
+import cache
+import profiling
+
+
+# Directory to which to stage input files; staging is disabled if None
+directory = None
+
+# Prefixes of the paths of input files to be staged
+prefixes = ['/eos/', 'root://']
+
+# Maximal number of concurrent transfers
+jobs = 4
+
+# Transfer threads
+_pool = None
+
+# Process owning the transfer threads
+_pid = None
+
+# Pending or finished transfers, as `AsyncResult`s of local paths, keyed by path
+_transfers = dict()
+
+# Paths which could not be staged
+_failed = set()
+
+
+# Configure staging
+def configure (args):
+    """ Method for setting up staging from command-line arguments `args`. """
+    global directory, prefixes, jobs
+    directory = args.stage if not args.dry_run else None
+    prefixes  = [prefix.strip() for prefix in args.stage_prefixes.split(',') if prefix.strip()]
+    jobs      = args.stage_jobs
+    return
+
+
+# Check whether input file is staged
+def remote (path):
+    """ Method for checking whether `path` should be read from a staged copy. """
+    return directory is not None and path.startswith(tuple(prefixes))
+
+
+# Get path of staged copy
+def _staged_file (path):
+    """ Method for getting the path of the staged copy of `path`. """
+    return os.path.join(directory, '%s_%s' % (cache.short_hash(path), os.path.basename(path)))
+
+
+# Get adler32 checksum of file
+def _checksum (path):
+    """ Method for getting the adler32 checksum of local file `path`, as a hexadecimal string. """
+    value = 1
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 22), b''):
+            value = zlib.adler32(block, value)
+            pass
+        pass
+    return '%08x' % (value & 0xffffffff)
+
+
+# Get stamp of source
+def _source_stamp (path):
+    """ Method for getting the size and modification time of `path`, also for xrootd URLs, or None if unavailable. """
+    if not path.startswith('root://'):
+        return cache.stamp(path)
+
+    # E.g. root://eosatlas.cern.ch//eos/atlas/...
+    server, _, name = path[len('root://'):].partition('/')
+    try:
+        info = subprocess.check_output(['xrdfs', 'root://' + server, 'stat', '/' + name.lstrip('/')])
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    info = dict(line.split(':', 1) for line in info.splitlines() if ':' in line)
+    if 'Size' not in info or 'MTime' not in info:
+        return None
+    return '%s %s' % (info['Size'].strip(), info['MTime'].strip())
+
+
+# Check whether staged copy is up to date
+def _is_fresh (stamp, staged):
+    """ Method for checking whether `staged` is an unmodified copy of the version of its source with stamp `stamp`.
+
+    The copy was verified when it was made, and is not read again.
+    """
+    if stamp is None:
+        return False
+    try:
+        with open(staged + '.json', 'r') as f:
+            meta = json.load(f)
+            pass
+    except (IOError, ValueError):
+        return False
+    return meta.get('stamp') == stamp and meta.get('local') == cache.stamp(staged)
+
+
+# Copy file
+def _copy (path, tmp):
+    """ Method for copying `path` to local file `tmp`, and getting the adler32 checksum of the source. """
+
+    # xrootd URLs; `xrdcp` verifies the checksum of the copy against that of the source
+    if path.startswith('root://'):
+        subprocess.check_call(['xrdcp', '--force', '--nopbar', '--cksum', 'adler32:source', path, tmp])
+        return _checksum(tmp)
+
+    # Paths, incl. FUSE-mounted EOS
+    value = 1
+    with open(path, 'rb') as src, open(tmp, 'wb') as dst:
+        for block in iter(lambda: src.read(1 << 22), b''):
+            value = zlib.adler32(block, value)
+            dst.write(block)
+            pass
+        pass
+    checksum = '%08x' % (value & 0xffffffff)
+
+    # Check(s)
+    if _checksum(tmp) != checksum:
+        raise IOError("Checksum of staged copy of '%s' does not match the source" % path)
+
+    return checksum
+
+
+# Stage input file
+def _stage (path):
+    """ Method for copying `path` to the staging directory, unless an up-to-date copy exists, and getting the local path. """
+
+    staged = _staged_file(path)
+    stamp  = _source_stamp(path)
+    if _is_fresh(stamp, staged):
+        return staged
+
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError: # Created concurrently
+            pass
+        pass
+
+    # Copy to a temporary file, unique to this process, and move in place once verified
+    tmp = '%s.%d.part' % (staged, os.getpid())
+    try:
+        with profiling.timed('stage'):
+            checksum = _copy(path, tmp)
+            pass
+        os.rename(tmp, staged)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+            pass
+        pass
+
+    with open(staged + '.json', 'w') as f:
+        json.dump({'source': path, 'stamp': stamp, 'local': cache.stamp(staged), 'adler32': checksum}, f)
+        pass
+
+    print "Staged %s to %s" % (path, staged)
+    return staged
+
+
+# Start staging input files
+def start (paths):
+    """ Method for starting to stage the input files `paths` in the background, if not already done. """
+    global _pool, _pid
+
+    paths = [path for path in paths if remote(path)]
+    if not paths:
+        return
+
+    # Worker processes do not inherit the transfer threads
+    if _pid != os.getpid():
+        _pool = ThreadPool(jobs)
+        _pid  = os.getpid()
+        _transfers.clear()
+        pass
+
+    for path in paths:
+        if path not in _transfers:
+            _transfers[path] = _pool.apply_async(_stage, (path,))
+            pass
+        pass
+    return
+
+
+# Get local path of input file
+def local (path):
+    """ Method for getting the path from which to read input file `path`, waiting for it to be staged if necessary.
+
+    Falls back to `path` itself if staging fails.
+    """
+
+    if not remote(path) or path in _failed:
+        return path
+
+    start([path])
+    try:
+        return _transfers[path].get()
+    except Exception as e:
+        print "Could not stage %s; reading it directly: %s" % (path, e)
+        _failed.add(path)
+        pass
+
+    return path
+
+
+# Wait for all transfers
+def wait ():
+    """ Method for waiting for all pending transfers, e.g. before starting worker processes, which would otherwise stage the same files again. """
+    if _pid == os.getpid():
+        for path in list(_transfers):
+            local(path)
+            pass
+        pass
+    return
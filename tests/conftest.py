@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+
+""" Test configuration for LRT plotting macros.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import os
+import sys
+
+# Make the macros importable from the tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+""" Tests of the adaptive binning for robustness plots.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Scientific import(s)
+import numpy as np
+
+# Testing
+import pytest
+
+# Local
+import binning
+from hist import Hist
+
+
+# Get entries in each of the bin pairs
+def _sums (counts, bin_pairs):
+    """ Method for getting the number of entries in each bin pair, checking that the pairs are consecutive. """
+    for (_, last), (first, _) in zip(bin_pairs[:-1], bin_pairs[1:]):
+        assert first == last + 1
+        pass
+    return [sum(counts[first:last + 1]) for first, last in bin_pairs]
+
+
+def test_pairs_greedy ():
+    counts = [0, 30, 80, 10, 10, 120, 5, 60, 50, 20, 0]
+    bin_pairs = binning.pairs(counts, min_entries=100)
+    assert bin_pairs == [(1, 2), (3, 5), (6, 9)]
+    assert all(s >= 100 for s in _sums(counts, bin_pairs))
+
+    # Threshold from the target precision
+    assert binning.pairs(counts, precision=0.1) == bin_pairs
+    return
+
+
+def test_pairs_remainder ():
+    # Entries after the last full pair are merged into it
+    counts = [0, 100, 100, 20, 0]
+    assert binning.pairs(counts, min_entries=100) == [(1, 1), (2, 3)]
+
+    # Too few entries for a single full pair
+    assert binning.pairs([0, 5, 5, 5, 0], min_entries=100) == [(1, 3)]
+    return
+
+
+def test_pairs_max_bins ():
+    # Skewed distribution: pairs are only folded if there are too many
+    counts = [0, 100, 5, 5, 5, 300, 10, 10, 0]
+    assert binning.pairs(counts, min_entries=100, max_bins=3) == [(1, 1), (2, 7)]
+
+    counts = [0] + [10] * 10 + [0]
+    bin_pairs = binning.pairs(counts, min_entries=10, max_bins=3)
+    assert len(bin_pairs) == 3
+    assert (bin_pairs[0][0], bin_pairs[-1][1]) == (1, 10)
+    assert all(s >= 10 for s in _sums(counts, bin_pairs))
+    return
+
+
+def test_pairs_range ():
+    counts = [50] * 12
+    assert binning.pairs(counts, first=3, last=8, min_entries=100) == [(3, 4), (5, 6), (7, 8)]
+    with pytest.raises(AssertionError):
+        binning.pairs(counts, first=8, last=3)
+        pass
+    return
+
+
+def test_edges ():
+    axis_edges = np.linspace(0., 10., 11)
+    assert np.array_equal(binning.edges(axis_edges, [(1, 2), (3, 7), (8, 10)]), [0., 2., 7., 10.])
+    assert np.array_equal(binning.edges(axis_edges, [(3, 4)]), [2., 4.])
+    return
+
+
+def test_build ():
+    # Two-dimensional histogram, with entries along the y-axis, incl. flows which aren't counted
+    xedges, yedges = np.linspace(0., 80., 9), np.linspace(-1., 1., 5)
+    values = np.zeros((len(xedges) + 1, len(yedges) + 1))
+    values[1:-1, 1:-1] = np.array([100, 20, 30, 60, 200, 10, 10, 90])[:, None] / 4.
+    values[:, [0, -1]] = 1000.
+    h = Hist((xedges, yedges), values)
+
+    bin_pairs, edges = binning.build(h, min_entries=100)
+    assert bin_pairs == [(1, 1), (2, 4), (5, 5), (6, 8)]
+    assert np.array_equal(edges, [0., 10., 40., 50., 80.])
+
+    # Restricted range, with `high` on a bin edge
+    bin_pairs, edges = binning.build(h, low=10., high=50., min_entries=100)
+    assert bin_pairs == [(2, 4), (5, 5)]
+    assert np.array_equal(edges, [10., 40., 50.])
+
+    # Profile, with the same entries in each bin
+    p = Hist((xedges,), np.zeros(10), np.zeros(10), entries=values[:, 1] * 4., profile=True)
+    assert binning.build(p, min_entries=100)[0] == [(1, 1), (2, 4), (5, 5), (6, 8)]
+    return
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+""" Tests of the combined efficiency of two track collections, against the per-track fills it replaces.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+from array import array
+
+# Scientific import(s)
+import numpy as np
+
+# Testing
+import pytest
+ROOT = pytest.importorskip('ROOT')
+
+# Local
+from efficiency import combined_efficiency
+
+
+# Number of statistics entries, cf. TH1::kNstat
+NSTAT = 13
+
+
+# Get synthetic efficiency profile
+def _profile (name, passed, total, edges, sumw2):
+    """ Method for getting a TProfile with `passed` out of `total` entries with y = 1, and the rest with y = 0, in each bin. """
+    h = ROOT.TProfile(name, "", len(edges) - 1, array('d', edges))
+    h.SetDirectory(0)
+    if sumw2:
+        h.Sumw2()
+        pass
+    for bin, (npass, ntotal) in enumerate(zip(passed, total), start=1):
+        x = h.GetBinCenter(bin)
+        for itrack in range(ntotal):
+            h.Fill(x, 1. if itrack < npass else 0.)
+            pass
+        pass
+    return h
+
+
+# Get combined efficiency by per-track fills
+def _combined_efficiency_fills (h1, h2):
+    """ Method for getting the combined efficiency as previously computed in efficiencyPlots and robustnessEfficiencyPlots. """
+    h = h1.Clone(h1.GetName() + '_fills')
+    h.Reset()
+    for bin in range(1, h1.GetXaxis().GetNbins() + 1):
+        num_total = int(h1.GetBinEntries(bin))
+        num_pass  = int(h1.GetBinContent(bin) * num_total) + int(h2.GetBinContent(bin) * num_total)
+        num_fail  = num_total - num_pass
+        x = h.GetBinCenter(bin)
+        for _ in range(num_pass): h.Fill(x, 1)
+        for _ in range(num_fail): h.Fill(x, 0)
+        pass
+    return h
+
+
+@pytest.mark.parametrize('sumw2', [False, True])
+@pytest.mark.parametrize('edges', [list(np.linspace(0, 300, 16)), [0., 10., 20., 30., 40., 50., 70., 90., 110., 150., 200., 300.]])
+def test_combined_efficiency (edges, sumw2):
+    rng = np.random.RandomState(42)
+    nbins = len(edges) - 1
+
+    # Disjoint collections of truth particles; incl. empty bins, and bins where all particles pass
+    total = rng.randint(0, 200, size=nbins)
+    total[1] = 0
+    pass1 = (total * rng.uniform(0.2, 0.6, size=nbins)).astype(int)
+    pass2 = ((total - pass1) * rng.uniform(0.0, 1.0, size=nbins)).astype(int)
+    pass2[-1] = total[-1] - pass1[-1]
+
+    h1 = _profile('h1', pass1, total, edges, sumw2)
+    h2 = _profile('h2', pass2, total, edges, sumw2)
+
+    expected = _combined_efficiency_fills(h1, h2)
+    actual   = combined_efficiency(h1, h2)
+
+    # Bin by bin, incl. under- and overflow
+    for bin in range(nbins + 2):
+        assert actual.GetBinContent(bin) == pytest.approx(expected.GetBinContent(bin), rel=1.0E-12, abs=1.0E-12)
+        assert actual.GetBinError  (bin) == pytest.approx(expected.GetBinError  (bin), rel=1.0E-12, abs=1.0E-12)
+        assert actual.GetBinEntries(bin) == expected.GetBinEntries(bin)
+        assert actual.GetSumw2().At(bin) == pytest.approx(expected.GetSumw2().At(bin), rel=1.0E-12)
+        if sumw2:
+            assert actual.GetBinSumw2().At(bin) == pytest.approx(expected.GetBinSumw2().At(bin), rel=1.0E-12)
+            pass
+        pass
+
+    # Statistics
+    stats_actual, stats_expected = array('d', [0.] * NSTAT), array('d', [0.] * NSTAT)
+    actual  .GetStats(stats_actual)
+    expected.GetStats(stats_expected)
+    assert np.allclose(stats_actual, stats_expected, rtol=1.0E-09)
+    assert actual.GetEntries() == expected.GetEntries()
+    return
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+""" Tests of the NumPy-backed histograms, against bin-by-bin references; no ROOT is needed.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Scientific import(s)
+import numpy as np
+
+# Testing
+import pytest
+
+# Local
+from hist import Hist
+
+
+# Bin edges
+UNIFORM  = np.linspace(0., 100., 11)
+VARIABLE = np.array([0., 1., 2., 5., 10., 20., 30., 50., 70., 100.])
+
+
+# Get synthetic histograms
+def _hist1d (edges, seed=1):
+    """ Method for getting a one-dimensional histogram with random weights, incl. under- and overflow. """
+    rng = np.random.RandomState(seed)
+    values = rng.uniform(0, 10, size=len(edges) + 1)
+    return Hist((edges,), values, values * rng.uniform(0.5, 2., size=values.shape), name='h1')
+
+
+def _hist2d (xedges, yedges, seed=2):
+    """ Method for getting a two-dimensional histogram with random weights, incl. under- and overflow. """
+    rng = np.random.RandomState(seed)
+    values = rng.uniform(0, 10, size=(len(xedges) + 1, len(yedges) + 1))
+    return Hist((xedges, yedges), values, values * rng.uniform(0.5, 2., size=values.shape), name='h2')
+
+
+def _profile (edges, seed=3):
+    """ Method for getting a profile with random sums, incl. under- and overflow. """
+    rng = np.random.RandomState(seed)
+    entries = rng.poisson(20, size=len(edges) + 1).astype(float)
+    values  = entries * rng.uniform(0, 1, size=entries.shape)
+    return Hist((edges,), values, values * 0.8, entries, entries * 1.5, profile=True, name='p')
+
+
+# Sum bins, bin-by-bin
+def _merge (arr, old, new, axis=0):
+    """ Method for summing the bins of `arr` along `axis` into the bins of `new` containing their centres. """
+    arr = np.swapaxes(arr, 0, axis)
+    out = np.zeros((len(new) + 1,) + arr.shape[1:])
+    for bin in range(len(old) + 1):
+        if bin in (0, len(old)):
+            target = 0 if bin == 0 else len(new)
+        else:
+            target = int(np.searchsorted(new, 0.5 * (old[bin - 1] + old[bin]), side='right'))
+            pass
+        out[target] += arr[bin]
+        pass
+    return np.swapaxes(out, 0, axis)
+
+
+@pytest.mark.parametrize('edges, ngroup_or_edges, expected', [
+    (UNIFORM,  2,                 UNIFORM[::2]),
+    (UNIFORM,  3,                 UNIFORM[[0, 3, 6, 9]]),  # Bin 10 is added to the overflow
+    (VARIABLE, 2,                 VARIABLE[::2]),
+    (VARIABLE, [0., 5., 30., 100.], [0., 5., 30., 100.]),
+    (VARIABLE, [2., 20., 50.],    [2., 20., 50.]),         # Bins outside are added to under- and overflow
+    ])
+def test_rebin_1d (edges, ngroup_or_edges, expected):
+    h = _hist1d(edges)
+    r = h.rebin(ngroup_or_edges, name='r')
+
+    assert r.name == 'r' and h.name == 'h1'
+    assert np.array_equal(r.edges[0], expected)
+    assert np.allclose(r.values, _merge(h.values, edges, expected))
+    assert np.allclose(r.sumw2,  _merge(h.sumw2,  edges, expected))
+    assert r.integral(flows=True) == pytest.approx(h.integral(flows=True))
+    assert r.nentries == h.nentries
+    return
+
+
+def test_rebin_overflow ():
+    h = _hist1d(UNIFORM)
+    r = h.rebin(3)
+    assert r.values[-1]  == pytest.approx(h.values[-2:].sum())
+    assert r.values[0]   == h.values[0]
+    assert r.integral()  == pytest.approx(h.values[1:-2].sum())
+    return
+
+
+@pytest.mark.parametrize('axis', [0, 1])
+@pytest.mark.parametrize('ngroup_or_edges', [3, [0., 5., 30., 100.]])
+def test_rebin_2d (axis, ngroup_or_edges):
+    h = _hist2d(VARIABLE, UNIFORM[:8] / 7.)
+    old = h.edges[axis]
+    if np.ndim(ngroup_or_edges) and axis == 1:
+        ngroup_or_edges = old[[0, 2, 3, 7]]
+        pass
+    r = h.rebin(ngroup_or_edges, axis=axis)
+
+    assert np.array_equal(r.edges[1 - axis], h.edges[1 - axis])
+    assert np.allclose(r.values, _merge(h.values, old, r.edges[axis], axis))
+    assert np.allclose(r.sumw2,  _merge(h.sumw2,  old, r.edges[axis], axis))
+    return
+
+
+@pytest.mark.parametrize('edges, ngroup_or_edges', [(UNIFORM, 3), (VARIABLE, [0., 5., 30., 100.])])
+def test_rebin_profile (edges, ngroup_or_edges):
+    p = _profile(edges)
+    r = p.rebin(ngroup_or_edges)
+    new = r.edges[0]
+
+    assert r.profile
+    for attr in ['values', 'sumw2', 'entries', 'binsumw2']:
+        assert np.allclose(getattr(r, attr), _merge(getattr(p, attr), edges, new))
+        pass
+
+    # Bin averages are weighted by entries
+    expected = _merge(p.values, edges, new) / _merge(p.entries, edges, new)
+    assert np.allclose(r.contents(), expected)
+    return
+
+
+def test_rebin_invalid ():
+    with pytest.raises(AssertionError):
+        _hist1d(VARIABLE).rebin([0., 15., 100.])
+        pass
+    assert np.array_equal(_hist1d(VARIABLE).rebin([0.3, 14., 101.], snap=True).edges[0], [0., 10., 100.])
+    return
+
+
+@pytest.mark.parametrize('axis', [0, 1])
+def test_projection (axis):
+    h = _hist2d(VARIABLE, UNIFORM)
+    other = 1 - axis
+
+    p = h.projection(axis, 2, 4)
+    assert np.array_equal(p.edges[0], h.edges[axis])
+    assert np.allclose(p.values, np.take(h.values, [2, 3, 4], axis=other).sum(axis=other))
+    assert np.allclose(p.sumw2,  np.take(h.sumw2,  [2, 3, 4], axis=other).sum(axis=other))
+
+    # All bins, incl. under- and overflow
+    assert np.allclose(h.projection(axis).values, h.values.sum(axis=other))
+    return
+
+
+@pytest.mark.parametrize('clear_flows', [False, True])
+@pytest.mark.parametrize('rebin', [None, 2, 3, [0., 30., 70., 100.]])
+def test_projections (clear_flows, rebin):
+    h = _hist2d(VARIABLE, UNIFORM)
+    pairs = [(1, 1), (2, 4), (5, 9), (0, h.nbins(0) + 1), (1, 0)]  # Incl. flows, and all bins
+
+    projections = h.projections(pairs, clear_flows=clear_flows, rebin=rebin, name='proj')
+    assert len(projections) == len(pairs)
+
+    for i, ((first, last), proj) in enumerate(zip(pairs, projections)):
+        expected = h.projection_y(first, last)
+        if clear_flows:
+            expected.clear_flows()
+            pass
+        if rebin is not None:
+            expected = expected.rebin(rebin)
+            pass
+
+        assert proj.name == 'proj_%d' % i
+        assert np.array_equal(proj.edges[0], expected.edges[0])
+        assert np.allclose(proj.values, expected.values)
+        assert np.allclose(proj.sumw2,  expected.sumw2)
+        pass
+    return
+
+
+def test_projections_rebin_overflow ():
+    # Remaining bins at the upper end go to the overflow, after the flows are cleared
+    h = _hist2d(VARIABLE, UNIFORM)
+    proj = h.projections([(2, 4)], clear_flows=True, rebin=3)[0]
+
+    summed = h.values[2:5].sum(axis=0)
+    assert np.array_equal(proj.edges[0], UNIFORM[[0, 3, 6, 9]])
+    assert proj.values[0]  == 0.
+    assert proj.values[-1] == pytest.approx(summed[10])
+    assert np.allclose(proj.values[1:-1], summed[1:10].reshape(3, 3).sum(axis=1))
+
+    proj = h.projections([(2, 4)], clear_flows=False, rebin=3)[0]
+    assert proj.values[0]  == pytest.approx(summed[0])
+    assert proj.values[-1] == pytest.approx(summed[10] + summed[11])
+    return
+
+
+@pytest.mark.parametrize('make', [
+    lambda: _hist1d(VARIABLE),
+    lambda: _hist2d(VARIABLE, UNIFORM),
+    lambda: _profile(UNIFORM),
+    ])
+def test_clone (make):
+    h = make()
+    c = h.clone('c')
+
+    assert c.name == 'c' and h.name != 'c'
+    for attr in ['values', 'sumw2', 'entries', 'binsumw2']:
+        orig, copy = getattr(h, attr), getattr(c, attr)
+        if orig is None:
+            assert copy is None
+            continue
+        assert np.array_equal(orig, copy)
+        assert copy is not orig
+        pass
+
+    # Independent
+    c.values[1] += 1.
+    assert not np.array_equal(c.values, h.values)
+    assert all(np.array_equal(e1, e2) for e1, e2 in zip(h.edges, c.edges))
+    return
+
+
+@pytest.mark.parametrize('c', [1., -1., 0.5])
+@pytest.mark.parametrize('make', [
+    lambda seed: _hist1d(VARIABLE, seed),
+    lambda seed: _hist2d(VARIABLE, UNIFORM, seed),
+    ])
+def test_add_hist (make, c):
+    h1, h2 = make(10), make(11)
+    values, sumw2, nentries = h1.values.copy(), h1.sumw2.copy(), h1.nentries
+
+    assert h1.add(h2, c) is h1
+    assert np.allclose(h1.values, values + c * h2.values)
+    assert np.allclose(h1.sumw2,  sumw2  + c * c * h2.sumw2)
+    assert h1.nentries == nentries + h2.nentries
+    return
+
+
+def test_add_profile ():
+    p1, p2 = _profile(UNIFORM, seed=10), _profile(UNIFORM, seed=11)
+    expected = {attr: getattr(p1, attr) + getattr(p2, attr) for attr in ['values', 'sumw2', 'entries', 'binsumw2']}
+    nentries = p1.nentries + p2.nentries
+
+    p1.add(p2)
+    for attr, arr in expected.items():
+        assert np.allclose(getattr(p1, attr), arr)
+        pass
+    assert p1.nentries == nentries
+    assert np.allclose(p1.contents(), expected['values'] / expected['entries'])
+    return
+
+
+def test_add_invalid ():
+    with pytest.raises(AssertionError):
+        _hist1d(VARIABLE).add(_hist1d(UNIFORM))
+        pass
+    with pytest.raises(AssertionError):
+        _hist1d(UNIFORM).add(_profile(UNIFORM))
+        pass
+    return
+
+
+def test_arrays_roundtrip ():
+    for h in [_hist1d(VARIABLE), _hist2d(VARIABLE, UNIFORM), _profile(UNIFORM)]:
+        r = Hist.from_arrays(h.to_arrays())
+        assert r.profile == h.profile and r.name == h.name
+        for attr in ['values', 'sumw2', 'entries', 'binsumw2']:
+            orig = getattr(h, attr)
+            assert (orig is None and getattr(r, attr) is None) or np.allclose(getattr(r, attr), orig)
+            pass
+        pass
+    return
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+""" Tests of the rebinning of bin arrays, against a bin-by-bin reference.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Scientific import(s)
+import numpy as np
+
+# Testing
+import pytest
+
+# Local
+import rebinning
+
+
+# Bin edges
+UNIFORM  = np.linspace(0., 100., 21)
+VARIABLE = np.array([0., 1., 2., 5., 10., 20., 30., 50., 70., 100.])
+
+
+# Rebin bin-by-bin
+def _reference (arr, old, new, axis=0):
+    """ Method for rebinning `arr` by adding each existing bin to the new bin containing its centre. """
+    arr = np.swapaxes(arr, 0, axis)
+    out = np.zeros((len(new) + 1,) + arr.shape[1:])
+    for bin in range(len(old) + 1):
+        if bin == 0:
+            target = 0
+        elif bin == len(old):
+            target = len(new)
+        else:
+            target = int(np.searchsorted(new, 0.5 * (old[bin - 1] + old[bin]), side='right'))
+            pass
+        out[target] += arr[bin]
+        pass
+    return np.swapaxes(out, 0, axis)
+
+
+def test_edges_ngroup ():
+    # Remaining bins at the upper end are not part of the new axis
+    assert np.array_equal(rebinning.edges(UNIFORM, 3), UNIFORM[[0, 3, 6, 9, 12, 15, 18]])
+    assert np.array_equal(rebinning.edges(UNIFORM, 1), UNIFORM)
+    with pytest.raises(AssertionError):
+        rebinning.edges(UNIFORM, 0)
+        pass
+    return
+
+
+def test_edges_list ():
+    assert np.array_equal(rebinning.edges(VARIABLE, [0., 10., 100.]), [0., 10., 100.])
+
+    # Misaligned, or not increasing
+    with pytest.raises(AssertionError):
+        rebinning.edges(VARIABLE, [0., 15., 100.])
+        pass
+    with pytest.raises(AssertionError):
+        rebinning.edges(VARIABLE, [0., 50., 20.])
+        pass
+
+    # Snapped to the nearest existing edges, dropping duplicates
+    assert np.array_equal(rebinning.edges(VARIABLE, [0.2, 0.9, 14., 99.], snap=True), [0., 1., 10., 100.])
+    return
+
+
+@pytest.mark.parametrize('axis', [0, 1])
+@pytest.mark.parametrize('old, ngroup_or_edges', [
+    (UNIFORM,  4),
+    (UNIFORM,  7),
+    (UNIFORM,  [10., 20., 50., 90.]),
+    (VARIABLE, 2),
+    (VARIABLE, [0., 5., 30., 100.]),
+    (VARIABLE, [-10., 2., 20., 200.]),  # Extending beyond the axis range
+    ])
+def test_apply (old, ngroup_or_edges, axis):
+    rng = np.random.RandomState(42)
+    shape = [len(old) + 1, 5]
+    if axis == 1:
+        shape.reverse()
+        pass
+    arrays = [rng.uniform(0, 10, size=shape), None, rng.poisson(5, size=shape).astype(float)]
+
+    new = rebinning.edges(old, ngroup_or_edges)
+    merged = rebinning.apply(arrays, old, new, axis)
+
+    assert merged[1] is None
+    for arr, actual in zip(arrays, merged):
+        if arr is None:
+            continue
+        expected = _reference(arr, old, new, axis)
+        assert actual.shape == expected.shape
+        assert np.allclose(actual, expected)
+        assert np.isclose(actual.sum(), arr.sum())
+        pass
+    return
+
+
+def test_plan_cached ():
+    new = rebinning.edges(VARIABLE, 3)
+    starts, empty = rebinning.plan(VARIABLE, new)
+    assert rebinning.plan(VARIABLE, new)[0] is starts
+    with pytest.raises(ValueError):
+        starts[0] = 1
+        pass
+    return
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+""" Tests of the local staging of input files, using a local directory as stand-in for EOS.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import os
+import argparse
+
+# Testing
+import pytest
+
+# Local
+import staging
+
+
+@pytest.fixture
+def remote (tmpdir, monkeypatch):
+    """ Fixture providing an input file in a local directory which stands in for EOS, and a staging directory. """
+    source = tmpdir.mkdir('eos')
+    path = source.join('input.root')
+    path.write_binary(b'0123456789' * 1000)
+
+    args = argparse.Namespace(stage=str(tmpdir.join('staged')), dry_run=False,
+                              stage_prefixes=str(source) + '/', stage_jobs=2)
+    for name, value in [('directory', None), ('prefixes', None), ('jobs', None), ('_pid', None), ('_transfers', dict()), ('_failed', set())]:
+        monkeypatch.setattr(staging, name, value)
+        pass
+    staging.configure(args)
+    return str(path)
+
+
+def _restart ():
+    """ Method for forgetting the transfers of this process, as for a new run. """
+    staging._transfers.clear()
+    staging._failed.clear()
+    return
+
+
+def _copies (monkeypatch):
+    """ Method for counting the calls to `staging._copy`. """
+    calls = list()
+    copy = staging._copy
+    def counted (path, tmp):
+        calls.append(path)
+        return copy(path, tmp)
+    monkeypatch.setattr(staging, '_copy', counted)
+    return calls
+
+
+def test_stage_and_reuse (remote, monkeypatch):
+    calls = _copies(monkeypatch)
+
+    staged = staging.local(remote)
+    assert staged != remote
+    assert open(staged, 'rb').read() == open(remote, 'rb').read()
+    assert len(calls) == 1
+
+    # Reused by a later run, without copying or reading the copy again
+    _restart()
+    monkeypatch.setattr(staging, '_checksum', lambda path: pytest.fail("Staged copy read again"))
+    assert staging.local(remote) == staged
+    assert len(calls) == 1
+    return
+
+
+def test_restage_changed_source (remote, monkeypatch):
+    calls = _copies(monkeypatch)
+    staged = staging.local(remote)
+
+    with open(remote, 'ab') as f:
+        f.write(b'more')
+        pass
+
+    _restart()
+    assert staging.local(remote) == staged
+    assert len(calls) == 2
+    assert open(staged, 'rb').read() == open(remote, 'rb').read()
+    return
+
+
+def test_restage_modified_copy (remote, monkeypatch):
+    calls = _copies(monkeypatch)
+    staged = staging.local(remote)
+
+    with open(staged, 'ab') as f:
+        f.write(b'corrupt')
+        pass
+
+    _restart()
+    staging.local(remote)
+    assert len(calls) == 2
+    assert open(staged, 'rb').read() == open(remote, 'rb').read()
+    return
+
+
+def test_fall_back_on_failure (remote, monkeypatch):
+    def fail (path, tmp):
+        raise IOError("Transfer failed")
+    monkeypatch.setattr(staging, '_copy', fail)
+
+    assert staging.local(remote) == remote
+    assert not [name for name in os.listdir(staging.directory) if name.endswith('.part')]
+    return
+
+
+def test_other_paths_not_staged (remote, tmpdir):
+    path = str(tmpdir.join('local.root'))
+    assert staging.local(path) == path
+    return
+
+
+def test_xrootd_stamp (monkeypatch):
+    calls = list()
+    def check_output (cmd):
+        calls.append(cmd)
+        return 'Path:   /eos/atlas/input.root\nId:     123\nSize:   1000\nMTime:  2017-07-07 12:00:00\nFlags:  16 (IsReadable)\n'
+    monkeypatch.setattr(staging.subprocess, 'check_output', check_output)
+
+    assert staging._source_stamp('root://eosatlas.cern.ch//eos/atlas/input.root') == '1000 2017-07-07 12:00:00'
+    assert calls == [['xrdfs', 'root://eosatlas.cern.ch', 'stat', '/eos/atlas/input.root']]
+    return
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+""" Asynchronous writing of saved plots for LRT plotting macros.
+
+With `--async-save`, canvases are rendered to a local scratch directory, and
+the rendered files are moved to their destination, e.g. on a network file
+system, by a background thread, such that drawing the next plot overlaps with
+writing the previous ones. The queue of pending writes is bounded, such that
+drawing blocks when writing falls behind. Failed writes are retried, and
+reported when the queue is flushed, at the end of each plot family and at
+exit; the rendered files of failed writes are kept in the scratch directory.
+
+Only file operations take place in the background thread; all ROOT calls,
+incl. rendering, stay in the thread which drew the canvas.
+
+Author: Andreas Sogaard (@asogaard)
+Date:   17 October 2026
+"""
+
+# Basic
+import os
+import time
+import Queue
+import atexit
+import shutil
+import tempfile
+import threading
+import traceback
+import multiprocessing.util
+from contextlib import contextmanager
+
+# Local
+import profiling
+
+
+# Whether to write asynchronously
+enabled = False
+
+# Maximal number of pending writes
+size = 8
+
+# Number of retries of failed writes, and the delay before the first retry, in seconds
+retries = 3
+delay   = 0.5
+
+# Queue of pending jobs, as (func, args)
+_queue = None
+
+# Process owning the queue and background thread; re-created in forked worker processes
+_pid = None
+
+# Scratch directory
+_scratch = None
+
+# Number of files rendered to the scratch directory
+_count = 0
+
+# Destination paths of failed writes
+_failed = set()
+
+# Failures not yet reported, as (destination, scratch path, error)
+_failures = list()
+
+
+# Start background thread
+def _start ():
+    """ Method for creating the queue, scratch directory, and background thread of this process. """
+    global _queue, _pid, _scratch, _count
+
+    _queue   = Queue.Queue(maxsize=size)
+    _pid     = os.getpid()
+    _scratch = tempfile.mkdtemp(prefix='lrt-plots-')
+    _count   = 0
+    _failed.clear()
+    del _failures[:]
+
+    thread = threading.Thread(target=_run, args=(_queue,))
+    thread.daemon = True
+    thread.start()
+
+    # Close at exit, also in worker processes, which do not run `atexit` handlers
+    multiprocessing.util.Finalize(None, close, exitpriority=10)
+    return
+
+
+# Run background thread
+def _run (queue):
+    """ Method for running the jobs in `queue`, in order. """
+    while True:
+        func, args = queue.get()
+        try:
+            func(*args)
+        except Exception:
+            # Jobs report their own failures; this is only a safeguard for the thread
+            traceback.print_exc()
+        finally:
+            queue.task_done()
+            pass
+        pass
+    return
+
+
+# Move rendered file to destination
+def _move (src, dest):
+    """ Method for moving the rendered file `src` to `dest`, retrying on failure. """
+    tmp = dest + '.part'
+    for attempt in range(retries + 1):
+        try:
+            with profiling.timed('write'):
+                shutil.copyfile(src, tmp)
+                os.rename(tmp, dest)
+                pass
+            os.remove(src)
+            return
+        except (IOError, OSError) as e:
+            error = e
+            if attempt < retries:
+                time.sleep(delay * 2**attempt)
+                pass
+            pass
+        pass
+
+    _failed.add(dest)
+    _failures.append((dest, src, error))
+    return
+
+
+# Render to scratch directory
+@contextmanager
+def deferred (dest):
+    """ Method for getting the path to which to render the file `dest`.
+
+    With asynchronous writing, this is a path in the scratch directory, and the
+    rendered file is queued to be moved to `dest` at the end of the block;
+    otherwise it is `dest` itself.
+    """
+    global _count
+
+    if not enabled:
+        yield dest
+        return
+
+    if _pid != os.getpid():
+        _start()
+        pass
+
+    # Keep the extension, from which ROOT deduces the format
+    _count += 1
+    src = os.path.join(_scratch, '%d_%s' % (_count, os.path.basename(dest)))
+    yield src
+    _queue.put((_move, (src, dest)))  # Blocks while the queue is full
+    return
+
+
+# Call after pending writes
+def then (func, *args):
+    """ Method for calling `func(*args)` once all writes queued so far are done, cf. `failed`. """
+    if enabled and _pid == os.getpid():
+        _queue.put((func, args))
+    else:
+        func(*args)
+        pass
+    return
+
+
+# Check whether write failed
+def failed (dest):
+    """ Method for checking whether writing to `dest` failed. """
+    return dest in _failed
+
+
+# Flush pending writes
+def flush ():
+    """ Method for waiting for all pending writes, and reporting any failures.
+
+    Returns the number of failures reported.
+    """
+
+    if _pid != os.getpid():
+        return 0
+
+    _queue.join()
+
+    failures = list(_failures)
+    del _failures[:]
+    for dest, src, e in failures:
+        print "Failed to write %s after %d attempt(s); rendered file kept at %s: %s" % (dest, retries + 1, src, e)
+        pass
+
+    return len(failures)
+
+
+# Close
+def close ():
+    """ Method for flushing pending writes, and removing the scratch directory if empty. """
+
+    if _pid != os.getpid():
+        return
+
+    flush()
+    if os.path.isdir(_scratch) and not os.listdir(_scratch):
+        os.rmdir(_scratch)
+        pass
+    return
+
+
+atexit.register(close)